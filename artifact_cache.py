@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Caché de artefactos generados (Excel y dashboards)
+
+Cada artefacto se identifica por la huella del contenido del snapshot
+(la de su cabecera, más el timestamp) y la versión del generador (número de
+versión y huella de las plantillas que usa) junto con sus opciones. Si ya
+existe un artefacto con esa clave se devuelve sin regenerarlo; si no, se
+genera con un nombre derivado de la clave y se registra.
+
+El registro (manifiesto JSON en ConfigAudit.REPORTS_DIR) guarda tamaño y
+último uso de cada artefacto; al superar ConfigAudit.ARTIFACT_CACHE_MAX_MB
+se eliminan los usados hace más tiempo (LRU). Solo se eliminan artefactos
+registrados: los reportes diarios de cambios no se tocan.
+"""
+
+import hashlib
+import logging
+import time
+from pathlib import Path
+
+import json_backend
+from config_audit import ConfigAudit
+
+MANIFEST_FILE = 'artifacts.json'
+
+
+def snapshot_fingerprint(snapshot):
+    """
+    Huella del contenido de un snapshot
+
+    Usa las huellas guardadas en la cabecera del contenedor (sin decodificar
+    secciones) y el timestamp, que también aparece en los artefactos.
+
+    Args:
+        snapshot: Lector del snapshot (open_snapshot)
+    """
+    return f"{snapshot.digests['config']}@{snapshot.timestamp}"
+
+
+def artifact_key(kind, source, version, **options):
+    """Clave de un artefacto: tipo, huella de origen, versión y opciones"""
+    payload = json_backend.dumps({'tipo': kind, 'origen': source, 'version': version, 'opciones': options})
+    return hashlib.blake2b(payload, digest_size=10).hexdigest()
+
+
+class ArtifactCache:
+    """Registro de artefactos con expulsión LRU por tamaño total"""
+
+    def __init__(self, directory=None, max_mb=None, logger=None):
+        self.directory = Path(directory or ConfigAudit.REPORTS_DIR)
+        self.max_bytes = (max_mb if max_mb is not None else ConfigAudit.ARTIFACT_CACHE_MAX_MB) * 1024 * 1024
+        self.manifest_file = self.directory / MANIFEST_FILE
+        self.logger = logger or logging.getLogger(__name__)
+        self.entries = self._load()
+
+    def _load(self):
+        if not self.manifest_file.exists():
+            return {}
+        try:
+            return json_backend.loads(self.manifest_file.read_bytes())
+        except ValueError:
+            self.logger.warning(f"⚠️  Manifiesto de artefactos ilegible, se empieza de cero: {self.manifest_file}")
+            return {}
+
+    def _save(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.manifest_file.with_name(self.manifest_file.name + '.tmp')
+        tmp_file.write_bytes(json_backend.dumps(self.entries))
+        tmp_file.replace(self.manifest_file)
+
+    def get(self, key):
+        """Artefacto registrado con esa clave (None si no existe o se borró)"""
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+
+        path = self.directory / entry['archivo']
+        if not path.exists():
+            del self.entries[key]
+            self._save()
+            return None
+
+        entry['usado'] = time.time()
+        self._save()
+        return path
+
+    def put(self, key, path, kind):
+        """Registrar un artefacto recién generado y aplicar el límite de tamaño"""
+        path = Path(path)
+        now = time.time()
+        self.entries[key] = {
+            'archivo': path.name,
+            'tipo': kind,
+            'bytes': path.stat().st_size,
+            'creado': now,
+            'usado': now
+        }
+        self.evict(keep=key)
+        self._save()
+
+    def evict(self, keep=None):
+        """
+        Eliminar los artefactos usados hace más tiempo hasta cumplir el límite
+
+        Returns:
+            Número de artefactos eliminados
+        """
+        total = sum(entry['bytes'] for entry in self.entries.values())
+        evicted = 0
+        for key, entry in sorted(self.entries.items(), key=lambda item: item[1]['usado']):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            (self.directory / entry['archivo']).unlink(missing_ok=True)
+            total -= entry['bytes']
+            del self.entries[key]
+            evicted += 1
+
+        if evicted:
+            self.logger.info(f"🧹 {evicted} artefactos antiguos eliminados de la caché")
+        return evicted
+
+    def build(self, kind, key, filename, builder):
+        """
+        Devolver el artefacto de una clave, generándolo si no existe
+
+        Args:
+            kind: Tipo de artefacto ('excel', 'dashboard', ...)
+            key: Clave (artifact_key)
+            filename: Nombre del archivo a generar (en el directorio de la caché)
+            builder: Función ruta -> genera el artefacto en esa ruta
+
+        Returns:
+            Tupla (ruta, True si salió de la caché)
+        """
+        cached = self.get(key)
+        if cached is not None:
+            return cached, True
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / filename
+        builder(path)
+        self.put(key, path, kind)
+        return path, False
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Reglas de ruido: normalizadores, equivalencias y patrones a ignorar
+
+El archivo de reglas (ConfigAudit.RULES_FILE) declara tres tipos de regla,
+cada una acotada por sección y campo (admiten comodines, p.ej. "accion*";
+los campos de colecciones se nombran "miembros.estado"):
+
+- normalizadores: transforman el valor al extraer y al comparar
+  (tipos: espacios, recortar, minusculas, regex con "patron" y "reemplazo")
+- equivalencias: clases de valores que se consideran iguales
+- ignorar: cambios que se descartan si el valor anterior y/o el actual
+  encajan con una expresión regular; con "conservar_anterior" el snapshot
+  guarda además el valor anterior en lugar del actual (p.ej. un marcador
+  leído porque el panel aún no había cargado)
+
+Las reglas se compilan una vez al arrancar; para cada (sección, campo) se
+resuelven y memorizan las reglas aplicables, así comparar un valor es una
+búsqueda en diccionario. Cada regla cuenta los cambios candidatos que ha
+suprimido.
+"""
+
+import re
+from collections import Counter
+from fnmatch import translate
+
+import json_backend
+from config_audit import ConfigAudit
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def _selector(pattern):
+    """Compilar un selector de sección/campo con comodines"""
+    return re.compile(translate(pattern or '*'))
+
+
+def _normalizer_function(rule):
+    """Función de normalización de una regla"""
+    kind = rule.get('tipo', 'espacios')
+    if kind == 'espacios':
+        return lambda value: _WHITESPACE.sub(' ', value).strip()
+    if kind == 'recortar':
+        return str.strip
+    if kind == 'minusculas':
+        return str.casefold
+    if kind == 'regex':
+        pattern = re.compile(rule['patron'])
+        replacement = rule.get('reemplazo', '')
+        return lambda value: pattern.sub(replacement, value)
+    raise ValueError(f"Tipo de normalizador desconocido: {kind}")
+
+
+class _FieldRules:
+    """Reglas ya resueltas para una sección y campo concretos"""
+
+    def __init__(self, normalizers, equivalences, ignores):
+        self.normalizers = normalizers
+        self.ignores = ignores
+
+        # valor normalizado -> nombre de la clase de equivalencia
+        self.classes = {}
+        for name, values in equivalences:
+            for value in values:
+                self.classes.setdefault(self.normalize(value), name)
+
+    def normalize(self, value):
+        if not isinstance(value, str):
+            return value
+        for _, function in self.normalizers:
+            value = function(value)
+        return value
+
+
+class CompiledRules:
+    """Conjunto de reglas compilado"""
+
+    def __init__(self, rules=None):
+        """
+        Args:
+            rules: Diccionario con 'normalizadores', 'equivalencias' e 'ignorar'
+        """
+        rules = rules or {}
+        self.normalizers = [
+            (rule['nombre'], _selector(rule.get('seccion')), _selector(rule.get('campo')), _normalizer_function(rule))
+            for rule in rules.get('normalizadores', [])
+        ]
+        self.equivalences = [
+            (rule['nombre'], _selector(rule.get('seccion')), _selector(rule.get('campo')), rule.get('valores', []))
+            for rule in rules.get('equivalencias', [])
+        ]
+        self.ignores = [
+            (rule['nombre'], _selector(rule.get('seccion')), _selector(rule.get('campo')),
+             re.compile(rule['anterior']) if rule.get('anterior') else None,
+             re.compile(rule['actual']) if rule.get('actual') else None)
+            for rule in rules.get('ignorar', [])
+        ]
+        self.keeping = {rule['nombre'] for rule in rules.get('ignorar', []) if rule.get('conservar_anterior')}
+        self._resolved = {}
+        self.counts = Counter()
+
+    @property
+    def empty(self):
+        return not (self.normalizers or self.equivalences or self.ignores)
+
+    def for_field(self, section, field):
+        """Reglas aplicables a un campo (resueltas una sola vez)"""
+        resolved = self._resolved.get((section, field))
+        if resolved is None:
+            def applies(section_re, field_re):
+                return section_re.match(section) and field_re.match(field)
+
+            resolved = _FieldRules(
+                [(name, function) for name, s, f, function in self.normalizers if applies(s, f)],
+                [(name, values) for name, s, f, values in self.equivalences if applies(s, f)],
+                [(name, old, new) for name, s, f, old, new in self.ignores if applies(s, f)]
+            )
+            self._resolved[(section, field)] = resolved
+        return resolved
+
+    def normalize(self, section, field, value):
+        """Valor normalizado según los normalizadores del campo"""
+        return self.for_field(section, field).normalize(value)
+
+    def suppressing_rule(self, section, field, old_value, new_value):
+        """
+        Regla que suprime un cambio candidato
+
+        Returns:
+            Nombre de la regla o None si el cambio es real
+        """
+        rules = self.for_field(section, field)
+
+        # Normalizadores: basta con que uno iguale los valores
+        old, new = old_value, new_value
+        for name, function in rules.normalizers:
+            if isinstance(old, str):
+                old = function(old)
+            if isinstance(new, str):
+                new = function(new)
+            if old == new:
+                return name
+
+        old = '' if old is None else old
+        new = '' if new is None else new
+        old_class = rules.classes.get(old)
+        if old_class is not None and old_class == rules.classes.get(new):
+            return old_class
+
+        for name, old_pattern, new_pattern in rules.ignores:
+            if old_pattern is None and new_pattern is None:
+                continue
+            if old_pattern is not None and not old_pattern.match(str(old)):
+                continue
+            if new_pattern is not None and not new_pattern.match(str(new)):
+                continue
+            return name
+
+        return None
+
+    def keeping_rule(self, section, field, old_value, new_value):
+        """
+        Regla con 'conservar_anterior' que suprime un cambio candidato
+
+        Returns:
+            Nombre de la regla o None si se guarda el valor actual
+        """
+        if not self.keeping:
+            return None
+        rule = self.suppressing_rule(section, field, old_value, new_value)
+        return rule if rule in self.keeping else None
+
+    def suppresses(self, section, field, old_value, new_value):
+        """Indicar si el cambio se suprime, contabilizándolo en su regla"""
+        if self.empty:
+            return False
+        rule = self.suppressing_rule(section, field, old_value, new_value)
+        if rule is None:
+            return False
+        self.counts[rule] += 1
+        return True
+
+
+_RULES = None
+
+
+def load_rules(rules_file=None):
+    """Compilar un archivo de reglas (reglas vacías si no existe)"""
+    rules_file = rules_file or ConfigAudit.RULES_FILE
+    if not rules_file.exists():
+        return CompiledRules()
+    with open(rules_file, 'rb') as f:
+        return CompiledRules(json_backend.loads(f.read()))
+
+
+def get_rules():
+    """Reglas activas, compiladas en el primer uso"""
+    global _RULES
+    if _RULES is None:
+        _RULES = load_rules()
+    return _RULES
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Exportación por lotes de snapshots a Excel y dashboards
+
+Recorre los snapshots de un rango de fechas (o todos), consulta la caché de
+artefactos (artifact_cache) y genera en paralelo, en procesos separados,
+solo los Excel y dashboards que no están al día: los que no existen o se
+generaron con otra versión del generador o de las plantillas. Tras cambiar
+una plantilla basta con relanzarlo para regenerar todo el historial.
+
+Uso:
+    python batch_export.py --todo                # todos los snapshots
+    python batch_export.py 2026-01-01 [2026-03-31]
+    python batch_export.py --solo excel --forzar
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+from artifact_cache import ArtifactCache
+from config_audit import ConfigAudit
+from html_templates import get_loader
+from json_to_dashboard import (DASHBOARD_TEMPLATES, MODE_DATA, MODE_HTML, DashboardGenerator,
+                               dashboard_artifact, dashboard_options)
+from json_to_excel import ExcelProfessionalConverter, excel_artifact
+from snapshot_format import open_snapshot
+
+KINDS = ['excel', 'dashboard']
+
+
+def plan_exports(from_date=None, to_date=None, kinds=None, mode=None, self_contained=None,
+                 force=False, cache=None):
+    """
+    Artefactos a generar para los snapshots de un rango
+
+    Solo se leen las cabeceras de los snapshots (huella y recuentos).
+
+    Returns:
+        Tupla (tareas pendientes, número de artefactos al día). Cada tarea es
+        un dict con 'tipo', 'fecha', 'snapshot', 'clave', 'archivo' y
+        'opciones'.
+    """
+    cache = cache or ArtifactCache()
+    tasks = []
+    up_to_date = 0
+
+    for snapshot_date, snapshot_file in ConfigAudit.list_snapshot_files():
+        if (from_date and snapshot_date < from_date) or (to_date and snapshot_date > to_date):
+            continue
+        snapshot = open_snapshot(snapshot_file)
+
+        for kind in kinds or KINDS:
+            if kind == 'excel':
+                options = {}
+                key, filename = excel_artifact(snapshot)
+            else:
+                snapshot_mode, snapshot_self_contained = dashboard_options(snapshot, mode, self_contained)
+                options = {'mode': snapshot_mode, 'self_contained': snapshot_self_contained}
+                key, filename = dashboard_artifact(snapshot, snapshot_mode, snapshot_self_contained)
+
+            if not force and cache.get(key) is not None:
+                up_to_date += 1
+                continue
+            tasks.append({'tipo': kind, 'fecha': snapshot_date, 'snapshot': snapshot_file,
+                          'clave': key, 'archivo': cache.directory / filename, 'opciones': options})
+
+    return tasks, up_to_date
+
+
+def _export(kind, snapshot_file, output_file, options):
+    """
+    Generar un artefacto (en un proceso del pool)
+
+    Se genera con ruta explícita, sin pasar por la caché: el registro lo
+    hace el proceso principal, el único que escribe el manifiesto.
+
+    Returns:
+        Segundos empleados
+    """
+    start = time.perf_counter()
+    # Los generadores informan por consola; en lote solo interesa el resumen
+    with contextlib.redirect_stdout(io.StringIO()):
+        if kind == 'excel':
+            ExcelProfessionalConverter().convert_json_to_excel(snapshot_file, output_file)
+        else:
+            DashboardGenerator().generate_html_dashboard(snapshot_file, output_file, **options)
+    return time.perf_counter() - start
+
+
+def run_exports(tasks, workers=None, cache=None):
+    """
+    Generar las tareas en un pool de procesos y registrarlas en la caché
+
+    Returns:
+        Lista de resultados {'tarea', 'segundos' o 'error'} en orden de finalización
+    """
+    cache = cache or ArtifactCache()
+    if not tasks:
+        return []
+
+    # Publicar los recursos CSS/JS antes de repartir el trabajo (los
+    # procesos los encuentran ya escritos y no compiten por el mismo archivo)
+    loader = get_loader()
+    for task in tasks:
+        if task['tipo'] == 'dashboard' and not task['opciones']['self_contained']:
+            for name in DASHBOARD_TEMPLATES[task['opciones']['mode']]:
+                if name.endswith(('.css', '.js')):
+                    loader.publish(name)
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers or ConfigAudit.BATCH_EXPORT_WORKERS) as executor:
+        futures = {executor.submit(_export, task['tipo'], task['snapshot'], task['archivo'], task['opciones']): task
+                   for task in tasks}
+        for future in as_completed(futures):
+            task = futures[future]
+            try:
+                seconds = future.result()
+            except Exception as e:
+                print(f"   ❌ {task['fecha']} {task['tipo']:<9} {str(e)}")
+                results.append({'tarea': task, 'error': str(e)})
+                continue
+
+            cache.put(task['clave'], task['archivo'], task['tipo'])
+            print(f"   ✅ {task['fecha']} {task['tipo']:<9} {seconds:6.2f} s  {task['archivo'].name}")
+            results.append({'tarea': task, 'segundos': seconds})
+
+    return results
+
+
+def main():
+    """Función principal"""
+    parser = argparse.ArgumentParser(description="Exportar snapshots Neotel a Excel y dashboards en lote")
+    parser.add_argument('desde', nargs='?', help="Fecha inicial YYYY-MM-DD (sin fechas hace falta --todo)")
+    parser.add_argument('hasta', nargs='?', help="Fecha final YYYY-MM-DD (default: el más reciente)")
+    parser.add_argument('--todo', action='store_true',
+                        help="Exportar todo el historial de snapshots (en lugar de un rango de fechas)")
+    parser.add_argument('--solo', choices=KINDS, help="Generar solo Excel o solo dashboards")
+    parser.add_argument('--modo', choices=[MODE_HTML, MODE_DATA],
+                        help="Modo de los dashboards (default: según tamaño de cada snapshot)")
+    parser.add_argument('--autocontenido', '--self-contained', dest='autocontenido', action='store_true', default=None,
+                        help="Incrustar CSS/JS en los dashboards")
+    parser.add_argument('--forzar', action='store_true', help="Regenerar aunque estén al día")
+    parser.add_argument('--procesos', type=int, help="Procesos en paralelo (default: ConfigAudit.BATCH_EXPORT_WORKERS)")
+    args = parser.parse_args()
+    if args.todo and args.desde:
+        parser.error("--todo no admite fechas")
+    if not args.todo and not args.desde:
+        parser.error("indique un rango de fechas o --todo para exportar todo el historial")
+
+    print("=" * 80)
+    print("📦 EXPORTACIÓN POR LOTES - NEOTEL")
+    print("=" * 80)
+    print()
+
+    try:
+        from_date = datetime.strptime(args.desde, '%Y-%m-%d').date() if args.desde else None
+        to_date = datetime.strptime(args.hasta, '%Y-%m-%d').date() if args.hasta else None
+
+        cache = ArtifactCache()
+        tasks, up_to_date = plan_exports(from_date, to_date, [args.solo] if args.solo else None,
+                                         args.modo, args.autocontenido, args.forzar, cache)
+        print(f"📋 {len(tasks)} artefactos por generar, {up_to_date} al día")
+
+        start = time.perf_counter()
+        results = run_exports(tasks, args.procesos, cache)
+        elapsed = time.perf_counter() - start
+
+        failed = [result for result in results if 'error' in result]
+        print()
+        print("=" * 80)
+        print(f"✅ {len(results) - len(failed)} generados, ♻️  {up_to_date} al día, ❌ {len(failed)} con error")
+        print(f"⏱️  {elapsed:.1f} s en total")
+        print("=" * 80)
+
+        if failed:
+            sys.exit(1)
+
+    except Exception as e:
+        print(f"\n❌ Error: {str(e)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
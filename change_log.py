@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Flujo de eventos de cambio (JSONL) emitido en cada auditoría
+
+Cada cambio detectado se añade como un evento normalizado, una línea JSON,
+al log de eventos del día (un archivo por fecha de auditoría). Los sistemas
+externos (SIEM, ticketing, dashboards) consumen el flujo de forma
+incremental: el lector reanuda desde un desplazamiento en bytes y solo
+entrega líneas completas, sin volver a leer snapshots ni repetir el diff.
+
+Formato de cada evento:
+    {timestamp, auditoria, desde, seccion, clave, tipo, campo, anterior, actual}
+
+Uso:
+    python change_log.py [--desde YYYY-MM-DD] [--offset N] [--cursor archivo] [--follow]
+"""
+
+import argparse
+import sys
+import time
+from datetime import datetime, timedelta
+
+import json_backend
+from config_audit import ConfigAudit
+from diff_engine import SCHEMAS
+
+# Tipos de evento
+ALTA = 'alta'
+BAJA = 'baja'
+MODIFICACION = 'modificacion'
+RENOMBRADO = 'renombrado'
+
+
+def _collection_events(base, collection, deltas):
+    """Eventos de una colección anidada (p.ej. miembros de una cola)"""
+    for item in deltas.get('added', []):
+        yield {**base, 'tipo': ALTA, 'campo': f"{collection}[{item.get('extension', '')}]",
+               'anterior': None, 'actual': item}
+    for item in deltas.get('removed', []):
+        yield {**base, 'tipo': BAJA, 'campo': f"{collection}[{item.get('extension', '')}]",
+               'anterior': item, 'actual': None}
+    for entry in deltas.get('modified', []):
+        for campo in entry.get('campos', []):
+            yield {**base, 'tipo': MODIFICACION, 'campo': f"{collection}[{entry['clave']}].{campo['campo']}",
+                   'anterior': campo['anterior'], 'actual': campo['actual']}
+
+
+def changes_to_events(changes, audit_date, previous_date=None, timestamp=None, schemas=SCHEMAS):
+    """
+    Convertir un conjunto de cambios en eventos normalizados
+
+    Args:
+        changes: Conjunto de cambios de diff_engine
+        audit_date: Fecha de la auditoría
+        previous_date: Fecha del snapshot con el que se comparó
+        timestamp: Marca de tiempo de los eventos (default: ahora)
+
+    Returns:
+        Lista de eventos (un evento por entidad añadida/eliminada y uno por
+        campo modificado)
+    """
+    common = {
+        'timestamp': timestamp or datetime.now().isoformat(timespec='seconds'),
+        'auditoria': audit_date.isoformat(),
+        'desde': previous_date.isoformat() if previous_date else None
+    }
+    events = []
+
+    for schema in schemas:
+        added_key, removed_key, modified_key = schema.change_keys
+        section = {**common, 'seccion': schema.name}
+
+        for entity in changes.get(added_key, []):
+            events.append({**section, 'clave': entity.get(schema.key), 'tipo': ALTA,
+                           'campo': None, 'anterior': None, 'actual': entity})
+
+        for entity in changes.get(removed_key, []):
+            events.append({**section, 'clave': entity.get(schema.key), 'tipo': BAJA,
+                           'campo': None, 'anterior': entity, 'actual': None})
+
+        for entry in changes.get(schema.renamed_key, []):
+            base = {**section, 'clave': entry['clave_actual']}
+            events.append({**base, 'tipo': RENOMBRADO, 'campo': schema.key,
+                           'anterior': entry['clave_anterior'], 'actual': entry['clave_actual']})
+            for campo in entry.get('campos', []):
+                events.append({**base, 'tipo': MODIFICACION, 'campo': campo['campo'],
+                               'anterior': campo['anterior'], 'actual': campo['actual']})
+            for collection, deltas in entry.get('colecciones', {}).items():
+                events.extend(_collection_events(base, collection, deltas))
+
+        for entry in changes.get(modified_key, []):
+            base = {**section, 'clave': entry.get(schema.key)}
+            for campo in entry.get('campos', []):
+                events.append({**base, 'tipo': MODIFICACION, 'campo': campo['campo'],
+                               'anterior': campo['anterior'], 'actual': campo['actual']})
+            for collection, deltas in entry.get('colecciones', {}).items():
+                events.extend(_collection_events(base, collection, deltas))
+
+    return events
+
+
+def _audit_recorded(log_file, audit, since):
+    """Indicar si el log ya contiene eventos de la auditoría (auditoria, desde)"""
+    if not log_file.exists():
+        return False
+    with open(log_file, 'rb') as f:
+        for line in f:
+            if not line.endswith(b'\n'):
+                break
+            if line.strip():
+                event = json_backend.loads(line)
+                if event['auditoria'] == audit and event['desde'] == since:
+                    return True
+    return False
+
+
+def append_events(changes, audit_date, previous_date=None):
+    """
+    Añadir los eventos de una auditoría al log del día
+
+    Todas las líneas se escriben en una única operación, así un lector
+    concurrente nunca ve una auditoría a medias salvo la última línea
+    incompleta, que el lector descarta hasta que se complete.
+
+    La escritura es idempotente por (audit_date, previous_date): si el log
+    ya tiene eventos de esa auditoría (se relanzó el mismo día contra el
+    mismo snapshot anterior) no se añade nada. El log nunca se reescribe,
+    así los desplazamientos guardados por los lectores siguen siendo
+    válidos; los eventos que cuentan son los de la primera ejecución.
+
+    Returns:
+        Número de eventos escritos (0 si la auditoría ya estaba registrada)
+    """
+    events = changes_to_events(changes, audit_date, previous_date)
+    if not events:
+        return 0
+
+    log_file = ConfigAudit.get_event_log_filename(audit_date)
+    if _audit_recorded(log_file, events[0]['auditoria'], events[0]['desde']):
+        return 0
+
+    ConfigAudit.EVENTS_DIR.mkdir(parents=True, exist_ok=True)
+    payload = b''.join(json_backend.dumps(event) + b'\n' for event in events)
+    with open(log_file, 'ab') as f:
+        f.write(payload)
+    return len(events)
+
+
+class ChangeEventReader:
+    """Lector incremental del flujo de eventos (reanudable por desplazamiento)"""
+
+    def __init__(self, start_date=None, offset=0):
+        """
+        Args:
+            start_date: Fecha del primer log a leer (default: el más antiguo)
+            offset: Desplazamiento en bytes dentro de ese log
+        """
+        self.date = start_date or self._first_log_date()
+        self.offset = offset
+
+    @staticmethod
+    def _first_log_date():
+        """Fecha del log de eventos más antiguo (hoy si no hay ninguno)"""
+        dates = []
+        for log_file in ConfigAudit.EVENTS_DIR.glob("*_events.jsonl"):
+            try:
+                dates.append(datetime.strptime(log_file.name.split('_')[0], '%Y-%m-%d').date())
+            except ValueError:
+                continue
+        return min(dates) if dates else datetime.now().date()
+
+    @property
+    def cursor(self):
+        """Posición actual {fecha, offset}, para persistirla entre ejecuciones"""
+        return {'fecha': self.date.isoformat(), 'offset': self.offset}
+
+    def read_available(self):
+        """
+        Leer los eventos completos disponibles desde la posición actual
+
+        Al agotar el log de una fecha se pasa al día siguiente solo si ya es
+        una fecha pasada (el log de hoy aún puede crecer).
+
+        Yields:
+            Eventos (dict); self.offset avanza tras cada línea completa
+        """
+        today = datetime.now().date()
+        while True:
+            log_file = ConfigAudit.get_event_log_filename(self.date)
+            if log_file.exists():
+                with open(log_file, 'rb') as f:
+                    f.seek(self.offset)
+                    for line in f:
+                        if not line.endswith(b'\n'):
+                            # Línea todavía en escritura
+                            break
+                        self.offset += len(line)
+                        if line.strip():
+                            yield json_backend.loads(line)
+
+            if self.date >= today:
+                return
+            self.date += timedelta(days=1)
+            self.offset = 0
+
+    def follow(self, poll_interval=5):
+        """Leer indefinidamente, esperando nuevos eventos (como tail -f)"""
+        while True:
+            yield from self.read_available()
+            time.sleep(poll_interval)
+
+
+def _load_cursor(cursor_file):
+    """Leer la posición guardada (None si no existe)"""
+    try:
+        with open(cursor_file, 'rb') as f:
+            cursor = json_backend.loads(f.read())
+        return datetime.strptime(cursor['fecha'], '%Y-%m-%d').date(), cursor['offset']
+    except FileNotFoundError:
+        return None
+
+
+def _save_cursor(cursor_file, cursor):
+    """Guardar la posición actual"""
+    with open(cursor_file, 'wb') as f:
+        f.write(json_backend.dumps(cursor))
+
+
+def main():
+    """Función principal: volcar eventos a stdout (una línea JSON por evento)"""
+    parser = argparse.ArgumentParser(description="Leer el flujo de eventos de cambio Neotel")
+    parser.add_argument('--desde', help="Fecha del primer log YYYY-MM-DD (default: el más antiguo)")
+    parser.add_argument('--offset', type=int, default=0, help="Desplazamiento en bytes dentro del primer log")
+    parser.add_argument('--cursor', help="Archivo donde se lee y guarda la posición entre ejecuciones")
+    parser.add_argument('--follow', action='store_true', help="Seguir esperando nuevos eventos")
+    args = parser.parse_args()
+
+    try:
+        start_date = datetime.strptime(args.desde, '%Y-%m-%d').date() if args.desde else None
+        offset = args.offset
+        if args.cursor:
+            saved = _load_cursor(args.cursor)
+            if saved:
+                start_date, offset = saved
+
+        reader = ChangeEventReader(start_date, offset)
+        events = reader.follow() if args.follow else reader.read_available()
+        for event in events:
+            sys.stdout.write(json_backend.dumps(event).decode('utf-8') + '\n')
+            sys.stdout.flush()
+            if args.cursor:
+                _save_cursor(args.cursor, reader.cursor)
+
+        if args.cursor:
+            _save_cursor(args.cursor, reader.cursor)
+
+    except KeyboardInterrupt:
+        pass
+    except Exception as e:
+        print(f"\n❌ Error: {str(e)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Reporte HTML de cambios a partir de plantillas precompiladas
+
+Renderiza el modelo del reporte (report_model) a HTML. El reporte se
+compone de fragmentos (cabecera, una pestaña por sección y pie)
+renderizados con las plantillas de templates/ (html_templates) y escritos
+directamente en el archivo, elemento a elemento, sin montar el documento en
+memoria. Cada sección se renderiza de forma independiente: con
+muchos cambios, las secciones se reparten entre procesos que las vuelcan en
+archivos temporales, y se copian en orden al reporte.
+"""
+
+import logging
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+from config_audit import ConfigAudit
+from html_templates import Markup, escape, get_loader, get_template
+from report_model import GROUP_KINDS, report_day
+
+
+def _item_details(entry):
+    """Detalle de un cambio: resumen, campos (anterior → actual) y miembros"""
+    parts = [escape(entry['resumen'] or ''),
+             get_template('field_change.html').render_each(entry['campos'])]
+
+    miembros = entry['miembros']
+    if miembros:
+        member_list = get_template('member_list.html')
+        if miembros['añadidos']:
+            parts.append(member_list.render(titulo='✅ Miembros añadidos', miembros=', '.join(miembros['añadidos'])))
+        if miembros['eliminados']:
+            parts.append(member_list.render(titulo='❌ Miembros eliminados', miembros=', '.join(miembros['eliminados'])))
+        parts.append(get_template('field_change.html').render_each(miembros['estados']))
+    return Markup(''.join(parts))
+
+
+def _section_block(group):
+    """Bloque de un grupo de cambios (añadidas, eliminadas, ...), elemento a elemento"""
+    tipo, icon, _ = GROUP_KINDS[group['tipo']]
+    item_template = get_template('item.html')
+    yield get_template('section_start.html').render(tipo=tipo, icono=icon, titulo=group['titulo'],
+                                                    total=len(group['entradas']))
+    for entry in group['entradas']:
+        yield item_template.render(tipo=tipo, cabecera=entry['cabecera'], detalles=_item_details(entry))
+    yield get_template('section_end.html').render()
+
+
+def iter_section(section):
+    """
+    Fragmentos HTML de la pestaña de una sección, en orden
+
+    Args:
+        section: Sección del modelo del reporte (report_model.build_section)
+    """
+    for group in section['grupos']:
+        yield from _section_block(group)
+
+    if not section['grupos']:
+        yield get_template('no_changes.html').render(seccion=section['sin_cambios'])
+
+
+def _spool_section(section):
+    """
+    Escribir la pestaña de una sección en un archivo temporal
+
+    Se ejecuta en otro proceso: devuelve solo la ruta del archivo, no el HTML.
+    La copia al reporte la borra.
+    """
+    with tempfile.NamedTemporaryFile('w', encoding='utf-8', suffix=f"_{section['nombre']}.html", delete=False) as f:
+        f.writelines(iter_section(section))
+        return f.name
+
+
+def render_report(report, output_file=None, logger=None, self_contained=None):
+    """
+    Generar el reporte HTML de un modelo de reporte
+
+    Args:
+        report: Modelo del reporte (report_model.build_report)
+        output_file: Archivo de salida (default: el del día en REPORTS_DIR)
+        self_contained: Incrustar CSS/JS en lugar de enlazar los recursos
+                        compartidos (default: ConfigAudit.REPORT_SELF_CONTAINED)
+
+    Returns:
+        Ruta del reporte
+    """
+    logger = logger or logging.getLogger(__name__)
+    output_file = output_file or ConfigAudit.get_report_filename(report_day(report))
+    if self_contained is None:
+        self_contained = ConfigAudit.REPORT_SELF_CONTAINED
+    loader = get_loader()
+    totals = report['totales']
+    sections = report['secciones']
+
+    # Entidades no visitadas (copiadas del snapshot anterior)
+    carried_note = f" | ⏭️ {report['arrastrados']} sin visitar" if report['arrastrados'] else ""
+
+    tab_start = loader.get('tab_start.html')
+    tab_end = loader.get('tab_end.html').render()
+    parallel = totals['total'] >= ConfigAudit.REPORT_PARALLEL_MIN_CHANGES
+    executor = ProcessPoolExecutor(max_workers=len(sections)) if parallel else None
+    try:
+        if parallel:
+            # Cada proceso vuelca su sección en un archivo temporal
+            logger.info(f"🧵 Renderizando {len(sections)} secciones en paralelo ({totals['total']} cambios)")
+            spooled = [executor.submit(_spool_section, section) for section in sections]
+
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write(loader.get('report_head.html').render(
+                estilos=loader.asset_tag('report.css', output_file, self_contained),
+                fecha=report_day(report).strftime('%d/%m/%Y'),
+                generado=datetime.fromisoformat(report['generado']).strftime('%d/%m/%Y %H:%M:%S'),
+                nota_arrastrados=carried_note,
+                totales=totals
+            ))
+            for index, section in enumerate(sections):
+                f.write(tab_start.render(id=section['nombre'], activa=' active' if index == 0 else ''))
+                if parallel:
+                    spool_file = Path(spooled[index].result())
+                    try:
+                        with open(spool_file, 'r', encoding='utf-8') as part:
+                            shutil.copyfileobj(part, f)
+                    finally:
+                        spool_file.unlink()
+                else:
+                    f.writelines(iter_section(section))
+                f.write(tab_end)
+            f.write(loader.get('report_end.html').render(
+                scripts=loader.asset_tag('report.js', output_file, self_contained)))
+    finally:
+        if executor:
+            executor.shutdown()
+            # Temporales no copiados si el reporte falló a mitad
+            for future in spooled:
+                if not future.cancelled() and future.exception() is None:
+                    Path(future.result()).unlink(missing_ok=True)
+
+    return output_file
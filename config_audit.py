@@ -36,14 +36,61 @@ class ConfigAudit:
     # === DIRECTORIOS ===
     BASE_DIR = Path(__file__).parent
     SNAPSHOTS_DIR = BASE_DIR / "config_snapshots"
+    COMPACTED_DIR = SNAPSHOTS_DIR / "compacted"
+    DELTAS_DIR = SNAPSHOTS_DIR / "deltas"
+    EVENTS_DIR = BASE_DIR / "change_events"
+    WATCH_DIR = BASE_DIR / "queue_watch"
+    RULES_FILE = BASE_DIR / "audit_rules.json"  # Normalizadores, equivalencias y cambios a ignorar
     REPORTS_DIR = BASE_DIR / "change_reports"
+    ASSETS_DIR = REPORTS_DIR / "assets"  # CSS/JS compartidos por reportes y dashboards
+    HISTORY_DIR = REPORTS_DIR / "historial"  # Dashboard de historial (índice + datos por día)
+    TEMPLATE_CACHE_DIR = BASE_DIR / "template_cache"  # Plantillas del reporte ya compiladas
     LOG_DIR = BASE_DIR / "logs"
     DOWNLOAD_DIR = BASE_DIR / "temp_downloads"
     
     # === CONFIGURACIÓN GENERAL ===
-    RETENTION_DAYS = 30  # Días de retención de snapshots
+    RETENTION_DAYS = 30  # Días de retención de snapshots (extractor v1)
+    RETENTION_DAILY_DAYS = 14  # Resolución diaria durante N días
+    RETENTION_WEEKLY_MONTHS = 6  # Resolución semanal durante M meses (mensual después)
+    SNAPSHOT_SUFFIX = ".snap"  # Formato contenedor con cabecera e índice de secciones
+    JSON_BACKEND = "auto"  # auto | orjson | msgspec | json
+    
+    # Campos volátiles que se guardan pero no se auditan (excluidos de huellas y diff)
+    CAMPOS_NO_AUDITADOS = {
+        'colas': ['contadores']  # Contadores Est/Pen/Pri de los miembros
+    }
     HEADLESS_BROWSER = True  # Chrome sin interfaz gráfica
     
+    # === DETECCIÓN DE RENOMBRADOS ===
+    RENAME_DETECTION = True  # Emparejar eliminadas/añadidas como renombrados
+    RENAME_MIN_CONFIDENCE = 0.6  # Similitud mínima (Jaccard de atributos)
+    RENAME_MAX_POSTING = 50  # Ignorar atributos compartidos por más entidades
+    
+    # === PLANIFICACIÓN DEL RECORRIDO ===
+    CRAWL_TIME_BUDGET_MINUTES = None  # Límite del recorrido de DIDs y colas (None = sin límite)
+    CRAWL_HISTORY_DAYS = 30  # Días de deltas para la frecuencia de cambios
+    CRAWL_CHURN_WEIGHT = 5  # Peso de cada cambio histórico frente a cada día sin visitar
+    
+    # Comprobación previa: comparar las listas antes de abrir cada detalle
+    PRECHECK_ENABLED = True
+    PRECHECK_SAMPLE_SIZE = 15  # Detalles releídos por sección aunque la lista no cambie
+    PRECHECK_MAX_CHANGE_RATIO = 0.2  # Más cambios estructurales -> recorrido completo
+    PRECHECK_FULL_CRAWL_WEEKDAY = 6  # Recorrido completo semanal (0=lunes, 6=domingo; None = nunca)
+    
+    # === VIGILANCIA DE COLAS ===
+    WATCH_INTERVAL_SECONDS = 60  # Frecuencia de sondeo de la tabla de extensiones
+    WATCH_SETTLE_SECONDS = 5  # Pausa de carga de la tabla en cada sondeo
+    WATCH_MIN_READ_RATIO = 0.5  # Sondeo con menos filas que esta fracción del anterior = fallido (hueco)
+    
+    # === REPORTE HTML ===
+    REPORT_PARALLEL_MIN_CHANGES = 50000  # A partir de N cambios, secciones en procesos separados
+    DASHBOARD_DATA_MIN_ROWS = 2000  # A partir de N filas, dashboard en modo datos (listas virtualizadas)
+    HISTORY_DASHBOARD = True  # Actualizar el dashboard de historial tras cada auditoría
+    ARTIFACT_CACHE_MAX_MB = 500  # Límite de Excel/dashboards en caché (se eliminan los menos usados)
+    BATCH_EXPORT_WORKERS = None  # Procesos de batch_export (None = uno por CPU)
+    REPORT_SELF_CONTAINED = False  # Incrustar CSS/JS en cada HTML en lugar de enlazar change_reports/assets/
+    REPORT_FORMATS = ['markdown', 'json']  # Formatos guardados junto al reporte HTML (report_model.RENDERERS)
+    
     # === LOGGING ===
     LOG_LEVEL = "INFO"
     LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -53,6 +100,11 @@ class ConfigAudit:
     ELEMENT_WAIT_TIMEOUT = 20
     DOWNLOAD_TIMEOUT = 60
     
+    # === VERIFICACIÓN DE CAMBIOS ===
+    VERIFY_CHANGES = True  # Releer eliminadas/modificadas antes de reportar
+    VERIFY_TIMEOUT = 45  # Espera por elemento en la segunda pasada (segundos)
+    VERIFY_MAX_ENTITIES = 60  # Máximo de entidades releídas por auditoría
+    
     # === SELECTORES CSS (basados en análisis de Chosen.js) ===
     SELECTORES = {
         # Login
@@ -95,6 +147,63 @@ class ConfigAudit:
             date = datetime.now().date()
         return cls.SNAPSHOTS_DIR / f"{date.strftime('%Y-%m-%d')}_config.json"
     
+    @classmethod
+    def get_snapshot_container_filename(cls, date=None):
+        """Obtener nombre de archivo snapshot (formato contenedor) para una fecha"""
+        if date is None:
+            date = datetime.now().date()
+        return cls.SNAPSHOTS_DIR / f"{date.strftime('%Y-%m-%d')}_config{cls.SNAPSHOT_SUFFIX}"
+    
+    @classmethod
+    def find_snapshot_file(cls, date):
+        """Buscar el snapshot de una fecha (contenedor o JSON heredado)"""
+        for snapshot_file in (cls.get_snapshot_container_filename(date),
+                              cls.get_snapshot_filename(date)):
+            if snapshot_file.exists():
+                return snapshot_file
+        return None
+    
+    @classmethod
+    def list_snapshot_files(cls):
+        """
+        Listar snapshots disponibles ordenados por fecha
+        
+        Returns:
+            Lista de tuplas (fecha, ruta). Si una fecha tiene ambos formatos
+            se devuelve el contenedor.
+        """
+        snapshots = {}
+        for snapshot_file in cls.SNAPSHOTS_DIR.glob("*_config.*"):
+            if snapshot_file.suffix not in (cls.SNAPSHOT_SUFFIX, '.json'):
+                continue
+            try:
+                date = datetime.strptime(snapshot_file.stem.split('_')[0], '%Y-%m-%d').date()
+            except ValueError:
+                continue
+            if date not in snapshots or snapshot_file.suffix == cls.SNAPSHOT_SUFFIX:
+                snapshots[date] = snapshot_file
+        return sorted(snapshots.items())
+    
+    @classmethod
+    def get_compacted_log_filename(cls, date):
+        """Obtener log compactado (JSONL mensual) que recoge una fecha"""
+        return cls.COMPACTED_DIR / f"{date.strftime('%Y-%m')}_changes.jsonl"
+    
+    @classmethod
+    def get_delta_filename(cls, date):
+        """Obtener archivo del delta diario que termina en una fecha"""
+        return cls.DELTAS_DIR / f"{date.strftime('%Y-%m-%d')}_delta.json"
+    
+    @classmethod
+    def get_event_log_filename(cls, date):
+        """Obtener log de eventos de cambio (JSONL diario) de una fecha"""
+        return cls.EVENTS_DIR / f"{date.strftime('%Y-%m-%d')}_events.jsonl"
+    
+    @classmethod
+    def get_watch_filename(cls, date):
+        """Obtener serie temporal (JSONL diario) de transiciones de estado de colas"""
+        return cls.WATCH_DIR / f"{date.strftime('%Y-%m-%d')}_queue_states.jsonl"
+    
     @classmethod
     def get_report_filename(cls, date=None):
         """Obtener nombre de archivo reporte para una fecha"""
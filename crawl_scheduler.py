@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Orden del recorrido por probabilidad de cambio y presupuesto de tiempo
+
+El recorrido de DIDs y colas (una visita al detalle por entidad) se ordena
+por prioridad en lugar de seguir el orden del desplegable:
+
+- entidades nuevas (no están en el snapshot anterior): siempre primero
+- frecuencia histórica de cambios (deltas diarios de los últimos días)
+- antigüedad de la última visita real (días desde que se leyó)
+
+Con un presupuesto de tiempo, cada sección recibe una parte proporcional a
+las visitas que prevé su plan y, al agotarse, las entidades sin visitar se
+marcan como arrastradas: se copian del snapshot anterior en lugar de darse
+por eliminadas, y la fecha de su última visita real se conserva en la sección
+'_arrastrados' del snapshot para priorizarlas en la siguiente auditoría.
+
+Antes del recorrido, una comprobación previa compara la vista de lista de
+cada sección (pares texto/valor del desplegable, una sola lectura) con el
+snapshot anterior y decide el plan: recorrido completo, solo las entidades
+nuevas más una muestra rotatoria (las de mayor prioridad), o ninguno. La
+tabla de extensiones ya contiene todos sus campos: se lee en una sola
+llamada y, si su huella coincide con la del snapshot anterior, no se
+recorre fila a fila.
+
+En un día sin cambios el tiempo lo marcan el inicio de sesión, la
+navegación y las PRECHECK_SAMPLE_SIZE visitas de detalle por sección (unos
+segundos cada una, con sus pausas de cierre de modales): con la muestra por
+defecto la auditoría no baja del minuto; solo lo hace con una muestra de
+pocas entidades.
+"""
+
+import hashlib
+import logging
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+
+import json_backend
+from config_audit import ConfigAudit
+from diff_engine import SCHEMAS_BY_NAME
+from normalization import normalize_config
+from snapshot_format import compute_digests
+
+# Sección del snapshot con {sección: {clave: fecha de la última visita real}}
+CARRIED_SECTION = '_arrastrados'
+
+# Secciones recorridas entidad a entidad, en el orden de la auditoría
+SCHEDULED_SECTIONS = ['dids', 'colas']
+
+
+# Planes de la comprobación previa
+PLAN_FULL = 'completo'
+PLAN_PARTIAL = 'parcial'
+PLAN_NONE = 'ninguno'
+
+
+def list_fingerprint(options):
+    """Huella de una vista de lista (pares clave/id interno, sin orden)"""
+    payload = json_backend.dumps(sorted([str(key), str(value)] for key, value in options))
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+def load_churn(today, days):
+    """
+    Número de cambios por entidad en los deltas de los últimos días
+
+    Returns:
+        {sección: Counter(clave -> cambios)}
+    """
+    churn = {section: Counter() for section in SCHEDULED_SECTIONS}
+    for offset in range(1, days + 1):
+        delta_file = ConfigAudit.get_delta_filename(today - timedelta(days=offset))
+        if not delta_file.exists():
+            continue
+        with open(delta_file, 'rb') as f:
+            changes = json_backend.loads(f.read()).get('cambios', {})
+
+        for section in SCHEDULED_SECTIONS:
+            schema = SCHEMAS_BY_NAME[section]
+            added_key, removed_key, modified_key = schema.change_keys
+            for key in (added_key, removed_key, modified_key):
+                churn[section].update(entry.get(schema.key) for entry in changes.get(key, []))
+            churn[section].update(entry['clave_actual'] for entry in changes.get(schema.renamed_key, []))
+    return churn
+
+
+class CrawlScheduler:
+    """Planificador del recorrido entidad a entidad"""
+
+    def __init__(self, previous_snapshot=None, previous_date=None, today=None,
+                 budget_minutes=None, history_days=None, logger=None):
+        """
+        Args:
+            previous_snapshot: Lector del snapshot anterior (open_snapshot) o None
+            previous_date: Fecha del snapshot anterior
+            today: Fecha de la auditoría
+            budget_minutes: Presupuesto de tiempo del recorrido (None = sin límite)
+            history_days: Días de deltas usados para la frecuencia de cambios
+        """
+        self.today = today or datetime.now().date()
+        self.logger = logger or logging.getLogger(__name__)
+        self.end = time.time() + budget_minutes * 60 if budget_minutes else None
+        self.churn = load_churn(self.today, history_days or ConfigAudit.CRAWL_HISTORY_DAYS)
+        self.unvisited = {}
+        self.plans = {}
+        self.previous_digests = previous_snapshot.digests['sections'] if previous_snapshot else {}
+
+        # Última visita real de cada entidad conocida
+        self.previous = {}
+        self.last_visit = {}
+        carried = previous_snapshot.section(CARRIED_SECTION, {}) if previous_snapshot else {}
+        for section in SCHEDULED_SECTIONS:
+            key = SCHEMAS_BY_NAME[section].key
+            entities = previous_snapshot.section(section, []) if previous_snapshot else []
+            self.previous[section] = {entity[key]: entity for entity in entities}
+            carried_section = carried.get(section, {})
+            self.last_visit[section] = {
+                entity_key: datetime.strptime(carried_section[entity_key], '%Y-%m-%d').date()
+                if entity_key in carried_section else previous_date
+                for entity_key in self.previous[section]
+            }
+
+    def score(self, section, key):
+        """Prioridad de una entidad (mayor = antes)"""
+        if key not in self.previous[section]:
+            return float('inf')
+        staleness = (self.today - self.last_visit[section][key]).days if self.last_visit[section][key] else 0
+        return self.churn[section][key] * ConfigAudit.CRAWL_CHURN_WEIGHT + staleness
+
+    def order(self, section, options):
+        """
+        Ordenar las opciones de un desplegable por prioridad
+
+        Args:
+            options: Lista de tuplas (texto, valor) en orden del desplegable
+
+        Returns:
+            Lista reordenada (a igual prioridad se conserva el orden original)
+        """
+        return sorted(options, key=lambda option: -self.score(section, option[0]))
+
+    def plan(self, section, options):
+        """
+        Comprobación previa de una sección a partir de su vista de lista
+
+        Args:
+            options: Lista de tuplas (clave, id interno) leída del desplegable
+
+        Returns:
+            Opciones a visitar, ordenadas por prioridad; las demás quedan
+            marcadas como arrastradas
+        """
+        ordered = self.order(section, options)
+        previous = self.previous[section]
+
+        if not ConfigAudit.PRECHECK_ENABLED or not previous:
+            self.plans[section] = PLAN_FULL
+            return ordered
+        if self.today.weekday() == ConfigAudit.PRECHECK_FULL_CRAWL_WEEKDAY:
+            self.plans[section] = PLAN_FULL
+            self.logger.info(f"📋 Plan {section}: {PLAN_FULL} (día de recorrido completo)")
+            return ordered
+
+        previous_view = [(key, entity.get('id_interno')) for key, entity in previous.items()]
+        # Claves nuevas o cuyo id interno ha cambiado: cambio estructural
+        previous_ids = dict(previous_view)
+        new = [key for key, value in options if previous_ids.get(key) != value]
+        removed = previous_ids.keys() - {key for key, _ in options}
+
+        structural = len(new) + len(removed)
+        if structural / len(previous) > ConfigAudit.PRECHECK_MAX_CHANGE_RATIO:
+            self.plans[section] = PLAN_FULL
+            self.logger.info(f"📋 Plan {section}: {PLAN_FULL} ({structural} cambios estructurales en la lista)")
+            return ordered
+
+        new_keys = set(new)
+        # Muestra rotatoria: las de mayor prioridad (más cambios / más días sin leer)
+        sample = [key for key, _ in ordered if key not in new_keys][:ConfigAudit.PRECHECK_SAMPLE_SIZE]
+        visit = new_keys | set(sample)
+        skipped = [key for key, _ in ordered if key not in visit]
+
+        unchanged = list_fingerprint(options) == list_fingerprint(previous_view)
+        self.plans[section] = PLAN_PARTIAL if visit else PLAN_NONE
+        self.logger.info(f"📋 Plan {section}: {self.plans[section]} "
+                         f"(lista {'sin cambios' if unchanged else 'modificada'}: {len(new)} nuevas, "
+                         f"{len(removed)} eliminadas, {len(sample)} de muestra, {len(skipped)} arrastradas)")
+        if skipped:
+            self.mark_unvisited(section, skipped, reason='plan')
+
+        return [option for option in ordered if option[0] in visit]
+
+    def table_unchanged(self, section, entities):
+        """
+        Comprobación previa de una sección que la vista de lista trae completa
+        (la tabla de extensiones)
+
+        Args:
+            entities: Entidades leídas de la vista de lista
+
+        Returns:
+            True si su huella coincide con la del snapshot anterior (no hace
+            falta leer la sección fila a fila)
+        """
+        previous = self.previous_digests.get(section)
+        if not ConfigAudit.PRECHECK_ENABLED or previous is None:
+            self.plans[section] = PLAN_FULL
+            return False
+        if self.today.weekday() == ConfigAudit.PRECHECK_FULL_CRAWL_WEEKDAY:
+            self.plans[section] = PLAN_FULL
+            self.logger.info(f"📋 Plan {section}: {PLAN_FULL} (día de recorrido completo)")
+            return False
+
+        config_data, _ = normalize_config({section: entities})
+        unchanged = compute_digests(config_data)['sections'].get(section) == previous
+        self.plans[section] = PLAN_NONE if unchanged else PLAN_FULL
+        self.logger.info(f"📋 Plan {section}: {self.plans[section]} "
+                         f"(tabla {'sin cambios' if unchanged else 'modificada'}: {len(entities)} filas)")
+        return unchanged
+
+    def expected_visits(self, section):
+        """
+        Visitas de detalle previstas en una sección aún sin planificar
+
+        Sin comprobación previa (o el día de recorrido completo) se visitan
+        todas las entidades del snapshot anterior; con ella, la muestra
+        rotatoria (las nuevas no se conocen hasta leer su lista).
+        """
+        previous = len(self.previous[section])
+        if not ConfigAudit.PRECHECK_ENABLED or self.today.weekday() == ConfigAudit.PRECHECK_FULL_CRAWL_WEEKDAY:
+            return previous
+        return min(previous, ConfigAudit.PRECHECK_SAMPLE_SIZE)
+
+    def section_deadline(self, section, total):
+        """
+        Instante límite de una sección (None sin presupuesto)
+
+        El tiempo restante se reparte entre esta sección y las siguientes
+        según las visitas que hará cada una (las siguientes, según
+        expected_visits); lo que sobre pasa a las siguientes.
+        """
+        if self.end is None:
+            return None
+        following = SCHEDULED_SECTIONS[SCHEDULED_SECTIONS.index(section) + 1:]
+        pending = total + sum(self.expected_visits(name) for name in following)
+        share = total / pending if pending else 1
+        return time.time() + max(0, self.end - time.time()) * share
+
+    def mark_unvisited(self, section, keys, reason='presupuesto'):
+        """
+        Registrar las entidades que quedan sin visitar
+
+        Args:
+            reason: 'presupuesto' (tiempo agotado) o 'plan' (comprobación previa)
+        """
+        self.unvisited.setdefault(section, []).extend(keys)
+        if reason == 'presupuesto':
+            self.logger.warning(f"⏱️  Presupuesto agotado en {section}: {len(keys)} entidades sin visitar")
+
+    def carry_over(self, config_data):
+        """
+        Completar la configuración con las entidades no visitadas
+
+        Las entidades sin visitar se copian del snapshot anterior y su fecha
+        de última visita real se guarda en la sección '_arrastrados'.
+
+        Returns:
+            Número de entidades arrastradas
+        """
+        carried = {}
+        for section, keys in self.unvisited.items():
+            entities = config_data.setdefault(section, [])
+            for key in keys:
+                previous = self.previous[section].get(key)
+                if previous is None:
+                    # Nueva y sin visitar: aparecerá en la próxima auditoría
+                    continue
+                entities.append(previous)
+                last_visit = self.last_visit[section][key] or self.today
+                carried.setdefault(section, {})[key] = last_visit.isoformat()
+
+        if carried:
+            config_data[CARRIED_SECTION] = carried
+        return sum(len(keys) for keys in carried.values())
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Motor de comparación declarativo para configuraciones Neotel
+
+Cada sección declara su clave, los campos que se auditan y sus colecciones
+anidadas (p.ej. los miembros de una cola). El motor calcula en una sola
+pasada las entidades añadidas, eliminadas y modificadas, con el detalle por
+campo y por miembro, y devuelve un conjunto de cambios que consumen tanto el
+reporte HTML como el email sin volver a comparar nada.
+
+Las reglas de ruido (audit_rules) se aplican campo a campo: un cambio que
+una regla suprime no llega al conjunto de cambios y se contabiliza en
+'suprimidos'.
+"""
+
+from audit_rules import get_rules
+from snapshot_format import config_digests
+
+
+class CollectionSchema:
+    """Colección anidada dentro de una entidad (comparada por clave)"""
+
+    def __init__(self, name, key, fields):
+        """
+        Args:
+            name: Campo de la entidad que contiene la lista
+            key: Campo clave de cada elemento
+            fields: Lista de tuplas (campo, etiqueta) que se comparan
+        """
+        self.name = name
+        self.key = key
+        self.fields = fields
+
+
+class SectionSchema:
+    """Declaración de una sección de la configuración"""
+
+    def __init__(self, name, prefix, key, fields, collections=None, title=None):
+        """
+        Args:
+            name: Nombre de la sección en la configuración ('dids', ...)
+            prefix: Prefijo de las claves de cambios ('dids_added', ...)
+            key: Campo clave de cada entidad
+            fields: Lista de tuplas (campo, etiqueta) que se comparan
+            collections: Lista de CollectionSchema
+            title: Título legible de la sección
+        """
+        self.name = name
+        self.prefix = prefix
+        self.key = key
+        self.fields = fields
+        self.collections = collections or []
+        self.title = title or name.title()
+
+    @property
+    def change_keys(self):
+        return (f'{self.prefix}_added', f'{self.prefix}_removed', f'{self.prefix}_modified')
+
+    @property
+    def renamed_key(self):
+        """Lista de renombrados/movimientos (la rellena rename_detector)"""
+        return f'{self.prefix}_renamed'
+
+
+SCHEMAS = [
+    SectionSchema(
+        name='dids',
+        prefix='dids',
+        key='numero',
+        title='DIDs',
+        fields=[
+            ('id_interno', 'ID interno'),
+            ('locucion', 'Locución'),
+            ('accion1', 'Acción 1'),
+            ('accion2', 'Acción 2'),
+            ('accion3', 'Acción 3'),
+            ('accion4', 'Acción 4'),
+            ('accion5', 'Acción 5')
+        ]
+    ),
+    SectionSchema(
+        name='extensiones',
+        prefix='extensions',
+        key='extension',
+        title='Extensiones',
+        fields=[
+            ('nombre', 'Nombre'),
+            ('grupo', 'Grupo'),
+            ('agente_asignado', 'Agente'),
+            ('numero_saliente', 'Nº Saliente'),
+            ('estado_colas', 'Estado Colas')
+        ]
+    ),
+    SectionSchema(
+        name='colas',
+        prefix='colas',
+        key='nombre',
+        title='Colas',
+        fields=[
+            ('id_interno', 'ID interno')
+        ],
+        collections=[
+            CollectionSchema('miembros', 'extension', [
+                ('estado', 'Estado')
+            ])
+        ]
+    )
+]
+
+SCHEMAS_BY_NAME = {schema.name: schema for schema in SCHEMAS}
+
+
+def _field_deltas(fields, previous, current, section, rules, prefix=''):
+    """Diferencias campo a campo entre dos entidades"""
+    deltas = []
+    for field, label in fields:
+        old_value = previous.get(field)
+        new_value = current.get(field)
+        if old_value != new_value:
+            if rules.suppresses(section, prefix + field, old_value, new_value):
+                continue
+            deltas.append({
+                'campo': field,
+                'etiqueta': label,
+                'anterior': old_value,
+                'actual': new_value
+            })
+    return deltas
+
+
+def _collection_deltas(collection, previous_items, current_items, section, rules):
+    """
+    Diferencias de una colección anidada (añadidos, eliminados, modificados)
+
+    Se comparan conjuntos de tuplas (clave, campos auditados), por lo que el
+    orden de la lista y los campos no auditados no generan cambios.
+    """
+    def as_pairs(items):
+        return {
+            (item.get(collection.key),) + tuple(item.get(field) for field, _ in collection.fields): item
+            for item in items or []
+        }
+
+    previous_pairs = as_pairs(previous_items)
+    current_pairs = as_pairs(current_items)
+    deltas = {'added': [], 'removed': [], 'modified': []}
+
+    if previous_pairs.keys() == current_pairs.keys():
+        return deltas
+
+    removed = {pair[0]: previous_pairs[pair] for pair in previous_pairs.keys() - current_pairs.keys()}
+    added = {pair[0]: current_pairs[pair] for pair in current_pairs.keys() - previous_pairs.keys()}
+
+    for key, item in added.items():
+        if key in removed:
+            campos = _field_deltas(collection.fields, removed[key], item, section, rules, f'{collection.name}.')
+            if not campos:
+                continue
+            deltas['modified'].append({
+                'clave': key,
+                'anterior': removed[key],
+                'actual': item,
+                'campos': campos
+            })
+        else:
+            deltas['added'].append(item)
+
+    deltas['removed'] = [item for key, item in removed.items() if key not in added]
+    return deltas
+
+
+def diff_entity(schema, previous, current, rules=None):
+    """
+    Comparar dos versiones de una entidad
+
+    Args:
+        rules: Reglas de ruido (default: las activas)
+
+    Returns:
+        Entrada de modificación (con 'campos' y 'colecciones') o None si no
+        hay diferencias en los campos auditados
+    """
+    rules = rules or get_rules()
+    fields = _field_deltas(schema.fields, previous, current, schema.name, rules)
+    collections = {}
+    for collection in schema.collections:
+        deltas = _collection_deltas(collection, previous.get(collection.name), current.get(collection.name),
+                                    schema.name, rules)
+        if any(deltas.values()):
+            collections[collection.name] = deltas
+
+    if not fields and not collections:
+        return None
+
+    return {
+        schema.key: current.get(schema.key),
+        'anterior': previous,
+        'actual': current,
+        'campos': fields,
+        'colecciones': collections
+    }
+
+
+def _diff_section(schema, changes, current_config, previous_config, current_digests, previous_digests, rules):
+    """Comparar una sección y volcar el resultado en changes"""
+    added_key, removed_key, modified_key = schema.change_keys
+
+    current_entities = {e[schema.key]: e for e in current_config.get(schema.name, [])}
+    previous_entities = {e[schema.key]: e for e in previous_config.get(schema.name, [])}
+    current_hashes = current_digests['entities'].get(schema.name, {})
+    previous_hashes = previous_digests['entities'].get(schema.name, {})
+
+    for key, entity in current_entities.items():
+        if key not in previous_entities:
+            changes[added_key].append(entity)
+            continue
+
+        # Misma huella: entidad idéntica, no hace falta comparar campos
+        if current_hashes.get(key) == previous_hashes.get(key):
+            continue
+
+        entry = diff_entity(schema, previous_entities[key], entity, rules)
+        if entry:
+            changes[modified_key].append(entry)
+
+    for key, entity in previous_entities.items():
+        if key not in current_entities:
+            changes[removed_key].append(entity)
+
+
+def empty_changes(schemas=SCHEMAS):
+    """Conjunto de cambios vacío con todas las claves de las secciones"""
+    changes = {'has_changes': False, 'is_first_run': False}
+    for schema in schemas:
+        for change_key in schema.change_keys + (schema.renamed_key,):
+            changes[change_key] = []
+    return changes
+
+
+def count_changes(changes, schemas=SCHEMAS):
+    """
+    Totales de un conjunto de cambios
+
+    Returns:
+        {prefijo de sección: n, ..., 'total': n}
+    """
+    if 'totales' in changes:
+        return changes['totales']
+
+    totals = {}
+    for schema in schemas:
+        totals[schema.prefix] = sum(len(changes.get(change_key, []))
+                                    for change_key in schema.change_keys + (schema.renamed_key,))
+    totals['total'] = sum(totals.values())
+    return totals
+
+
+def change_lists(changes):
+    """Solo las listas de cambios no vacías (para persistir)"""
+    return {key: value for key, value in changes.items() if isinstance(value, list) and value}
+
+
+def finalize_changes(changes, schemas=SCHEMAS):
+    """Recalcular 'totales' y 'has_changes' de un conjunto de cambios"""
+    changes.pop('totales', None)
+    totals = count_changes(changes, schemas)
+    changes['totales'] = totals
+    changes['has_changes'] = totals['total'] > 0
+    return changes
+
+
+def diff_configs(current_config, previous_config, schemas=SCHEMAS, rules=None):
+    """
+    Comparar dos configuraciones
+
+    Args:
+        current_config: Configuración actual (dict o mapping perezoso)
+        previous_config: Configuración anterior
+        schemas: Secciones a comparar
+        rules: Reglas de ruido (default: las activas)
+
+    Returns:
+        Diccionario con las listas <prefijo>_added/_removed/_modified,
+        'has_changes', 'is_first_run', 'totales' y 'suprimidos'
+        (cambios descartados por cada regla)
+    """
+    changes = empty_changes(schemas)
+    rules = rules or get_rules()
+    counts_before = rules.counts.copy()
+
+    current_digests = config_digests(current_config)
+    previous_digests = config_digests(previous_config)
+
+    if current_digests['config'] != previous_digests['config']:
+        for schema in schemas:
+            if current_digests['sections'].get(schema.name) == previous_digests['sections'].get(schema.name):
+                continue
+            _diff_section(schema, changes, current_config, previous_config, current_digests, previous_digests, rules)
+
+    changes['suprimidos'] = dict(rules.counts - counts_before)
+    return finalize_changes(changes, schemas)
@@ -12,6 +12,9 @@ from email import encoders
 from datetime import datetime
 from pathlib import Path
 
+from html_templates import get_loader
+from report_model import build_report, render_text
+
 class EmailSender:
     """Gestor de envío de emails"""
     
@@ -25,29 +28,23 @@ class EmailSender:
         self.config = config
         self.logger = logging.getLogger(__name__)
     
-    def send_change_report(self, report_file, changes, report_date):
-        """Enviar email con reporte de cambios (versión mejorada)"""
+    def send_change_report(self, report_file, changes, report_date, report=None):
+        """
+        Enviar email con reporte de cambios (versión mejorada)
+        
+        Args:
+            report: Modelo del reporte ya calculado (report_model.build_report);
+                    si no se indica se calcula a partir de changes
+        """
         try:
-            # Calcular totales
-            total_ext = (len(changes.get('extensions_added', [])) + 
-                        len(changes.get('extensions_removed', [])) + 
-                        len(changes.get('extensions_modified', [])))
-            
-            total_dids = (len(changes.get('dids_added', [])) + 
-                        len(changes.get('dids_removed', [])) + 
-                        len(changes.get('dids_modified', [])))
-            
-            total_colas = (len(changes.get('colas_added', [])) + 
-                        len(changes.get('colas_removed', [])) + 
-                        len(changes.get('colas_modified', [])))
-            
-            total_changes = total_ext + total_dids + total_colas
+            report = report or build_report(changes, report_date)
+            total_changes = report['totales']['total']
             
             # Asunto
             subject = f"🔍 Cambios en Neotel - {report_date.strftime('%d/%m/%Y')} ({total_changes} cambios)"
             
             # Cuerpo del email en texto plano (resumen)
-            body_text = self._create_text_summary(changes, report_date, total_changes)
+            body_text = render_text(report)
             
             # Construir mensaje MIME multipart (texto + attachment)
             msg = MIMEMultipart()
@@ -62,9 +59,13 @@ class EmailSender:
             try:
                 report_path = Path(report_file) if report_file else None
                 if report_path and report_path.exists():
-                    with open(report_path, 'rb') as f:
-                        part = MIMEBase('application', 'octet-stream')
-                        part.set_payload(f.read())
+                    part = MIMEBase('application', 'octet-stream')
+                    if report_path.suffix == '.html':
+                        # Adjunto autocontenido: el CSS/JS compartido no viaja con el email
+                        document = report_path.read_text(encoding='utf-8')
+                        part.set_payload(get_loader().inline_assets(document).encode('utf-8'))
+                    else:
+                        part.set_payload(report_path.read_bytes())
                     encoders.encode_base64(part)
                     part.add_header('Content-Disposition', f'attachment; filename="{report_path.name}"')
                     msg.attach(part)
@@ -216,52 +217,6 @@ class EmailSender:
             self.logger.error(f"❌ Error preparando notificación de error: {str(e)}")
             return False
     
-    def _create_text_summary(self, changes_summary, report_date, total_changes):
-        """Crear resumen en texto plano"""
-        lines = []
-        lines.append(f"REPORTE DE CAMBIOS - NEOTEL")
-        lines.append(f"Fecha: {report_date.strftime('%d/%m/%Y')}")
-        lines.append(f"Total de cambios: {total_changes}")
-        lines.append("=" * 60)
-        lines.append("")
-        
-        # DIDs
-        if any(k in changes_summary for k in ['dids_added', 'dids_removed', 'dids_modified']):
-            lines.append("📞 CAMBIOS EN DIDs:")
-            if changes_summary.get('dids_added'):
-                lines.append(f"  + Añadidos: {len(changes_summary['dids_added'])}")
-            if changes_summary.get('dids_removed'):
-                lines.append(f"  - Eliminados: {len(changes_summary['dids_removed'])}")
-            if changes_summary.get('dids_modified'):
-                lines.append(f"  ≠ Modificados: {len(changes_summary['dids_modified'])}")
-            lines.append("")
-        
-        # Extensiones
-        if any(k in changes_summary for k in ['extensions_added', 'extensions_removed', 'extensions_modified']):
-            lines.append("👤 CAMBIOS EN EXTENSIONES:")
-            if changes_summary.get('extensions_added'):
-                lines.append(f"  + Añadidas: {len(changes_summary['extensions_added'])}")
-            if changes_summary.get('extensions_removed'):
-                lines.append(f"  - Eliminadas: {len(changes_summary['extensions_removed'])}")
-            if changes_summary.get('extensions_modified'):
-                lines.append(f"  ≠ Modificadas: {len(changes_summary['extensions_modified'])}")
-            lines.append("")
-        
-        # Colas
-        if any(k in changes_summary for k in ['colas_added', 'colas_removed', 'colas_modified']):
-            lines.append("📋 CAMBIOS EN COLAS:")
-            if changes_summary.get('colas_added'):
-                lines.append(f"  + Añadidas: {len(changes_summary['colas_added'])}")
-            if changes_summary.get('colas_removed'):
-                lines.append(f"  - Eliminadas: {len(changes_summary['colas_removed'])}")
-            if changes_summary.get('colas_modified'):
-                lines.append(f"  ≠ Modificadas: {len(changes_summary['colas_modified'])}")
-            lines.append("")
-        
-        lines.append("Para ver el detalle completo, consulte el reporte HTML adjunto.")
-        
-        return "\n".join(lines)
-    
     def _send_email(self, msg):
         """
         Enviar email usando SMTP
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Consulta puntual de entidades Neotel (DID, cola o extensión)
+
+Extrae solo las entidades pedidas sobre una única sesión de navegador y las
+compara con el último snapshot guardado, sin lanzar la auditoría completa.
+
+Uso:
+    python entity_lookup.py did 912345678 [912345679 ...]
+    python entity_lookup.py cola "Ventas" [--json salida.json]
+    python entity_lookup.py extension 4717-5
+"""
+
+import argparse
+import sys
+
+import json_backend
+from config_audit import ConfigAudit
+from diff_engine import SCHEMAS_BY_NAME, diff_entity
+from snapshot_format import open_snapshot
+
+# Tipo de entidad -> (sección, método del extractor)
+ENTITY_TYPES = {
+    'did': ('dids', 'extract_did'),
+    'cola': ('colas', 'extract_cola'),
+    'extension': ('extensiones', 'extract_extension')
+}
+SECTION_KEY = {name: schema.key for name, schema in SCHEMAS_BY_NAME.items()}
+
+
+def latest_snapshot_entities(section):
+    """
+    Entidades de una sección en el último snapshot
+
+    Returns:
+        Tupla (fecha del snapshot, {clave: entidad}); (None, {}) si no hay
+    """
+    snapshots = ConfigAudit.list_snapshot_files()
+    if not snapshots:
+        return None, {}
+
+    snapshot_date, snapshot_file = snapshots[-1]
+    key = SECTION_KEY[section]
+    entities = open_snapshot(snapshot_file).config.get(section, [])
+    return snapshot_date, {entity[key]: entity for entity in entities}
+
+
+def compare_entity(section, key, current, stored):
+    """
+    Comparar una entidad extraída con su versión guardada
+
+    Returns:
+        Diccionario con 'clave', 'estado' ('nueva', 'eliminada',
+        'sin_cambios', 'modificada' o 'no_encontrada'), la entidad y, si
+        está modificada, 'campos' y 'colecciones'
+    """
+    if current is None and stored is None:
+        return {'clave': key, 'estado': 'no_encontrada', 'actual': None}
+    if stored is None:
+        return {'clave': key, 'estado': 'nueva', 'actual': current}
+    if current is None:
+        return {'clave': key, 'estado': 'eliminada', 'anterior': stored}
+
+    entry = diff_entity(SCHEMAS_BY_NAME[section], stored, current)
+    if entry is None:
+        return {'clave': key, 'estado': 'sin_cambios', 'actual': current}
+    return {'clave': key, 'estado': 'modificada', 'actual': current,
+            'campos': entry['campos'], 'colecciones': entry['colecciones']}
+
+
+def _print_result(result):
+    """Mostrar el resultado de una entidad"""
+    icons = {'nueva': '🆕', 'eliminada': '🗑️ ', 'sin_cambios': '✅', 'modificada': '⚠️ ', 'no_encontrada': '❓'}
+    print(f"{icons[result['estado']]} {result['clave']}: {result['estado'].replace('_', ' ')}")
+
+    for campo in result.get('campos', []):
+        print(f"    {campo['etiqueta']}: {campo['anterior']} → {campo['actual']}")
+
+    for collection, deltas in result.get('colecciones', {}).items():
+        for item in deltas['added']:
+            print(f"    + {collection}: {item.get('extension')} ({item.get('estado')})")
+        for item in deltas['removed']:
+            print(f"    - {collection}: {item.get('extension')} ({item.get('estado')})")
+        for entry in deltas['modified']:
+            for campo in entry['campos']:
+                print(f"    ≠ {collection} {entry['clave']}: {campo['etiqueta']} {campo['anterior']} → {campo['actual']}")
+
+
+def main():
+    """Función principal"""
+    parser = argparse.ArgumentParser(description="Consultar entidades Neotel y compararlas con el último snapshot")
+    parser.add_argument('tipo', choices=sorted(ENTITY_TYPES), help="Tipo de entidad")
+    parser.add_argument('claves', nargs='+', help="Número de DID, nombre de cola o código de extensión")
+    parser.add_argument('--json', help="Guardar el resultado en un archivo JSON")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("🔎 CONSULTA PUNTUAL - NEOTEL")
+    print("=" * 80)
+    print()
+
+    # Importación diferida: requiere selenium solo al consultar Neotel
+    from neotel_config_extractor_v2 import NeotelConfigExtractor
+
+    extractor = None
+    try:
+        section, method = ENTITY_TYPES[args.tipo]
+        snapshot_date, stored = latest_snapshot_entities(section)
+        if snapshot_date:
+            print(f"📂 Comparando con el snapshot de {snapshot_date}")
+        else:
+            print("⚠️  No hay snapshots guardados: solo se mostrará la extracción")
+        print()
+
+        extractor = NeotelConfigExtractor()
+        extract = getattr(extractor, method)
+
+        results = []
+        for key in args.claves:
+            result = compare_entity(section, key, extract(key), stored.get(key))
+            results.append(result)
+            _print_result(result)
+
+        if args.json:
+            with open(args.json, 'w', encoding='utf-8') as f:
+                f.write(json_backend.dumps_pretty({
+                    'snapshot': snapshot_date.isoformat() if snapshot_date else None,
+                    'resultados': results
+                }))
+            print(f"\n💾 Resultado guardado en {args.json}")
+
+    except Exception as e:
+        print(f"\n❌ Error: {str(e)}")
+        sys.exit(1)
+    finally:
+        if extractor:
+            extractor.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Nombre de usuario de los miembros de cola a partir del código de extensión
+
+Los miembros de una cola solo guardan el código de la extensión y no
+siempre coincide carácter a carácter con el de la pestaña de extensiones
+('4717-5' frente a '47175', espacios, mayúsculas...). Se prueba, en orden:
+
+    1. Código exacto
+    2. Código normalizado (sin guiones ni espacios, en mayúsculas)
+    3. Dígitos: la primera extensión cuyos dígitos contienen los del miembro
+
+Los índices se construyen una vez por snapshot, así cada búsqueda es una
+consulta a un diccionario en lugar de recorrer todas las extensiones.
+"""
+
+
+def normalize_code(code):
+    """'4717-5 a' -> '47175A'"""
+    return code.replace('-', '').replace(' ', '').upper()
+
+
+def code_digits(code):
+    """Solo los dígitos de un código"""
+    return ''.join(filter(str.isdigit, code))
+
+
+class ExtensionResolver:
+    """Índices de nombres de extensión de un snapshot"""
+
+    def __init__(self, extensiones):
+        # Código original -> nombre (si el código se repite, gana el último)
+        self.exact = {}
+        for ext in extensiones:
+            self.exact[ext.get('extension', '').strip()] = ext.get('nombre', '').strip()
+
+        self.normalized = {}
+        # Cada subcadena de dígitos -> nombre de la primera extensión que la
+        # contiene (los códigos son cortos: pocas decenas de subcadenas)
+        self.digits = {}
+        for code, name in self.exact.items():
+            normalized = normalize_code(code)
+            if normalized:
+                self.normalized[normalized] = name
+
+            digits = code_digits(code)
+            for start in range(len(digits)):
+                for end in range(start + 1, len(digits) + 1):
+                    self.digits.setdefault(digits[start:end], name)
+
+        self.cache = {}
+        self.unresolved = set()
+
+    def _lookup(self, code):
+        name = self.exact.get(code)
+        if name:
+            return name
+
+        name = self.normalized.get(normalize_code(code))
+        if name:
+            return name
+
+        digits = code_digits(code)
+        if digits:
+            return self.digits.get(digits)
+        return None
+
+    def resolve(self, code):
+        """
+        Nombre de usuario de un código de extensión
+
+        Returns:
+            Nombre, o None si no se encuentra (el código queda en unresolved)
+        """
+        code = code.strip()
+        if code in self.cache:
+            return self.cache[code]
+
+        name = self._lookup(code) or None
+        if name is None:
+            self.unresolved.add(code)
+        self.cache[code] = name
+        return name
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Dashboard de historial: todos los snapshots en una sola página
+
+Estructura en ConfigAudit.HISTORY_DIR:
+
+    historial.html         página sin datos (solo enlaza el índice)
+    indice.js              resumen diario: totales, pausadas, cambios, huella
+    datos/AAAA-MM-DD.js    datos de un día (mismas columnas que el modo datos
+                           del dashboard), cargados solo al seleccionar la fecha
+
+Cada actualización solo escribe los fragmentos de los snapshots nuevos o
+modificados y reescribe el índice; los días ya generados no se tocan. Los
+archivos son scripts (no JSON) para que la página funcione abierta desde
+disco, donde el navegador no permite fetch().
+
+Uso:
+    python history_dashboard.py [--reconstruir]
+"""
+
+import argparse
+import hashlib
+import logging
+import sys
+from datetime import datetime
+
+import json_backend
+from config_audit import ConfigAudit
+from diff_engine import count_changes
+from html_templates import Markup, get_loader
+from json_to_dashboard import DashboardGenerator
+from range_diff import load_delta
+from snapshot_format import open_snapshot
+
+HISTORY_PAGE = 'historial.html'
+INDEX_FILE = 'indice.js'
+CHUNKS_DIR = 'datos'
+
+# Envoltorios JS del índice y de los fragmentos
+INDEX_PREFIX = 'neotelHistoryIndex('
+CHUNK_PREFIX = 'neotelHistoryChunk('
+SCRIPT_SUFFIX = ');\n'
+
+
+def _script_json(value):
+    """JSON para incrustar en un script ('<' escapado)"""
+    return json_backend.dumps(value).decode('utf-8').replace('<', '\\u003c')
+
+
+def read_index(history_dir=None):
+    """
+    Entradas del índice actual
+
+    Returns:
+        {fecha ISO: entrada}; vacío si no existe o no se puede leer
+    """
+    index_file = (history_dir or ConfigAudit.HISTORY_DIR) / INDEX_FILE
+    if not index_file.exists():
+        return {}
+    content = index_file.read_text(encoding='utf-8')
+    if not content.startswith(INDEX_PREFIX):
+        return {}
+    try:
+        entries = json_backend.loads(content[len(INDEX_PREFIX):content.rindex(')')])
+    except ValueError:
+        return {}
+    return {entry['fecha']: entry for entry in entries}
+
+
+def summarize_day(snapshot_date, data):
+    """
+    Entrada del índice para un día
+
+    Args:
+        data: Datos en columnas (DashboardGenerator.dashboard_data)
+    """
+    delta = load_delta(snapshot_date)
+    return {
+        'fecha': snapshot_date.isoformat(),
+        'extensiones': len(data['extensiones']),
+        'dids': len(data['dids']),
+        'colas': len(data['colas']),
+        'miembros': sum(len(members) for _, members in data['colas']),
+        'pausadas': sum(1 for row in data['extensiones'] if row[5] == 'todas_pausadas'),
+        'cambios': count_changes(delta['cambios'])['total'] if delta else None
+    }
+
+
+class HistoryBuilder:
+    """Generador incremental del dashboard de historial"""
+
+    def __init__(self, history_dir=None, logger=None):
+        self.history_dir = history_dir or ConfigAudit.HISTORY_DIR
+        self.chunks_dir = self.history_dir / CHUNKS_DIR
+        self.logger = logger or logging.getLogger(__name__)
+        self.generator = DashboardGenerator()
+        self.stats = {'dias': 0, 'escritos': 0, 'eliminados': 0}
+
+    def _write_chunk(self, snapshot_date, snapshot_file):
+        """Escribir el fragmento de un día y devolver su entrada del índice"""
+        config_data = open_snapshot(snapshot_file).config
+        data = self.generator.dashboard_data(config_data)
+
+        content = f"{CHUNK_PREFIX}\"{snapshot_date.isoformat()}\",{_script_json(data)}{SCRIPT_SUFFIX}".encode('utf-8')
+        chunk_file = self.chunks_dir / f"{snapshot_date.isoformat()}.js"
+        tmp_file = chunk_file.with_name(chunk_file.name + '.tmp')
+        tmp_file.write_bytes(content)
+        tmp_file.replace(chunk_file)
+
+        entry = summarize_day(snapshot_date, data)
+        # Huella del fragmento: invalida la caché del navegador si se regenera
+        entry['huella'] = hashlib.blake2b(content, digest_size=4).hexdigest()
+        return entry
+
+    def _write_page(self):
+        """Escribir la página (el índice se enlaza con su versión para no servirlo de caché)"""
+        loader = get_loader()
+        page_file = self.history_dir / HISTORY_PAGE
+        self_contained = ConfigAudit.REPORT_SELF_CONTAINED
+        styles = [loader.asset_tag(name, page_file, self_contained)
+                  for name in ('dashboard.css', 'dashboard_data.css', 'history.css')]
+        scripts = [loader.asset_tag(name, page_file, self_contained)
+                   for name in ('dashboard_data.js', 'history.js')]
+
+        page = loader.get('history.html').render(
+            estilos=Markup('\n    '.join(styles)),
+            pestanas=loader.get('dashboard_tabs.html').render(),
+            scripts=Markup('\n    '.join(scripts)),
+            indice=f"{INDEX_FILE}?v={datetime.now().strftime('%Y%m%d%H%M%S')}"
+        )
+        page_file.write_text(page, encoding='utf-8')
+        return page_file
+
+    def update(self, rebuild=False):
+        """
+        Actualizar el historial con los snapshots disponibles
+
+        Args:
+            rebuild: Regenerar todos los fragmentos aunque estén al día
+
+        Returns:
+            Ruta de la página del historial
+        """
+        self.chunks_dir.mkdir(parents=True, exist_ok=True)
+        previous = {} if rebuild else read_index(self.history_dir)
+
+        entries = []
+        written = 0
+        for snapshot_date, snapshot_file in ConfigAudit.list_snapshot_files():
+            chunk_file = self.chunks_dir / f"{snapshot_date.isoformat()}.js"
+            entry = previous.get(snapshot_date.isoformat())
+
+            # Al día: fragmento posterior al snapshot y ya en el índice
+            if (entry is None or not chunk_file.exists()
+                    or chunk_file.stat().st_mtime < snapshot_file.stat().st_mtime):
+                entry = self._write_chunk(snapshot_date, snapshot_file)
+                written += 1
+            entries.append(entry)
+
+        # Fragmentos de snapshots que ya no existen (compactados)
+        kept = {f"{entry['fecha']}.js" for entry in entries}
+        removed = 0
+        for chunk_file in self.chunks_dir.glob('*.js'):
+            if chunk_file.name not in kept:
+                chunk_file.unlink()
+                removed += 1
+
+        index_file = self.history_dir / INDEX_FILE
+        tmp_file = index_file.with_name(index_file.name + '.tmp')
+        tmp_file.write_text(f"{INDEX_PREFIX}{_script_json(entries)}{SCRIPT_SUFFIX}", encoding='utf-8')
+        tmp_file.replace(index_file)
+
+        page_file = self._write_page()
+        self.stats = {'dias': len(entries), 'escritos': written, 'eliminados': removed}
+        self.logger.info(f"📈 Historial: {len(entries)} días ({written} nuevos o actualizados, {removed} eliminados)")
+        return page_file
+
+
+def main():
+    """Función principal"""
+    parser = argparse.ArgumentParser(description="Generar el dashboard de historial de snapshots Neotel")
+    parser.add_argument('--reconstruir', action='store_true', help="Regenerar todos los días")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("📈 DASHBOARD DE HISTORIAL - NEOTEL")
+    print("=" * 80)
+    print()
+
+    try:
+        builder = HistoryBuilder()
+        page_file = builder.update(rebuild=args.reconstruir)
+        print(f"📅 {builder.stats['dias']} días: {builder.stats['escritos']} nuevos o actualizados, "
+              f"{builder.stats['eliminados']} eliminados")
+        print(f"\n✅ Historial generado: {page_file}")
+        print("\n💡 Abre el archivo en tu navegador; se actualiza solo con cada auditoría")
+
+    except Exception as e:
+        print(f"\n❌ Error: {str(e)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Plantillas HTML precompiladas con escape automático
+
+Las plantillas (carpeta templates/) usan la sintaxis de str.format:
+{campo}, {item[clave]}, {valor:.0%}. Cada valor se escapa para HTML salvo
+que ya sea Markup o se marque con la conversión !m ({contenido!m}), que
+inserta HTML ya generado por otra plantilla.
+
+Cada plantilla se compila una sola vez a una función Python; el código
+compilado se guarda en disco (ConfigAudit.TEMPLATE_CACHE_DIR) con la huella
+del texto de la plantilla, de modo que otros procesos (p.ej. los que
+renderizan secciones en paralelo) la cargan sin volver a compilarla.
+
+Los recursos estáticos (CSS/JS) se publican una vez en ConfigAudit.ASSETS_DIR
+con su huella en el nombre (report.3f9a1c2e.css) y los HTML generados los
+enlazan; en modo autocontenido (adjuntos de email) se incrustan.
+"""
+
+import hashlib
+import html
+import marshal
+import os
+import re
+import sys
+from string import Formatter
+
+from config_audit import ConfigAudit
+
+TEMPLATES_DIR = ConfigAudit.BASE_DIR / "templates"
+
+# Etiquetas de recursos publicados (data-asset = nombre en templates/)
+_ASSET_TAG = re.compile(r'<link rel="stylesheet" href="[^"]*" data-asset="([^"]+)">'
+                        r'|<script src="[^"]*" data-asset="([^"]+)"></script>')
+
+# Nombre de campo de str.format: nombre seguido de .atributo o [clave]
+_FIELD_FIRST = re.compile(r'[^.[]+')
+_FIELD_PART = re.compile(r'\.([A-Za-z_]\w*)|\[([^\]]+)\]')
+
+
+class Markup(str):
+    """Texto HTML seguro (no se vuelve a escapar)"""
+
+    __slots__ = ()
+
+
+def escape(value):
+    """Escapar un valor para HTML (Markup se devuelve tal cual)"""
+    if isinstance(value, Markup):
+        return value
+    return html.escape('' if value is None else str(value))
+
+
+def _split_field_name(field_name):
+    """
+    Separar un nombre de campo como str.format: 'a[b].c' -> ('a', [(False, 'b'), (True, 'c')])
+
+    Las claves formadas solo por dígitos son índices enteros ({lista[0]}).
+    """
+    match = _FIELD_FIRST.match(field_name)
+    if match is None:
+        raise ValueError(f"Campo sin nombre en la plantilla: {{{field_name}}}")
+    first = match.group()
+
+    rest = []
+    position = match.end()
+    while position < len(field_name):
+        match = _FIELD_PART.match(field_name, position)
+        if match is None:
+            raise ValueError(f"Campo no válido en la plantilla: {{{field_name}}}")
+        attribute, key = match.groups()
+        if attribute is not None:
+            rest.append((True, attribute))
+        else:
+            rest.append((False, int(key) if key.isdigit() else key))
+        position = match.end()
+    return first, rest
+
+
+def _field_expression(field_name):
+    """Expresión Python que lee un campo del contexto ('a[b].c' -> ctx['a']['b'].c)"""
+    first, rest = _split_field_name(field_name)
+    expression = f"ctx[{first!r}]"
+    for is_attribute, key in rest:
+        expression += f".{key}" if is_attribute else f"[{key!r}]"
+    return expression
+
+
+def _compile_source(source, name):
+    """Traducir una plantilla a una función render(ctx) y compilarla"""
+    parts = []
+    for literal, field_name, format_spec, conversion in Formatter().parse(source):
+        if literal:
+            parts.append(repr(literal))
+        if field_name is None:
+            continue
+
+        value = _field_expression(field_name)
+        if format_spec:
+            value = f"format({value}, {format_spec!r})"
+        if conversion == 'm':
+            parts.append(f"str({value})")
+        elif conversion in (None, 's'):
+            parts.append(f"_escape({value})")
+        else:
+            raise ValueError(f"Conversión !{conversion} no soportada en la plantilla {name}")
+
+    body = ', '.join(parts) if parts else "''"
+    code = f"def render(ctx, _escape=_escape):\n    return Markup(''.join([{body}]))\n"
+    return compile(code, f"<plantilla {name}>", 'exec')
+
+
+class Template:
+    """Plantilla compilada"""
+
+    def __init__(self, name, code):
+        namespace = {'Markup': Markup, '_escape': escape}
+        exec(code, namespace)
+        self.name = name
+        self._render = namespace['render']
+
+    def render(self, **context):
+        """Renderizar con los valores dados (devuelve Markup)"""
+        return self._render(context)
+
+    def render_each(self, items):
+        """Renderizar la plantilla una vez por contexto y concatenar"""
+        render = self._render
+        return Markup(''.join([render(context) for context in items]))
+
+
+class TemplateLoader:
+    """Cargador con caché en memoria y en disco"""
+
+    def __init__(self, directory=None, cache_dir=None):
+        self.directory = directory or TEMPLATES_DIR
+        self.cache_dir = cache_dir or ConfigAudit.TEMPLATE_CACHE_DIR
+        self._templates = {}
+        self._static = {}
+        self._published = {}
+
+    def _cache_file(self, name, source):
+        digest = hashlib.blake2b(source.encode('utf-8'), digest_size=12).hexdigest()
+        tag = f"py{sys.version_info[0]}{sys.version_info[1]}"
+        return self.cache_dir / f"{name.replace('/', '_')}.{digest}.{tag}.bin"
+
+    def get(self, name):
+        """Plantilla compilada (se compila como mucho una vez por versión)"""
+        template = self._templates.get(name)
+        if template is not None:
+            return template
+
+        source = (self.directory / name).read_text(encoding='utf-8')
+        cache_file = self._cache_file(name, source)
+        code = None
+        if cache_file.exists():
+            try:
+                code = marshal.loads(cache_file.read_bytes())
+            except (EOFError, ValueError, TypeError):
+                code = None
+
+        if code is None:
+            code = _compile_source(source, name)
+            try:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                tmp_file = cache_file.with_name(cache_file.name + '.tmp')
+                tmp_file.write_bytes(marshal.dumps(code))
+                tmp_file.replace(cache_file)
+            except OSError:
+                # Sin caché en disco se sigue pudiendo renderizar
+                pass
+
+        template = Template(name, code)
+        self._templates[name] = template
+        return template
+
+    def static(self, name):
+        """Contenido literal de un recurso (CSS/JS), sin interpretar"""
+        content = self._static.get(name)
+        if content is None:
+            content = Markup((self.directory / name).read_text(encoding='utf-8'))
+            self._static[name] = content
+        return content
+
+    def fingerprint(self, names):
+        """Huella del texto de varias plantillas/recursos (versión de un generador)"""
+        digest = hashlib.blake2b(digest_size=8)
+        for name in names:
+            digest.update(name.encode('utf-8'))
+            digest.update((self.directory / name).read_bytes())
+        return digest.hexdigest()
+
+    def publish(self, name):
+        """
+        Publicar un recurso en ASSETS_DIR con su huella en el nombre
+
+        Solo se escribe la primera vez (el nombre cambia si cambia el
+        contenido, así el navegador puede cachearlo indefinidamente).
+
+        Returns:
+            Ruta del recurso publicado
+        """
+        path = self._published.get(name)
+        if path is not None:
+            return path
+
+        content = self.static(name).encode('utf-8')
+        digest = hashlib.blake2b(content, digest_size=4).hexdigest()
+        stem, _, extension = name.rpartition('.')
+        path = ConfigAudit.ASSETS_DIR / f"{stem}.{digest}.{extension}"
+        if not path.exists():
+            ConfigAudit.ASSETS_DIR.mkdir(parents=True, exist_ok=True)
+            tmp_file = path.with_name(path.name + '.tmp')
+            tmp_file.write_bytes(content)
+            tmp_file.replace(path)
+
+        self._published[name] = path
+        return path
+
+    def asset_tag(self, name, output_file, self_contained=False):
+        """
+        Etiqueta HTML de un recurso CSS/JS para un archivo de salida
+
+        Args:
+            output_file: HTML que lo usará (el enlace es relativo a él)
+            self_contained: Incrustar el contenido en lugar de enlazarlo
+        """
+        is_style = name.endswith('.css')
+        if self_contained:
+            content = self.static(name)
+            return Markup(f"<style>\n{content}</style>" if is_style else f"<script>\n{content}</script>")
+
+        path = self.publish(name)
+        try:
+            href = os.path.relpath(path, os.path.dirname(os.path.abspath(output_file))).replace(os.sep, '/')
+        except ValueError:
+            # Otra unidad (Windows): enlace absoluto
+            href = path.resolve().as_uri()
+        href = html.escape(href)
+        if is_style:
+            return Markup(f'<link rel="stylesheet" href="{href}" data-asset="{name}">')
+        return Markup(f'<script src="{href}" data-asset="{name}"></script>')
+
+    def inline_assets(self, document):
+        """Versión autocontenida de un HTML generado con recursos enlazados"""
+        return _ASSET_TAG.sub(
+            lambda match: self.asset_tag(match.group(1) or match.group(2), None, self_contained=True),
+            document
+        )
+
+
+_LOADER = None
+
+
+def get_loader():
+    """Cargador compartido del proceso"""
+    global _LOADER
+    if _LOADER is None:
+        _LOADER = TemplateLoader()
+    return _LOADER
+
+
+def get_template(name):
+    """Atajo: plantilla compilada del cargador compartido"""
+    return get_loader().get(name)
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Capa de serialización JSON con backend intercambiable
+
+Usa orjson o msgspec si están instalados y recurre a la librería estándar
+en caso contrario. La salida en disco es canónica: claves ordenadas, listas
+ordenadas por su clave natural y sin indentación, de modo que dos
+configuraciones idénticas producen exactamente los mismos bytes.
+"""
+
+import json
+import re
+
+from config_audit import ConfigAudit
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+# Clave natural de cada sección y de sus colecciones anidadas
+SECTION_KEYS = {
+    'extensiones': 'extension',
+    'dids': 'numero',
+    'colas': 'nombre'
+}
+NESTED_KEYS = {
+    'colas': {'miembros': 'extension'}
+}
+
+_DIGITS = re.compile(r'(\d+)')
+
+
+def _select_backend(preferred):
+    """Elegir backend según preferencia y disponibilidad"""
+    available = {
+        'orjson': orjson is not None,
+        'msgspec': msgspec is not None,
+        'json': True
+    }
+    if preferred != 'auto':
+        if not available.get(preferred):
+            raise ValueError(f"Backend JSON no disponible: {preferred}")
+        return preferred
+    for name in ('orjson', 'msgspec', 'json'):
+        if available[name]:
+            return name
+
+
+BACKEND = _select_backend(ConfigAudit.JSON_BACKEND)
+
+if BACKEND == 'msgspec':
+    _msgspec_encoder = msgspec.json.Encoder(order='sorted')
+    _msgspec_decoder = msgspec.json.Decoder()
+
+
+def dumps(obj):
+    """Serializar a bytes en forma canónica compacta (claves ordenadas)"""
+    if BACKEND == 'orjson':
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+    if BACKEND == 'msgspec':
+        return _msgspec_encoder.encode(obj)
+    return json.dumps(obj, ensure_ascii=False, sort_keys=True,
+                      separators=(',', ':')).encode('utf-8')
+
+
+def loads(data):
+    """Deserializar desde bytes o str"""
+    if BACKEND == 'orjson':
+        return orjson.loads(data)
+    if BACKEND == 'msgspec':
+        return _msgspec_decoder.decode(data)
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        data = bytes(data).decode('utf-8')
+    return json.loads(data)
+
+
+def dumps_pretty(obj):
+    """Serializar en forma legible (indentada) para exportación"""
+    return json.dumps(obj, ensure_ascii=False, sort_keys=True, indent=2)
+
+
+def natural_key(value):
+    """Clave de ordenación natural: '4717-9' va antes que '4717-10'"""
+    return [int(part) if part.isdecimal() else part.lower()
+            for part in _DIGITS.split(str(value or ''))]
+
+
+def canonicalize_config(config_data):
+    """
+    Ordenar las listas de una configuración por su clave natural
+
+    Args:
+        config_data: Diccionario sección -> lista de entidades
+
+    Returns:
+        Nuevo diccionario con secciones y colecciones anidadas ordenadas
+    """
+    canonical = {}
+    for section, entities in config_data.items():
+        key = SECTION_KEYS.get(section)
+        if key is None or not isinstance(entities, list):
+            canonical[section] = entities
+            continue
+
+        nested = NESTED_KEYS.get(section, {})
+        if nested:
+            entities = [_canonicalize_nested(entity, nested) for entity in entities]
+
+        canonical[section] = sorted(entities, key=lambda e: natural_key(e.get(key)))
+    return canonical
+
+
+def _canonicalize_nested(entity, nested):
+    """Ordenar las colecciones anidadas de una entidad"""
+    entity = dict(entity)
+    for field, key in nested.items():
+        items = entity.get(field)
+        if isinstance(items, list):
+            entity[field] = sorted(items, key=lambda m: natural_key(m.get(key)))
+    return entity
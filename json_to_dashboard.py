@@ -2,15 +2,87 @@
 """
 Generador de Dashboard HTML Interactivo
 Crea un dashboard profesional y visual desde snapshots JSON
+
+Dos modos:
+- html: cada fila y cada miembro como HTML literal (snapshots pequeños)
+- datos: el snapshot se incrusta una vez como JSON compacto y el navegador
+  pinta solo las filas visibles (listas virtualizadas) y filtra contra un
+  índice de búsqueda en minúsculas; tamaño, apertura y búsqueda no crecen
+  con el número de filas pintadas
+
+El CSS/JS se enlaza desde change_reports/assets/ (compartido por todos los
+reportes); --autocontenido lo incrusta en el propio HTML.
+
+Uso:
+    python json_to_dashboard.py [YYYY-MM-DD] [--modo html|datos] [--autocontenido]
 """
 
-import json
+import argparse
 import sys
 from datetime import datetime
 from pathlib import Path
 
 # Importar configuración
 from config_audit import ConfigAudit
+from snapshot_format import open_snapshot
+from normalization import member_info
+import json_backend
+from artifact_cache import ArtifactCache, artifact_key, snapshot_fingerprint
+from extension_resolver import ExtensionResolver
+from html_templates import Markup, get_loader, get_template
+
+# Badge de la tabla de extensiones según el estado de colas
+ESTADO_BADGES = {
+    'todas_activas': ('success', '✓ Activas'),
+    'todas_pausadas': ('danger', '⏸ Pausadas'),
+    'mixto': ('warning', '⚡ Mixto'),
+    'sin_colas': ('info', '○ Sin Colas')
+}
+EMPTY_COLAS = Markup('<div class="empty-state"><div class="icon">📭</div><div>No hay colas configuradas</div></div>\n')
+EMPTY_MEMBERS = Markup('<div class="empty-state">Sin miembros</div>\n')
+
+# Modos del dashboard
+MODE_HTML = 'html'
+MODE_DATA = 'datos'
+
+# Versión del generador (subir al cambiar la salida sin cambiar plantillas)
+# y plantillas de cada modo: ambas forman parte de la clave de la caché
+DASHBOARD_GENERATOR_VERSION = 2
+DASHBOARD_TEMPLATES = {
+    MODE_HTML: ['dashboard_head.html', 'dashboard_extension_row.html', 'dashboard_empty_row.html',
+                'dashboard_dids.html', 'dashboard_did_row.html', 'dashboard_colas.html',
+                'dashboard_cola_start.html', 'dashboard_member.html', 'dashboard_cola_end.html',
+                'dashboard_end.html', 'dashboard.css', 'dashboard.js'],
+    MODE_DATA: ['dashboard_data.html', 'dashboard_tabs.html', 'dashboard.css',
+                'dashboard_data.css', 'dashboard_data.js']
+}
+
+def dashboard_options(snapshot, mode=None, self_contained=None):
+    """
+    Modo y autocontenido efectivos de un snapshot
+    
+    Returns:
+        Tupla (modo, autocontenido) con los defaults de ConfigAudit aplicados
+    """
+    if self_contained is None:
+        self_contained = ConfigAudit.REPORT_SELF_CONTAINED
+    if mode is None:
+        rows = sum(snapshot.count(section) for section in ('extensiones', 'dids', 'colas'))
+        mode = MODE_DATA if rows >= ConfigAudit.DASHBOARD_DATA_MIN_ROWS else MODE_HTML
+    return mode, self_contained
+
+
+def dashboard_artifact(snapshot, mode, self_contained):
+    """
+    Clave en la caché de artefactos y nombre de archivo del dashboard de un snapshot
+    
+    Mismo snapshot, misma versión y mismas opciones -> misma clave.
+    """
+    version = [DASHBOARD_GENERATOR_VERSION, get_loader().fingerprint(DASHBOARD_TEMPLATES[mode])]
+    key = artifact_key('dashboard', snapshot_fingerprint(snapshot), version,
+                       mode=mode, self_contained=self_contained)
+    return key, f"dashboard_neotel_{snapshot.date or 'snapshot'}_{key[:12]}.html"
+
 
 class DashboardGenerator:
     """Generador de dashboard HTML profesional"""
@@ -19,38 +91,51 @@ class DashboardGenerator:
         """Inicializar generador"""
         pass
     
-    def generate_html_dashboard(self, json_file, output_file=None):
-        """Generar dashboard HTML completo"""
+    def generate_html_dashboard(self, json_file, output_file=None, mode=None, self_contained=None):
+        """
+        Generar dashboard HTML completo
+        
+        Args:
+            mode: 'html' o 'datos' (default: 'datos' a partir de
+                  ConfigAudit.DASHBOARD_DATA_MIN_ROWS filas)
+            self_contained: Incrustar CSS/JS en lugar de enlazar
+                            change_reports/assets/ (default: ConfigAudit.REPORT_SELF_CONTAINED)
+        
+        Sin output_file se usa la caché de artefactos: si ya existe el
+        dashboard de este snapshot con la misma versión y opciones, se
+        devuelve sin regenerarlo.
+        """
         try:
-            print(f"📖 Leyendo archivo JSON: {json_file}")
-            
-            # Leer JSON
-            with open(json_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            # Extraer configuración
-            if 'config' in data:
-                config_data = data['config']
-                timestamp = data.get('timestamp', datetime.now().isoformat())
+            print(f"📖 Leyendo snapshot: {json_file}")
+            
+            # Abrir snapshot: las secciones se decodifican al acceder a ellas
+            snapshot = open_snapshot(json_file)
+            config_data = snapshot.config
+            timestamp = snapshot.timestamp or datetime.now().isoformat()
+            
+            mode, self_contained = dashboard_options(snapshot, mode, self_contained)
+            
+            def build(path):
+                print("🎨 Generando dashboard HTML...")
+                # Escribir el HTML por fragmentos (sin montar el documento en memoria)
+                with open(path, 'w', encoding='utf-8') as f:
+                    if mode == MODE_DATA:
+                        self._write_data_html(f, config_data, timestamp, self_contained)
+                    else:
+                        self._write_complete_html(f, config_data, timestamp, self_contained)
+            
+            if output_file is not None:
+                build(output_file)
+                print(f"✅ Dashboard generado exitosamente: {output_file}")
+                return output_file
+            
+            key, filename = dashboard_artifact(snapshot, mode, self_contained)
+            output_file, cached = ArtifactCache().build('dashboard', key, filename, build)
+            
+            if cached:
+                print(f"♻️  Dashboard al día (caché): {output_file}")
             else:
-                config_data = data
-                timestamp = datetime.now().isoformat()
-            
-            print("🎨 Generando dashboard HTML...")
-            
-            # Generar HTML completo
-            html = self._generate_complete_html(config_data, timestamp)
-            
-            # Generar nombre de archivo si no se proporciona
-            if output_file is None:
-                timestamp_str = datetime.now().strftime('%Y%m%d_%H%M%S')
-                output_file = ConfigAudit.REPORTS_DIR / f"dashboard_neotel_{timestamp_str}.html"
-            
-            # Guardar
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(html)
-            
-            print(f"✅ Dashboard generado exitosamente: {output_file}")
+                print(f"✅ Dashboard generado exitosamente: {output_file}")
             
             return output_file
             
@@ -58,849 +143,196 @@ class DashboardGenerator:
             print(f"❌ Error generando dashboard: {str(e)}")
             raise
     
-    def _generate_complete_html(self, config_data, timestamp):
-        """Generar HTML completo con estilos y JavaScript"""
+    def _write_complete_html(self, f, config_data, timestamp, self_contained=False):
+        """Escribir el HTML completo (cabecera, cada pestaña y pie) en un archivo abierto"""
         
         extensiones = config_data.get('extensiones', [])
         dids = config_data.get('dids', [])
         colas = config_data.get('colas', [])
         
-        # Calcular estadísticas
-        stats = self._calculate_stats(config_data)
-        
-        html = f"""<!DOCTYPE html>
-<html lang="es">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Dashboard Configuración Neotel</title>
-    <style>
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-        
-        :root {{
-            /* Paleta corporativa minimalista */
-            --primary: #2c3e50;
-            --primary-light: #34495e;
-            --accent: #3498db;
-            --success: #27ae60;
-            --warning: #f39c12;
-            --danger: #e74c3c;
-            --info: #3498db;
-            
-            /* Neutros */
-            --background: #f8f9fa;
-            --surface: #ffffff;
-            --border: #dee2e6;
-            --text-primary: #2c3e50;
-            --text-secondary: #7f8c8d;
-            --text-light: #95a5a6;
-            
-            /* Sombras sutiles */
-            --shadow-sm: 0 1px 3px rgba(0, 0, 0, 0.08);
-            --shadow-md: 0 4px 6px rgba(0, 0, 0, 0.1);
-            --shadow-lg: 0 10px 25px rgba(0, 0, 0, 0.12);
-        }}
-        
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, Cantarell, sans-serif;
-            background: var(--background);
-            min-height: 100vh;
-            padding: 20px;
-            color: var(--text-primary);
-        }}
-        
-        .container {{
-            max-width: 1400px;
-            margin: 0 auto;
-            background: var(--surface);
-            border-radius: 8px;
-            box-shadow: var(--shadow-lg);
-            overflow: hidden;
-        }}
-        
-        /* Header - Minimalista */
-        .header {{
-            background: var(--primary);
-            color: white;
-            padding: 30px 40px;
-            border-bottom: 3px solid var(--accent);
-        }}
-        
-        .header h1 {{
-            font-size: 28px;
-            font-weight: 600;
-            margin-bottom: 8px;
-            display: flex;
-            align-items: center;
-            gap: 12px;
-        }}
-        
-        .header .timestamp {{
-            font-size: 13px;
-            opacity: 0.85;
-            display: flex;
-            align-items: center;
-            gap: 8px;
-            font-weight: 400;
-        }}
-        
-        /* Stats Cards - Limpias y profesionales */
-        .stats-grid {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(280px, 1fr));
-            gap: 24px;
-            padding: 30px 40px;
-            background: var(--background);
-        }}
-        
-        .stat-card {{
-            background: var(--surface);
-            padding: 24px;
-            border-radius: 6px;
-            box-shadow: var(--shadow-sm);
-            transition: all 0.2s ease;
-            border-left: 3px solid var(--primary);
-        }}
-        
-        .stat-card:hover {{
-            box-shadow: var(--shadow-md);
-            transform: translateY(-2px);
-        }}
-        
-        .stat-card.success {{
-            border-left-color: var(--success);
-        }}
-        
-        .stat-card.warning {{
-            border-left-color: var(--warning);
-        }}
-        
-        .stat-card.info {{
-            border-left-color: var(--info);
-        }}
-        
-        .stat-card .icon {{
-            font-size: 32px;
-            margin-bottom: 12px;
-            opacity: 0.9;
-        }}
-        
-        .stat-card .label {{
-            font-size: 12px;
-            color: var(--text-secondary);
-            text-transform: uppercase;
-            letter-spacing: 0.5px;
-            margin-bottom: 8px;
-            font-weight: 600;
-        }}
-        
-        .stat-card .value {{
-            font-size: 32px;
-            font-weight: 600;
-            color: var(--text-primary);
-            margin-bottom: 8px;
-        }}
-        
-        .stat-card .breakdown {{
-            font-size: 13px;
-            color: var(--text-light);
-            line-height: 1.4;
-        }}
-        
-        /* Navigation Tabs - Minimalista */
-        .tabs {{
-            display: flex;
-            background: var(--surface);
-            border-bottom: 1px solid var(--border);
-            padding: 0 40px;
-            gap: 8px;
-            overflow-x: auto;
-        }}
-        
-        .tab {{
-            padding: 14px 20px;
-            background: transparent;
-            border: none;
-            color: var(--text-secondary);
-            cursor: pointer;
-            font-size: 14px;
-            font-weight: 500;
-            transition: all 0.2s ease;
-            border-bottom: 2px solid transparent;
-            white-space: nowrap;
-        }}
-        
-        .tab:hover {{
-            color: var(--primary);
-            background: rgba(52, 73, 94, 0.04);
-        }}
-        
-        .tab.active {{
-            color: var(--primary);
-            border-bottom-color: var(--accent);
-        }}
-        
-        /* Content */
-        .content {{
-            padding: 40px;
-        }}
-        
-        .tab-content {{
-            display: none;
-        }}
-        
-        .tab-content.active {{
-            display: block;
-            animation: fadeIn 0.2s ease;
-        }}
-        
-        @keyframes fadeIn {{
-            from {{ opacity: 0; transform: translateY(4px); }}
-            to {{ opacity: 1; transform: translateY(0); }}
-        }}
-        
-        /* Search Bar - Limpia */
-        .search-bar {{
-            margin-bottom: 24px;
-            position: relative;
-        }}
-        
-        .search-bar input {{
-            width: 100%;
-            padding: 12px 40px 12px 16px;
-            border: 1px solid var(--border);
-            border-radius: 6px;
-            font-size: 14px;
-            transition: all 0.2s ease;
-            background: var(--surface);
-            color: var(--text-primary);
-        }}
-        
-        .search-bar input:focus {{
-            outline: none;
-            border-color: var(--accent);
-            box-shadow: 0 0 0 3px rgba(52, 152, 219, 0.1);
-        }}
-        
-        .search-bar input::placeholder {{
-            color: var(--text-light);
-        }}
-        
-        .search-bar::after {{
-            content: "🔍";
-            position: absolute;
-            right: 14px;
-            top: 50%;
-            transform: translateY(-50%);
-            font-size: 16px;
-            opacity: 0.5;
-        }}
-        
-        /* Tables - Minimalistas */
-        .table-container {{
-            overflow-x: auto;
-            border-radius: 6px;
-            border: 1px solid var(--border);
-        }}
-        
-        table {{
-            width: 100%;
-            border-collapse: collapse;
-            background: var(--surface);
-        }}
-        
-        thead {{
-            background: var(--primary);
-            color: white;
-        }}
-        
-        th {{
-            padding: 14px 16px;
-            text-align: left;
-            font-weight: 600;
-            text-transform: uppercase;
-            font-size: 11px;
-            letter-spacing: 0.5px;
-        }}
-        
-        tbody tr {{
-            border-bottom: 1px solid var(--border);
-            transition: background 0.15s ease;
-        }}
-        
-        tbody tr:last-child {{
-            border-bottom: none;
-        }}
-        
-        tbody tr:hover {{
-            background: rgba(52, 73, 94, 0.02);
-        }}
-        
-        td {{
-            padding: 14px 16px;
-            font-size: 14px;
-            color: var(--text-primary);
-        }}
-        
-        td strong {{
-            font-weight: 600;
-            color: var(--primary);
-        }}
-        
-        /* Badges - Minimalistas */
-        .badge {{
-            display: inline-block;
-            padding: 4px 10px;
-            border-radius: 4px;
-            font-size: 11px;
-            font-weight: 600;
-            text-transform: uppercase;
-            letter-spacing: 0.3px;
-        }}
-        
-        .badge.success {{
-            background: #d4edda;
-            color: #155724;
-        }}
-        
-        .badge.danger {{
-            background: #f8d7da;
-            color: #721c24;
-        }}
-        
-        .badge.warning {{
-            background: #fff3cd;
-            color: #856404;
-        }}
-        
-        .badge.info {{
-            background: #d1ecf1;
-            color: #0c5460;
-        }}
-        
-        /* Accordion (Colas) - Minimalista */
-        .accordion {{
-            margin-bottom: 12px;
-        }}
-        
-        .accordion-header {{
-            background: var(--surface);
-            padding: 18px 20px;
-            cursor: pointer;
-            border-radius: 6px;
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            transition: all 0.2s ease;
-            border: 1px solid var(--border);
-        }}
-        
-        .accordion-header:hover {{
-            background: rgba(52, 73, 94, 0.02);
-            border-color: var(--primary);
-        }}
-        
-        .accordion-header.active {{
-            background: var(--primary);
-            color: white;
-            border-color: var(--primary);
-            border-radius: 6px 6px 0 0;
-        }}
-        
-        .accordion-title {{
-            font-size: 15px;
-            font-weight: 600;
-            display: flex;
-            align-items: center;
-            gap: 10px;
-        }}
-        
-        .accordion-stats {{
-            display: flex;
-            gap: 12px;
-            font-size: 13px;
-        }}
-        
-        .accordion-icon {{
-            transition: transform 0.2s ease;
-            font-size: 20px;
-            opacity: 0.7;
-        }}
-        
-        .accordion-header.active .accordion-icon {{
-            transform: rotate(180deg);
-        }}
-        
-        .accordion-content {{
-            display: none;
-            padding: 20px;
-            background: var(--surface);
-            border: 1px solid var(--border);
-            border-top: none;
-            border-radius: 0 0 6px 6px;
-        }}
-        
-        .accordion-content.active {{
-            display: block;
-            animation: slideDown 0.2s ease;
-        }}
-        
-        @keyframes slideDown {{
-            from {{ opacity: 0; max-height: 0; }}
-            to {{ opacity: 1; max-height: 1000px; }}
-        }}
-        
-        .members-grid {{
-            display: grid;
-            grid-template-columns: repeat(auto-fill, minmax(280px, 1fr));
-            gap: 12px;
-            margin-top: 12px;
-        }}
-        
-        .member-card {{
-            background: var(--background);
-            padding: 14px 16px;
-            border-radius: 6px;
-            border-left: 3px solid var(--success);
-            transition: all 0.15s ease;
-        }}
-        
-        .member-card:hover {{
-            box-shadow: var(--shadow-sm);
-            transform: translateX(3px);
-        }}
-        
-        .member-card.paused {{
-            border-left-color: var(--danger);
-        }}
-        
-        .member-name {{
-            font-size: 14px;
-            font-weight: 600;
-            color: var(--text-primary);
-            margin-bottom: 6px;
-            display: flex;
-            align-items: center;
-            gap: 8px;
-        }}
-        
-        .member-details {{
-            font-size: 12px;
-            color: var(--text-secondary);
-            line-height: 1.4;
-        }}
-        
-        /* Empty State */
-        .empty-state {{
-            text-align: center;
-            padding: 60px 20px;
-            color: var(--text-light);
-        }}
-        
-        .empty-state .icon {{
-            font-size: 64px;
-            margin-bottom: 16px;
-            opacity: 0.2;
-        }}
-        
-        /* Responsive */
-        @media (max-width: 768px) {{
-            body {{
-                padding: 10px;
-            }}
-            
-            .header {{
-                padding: 20px;
-            }}
-            
-            .header h1 {{
-                font-size: 22px;
-            }}
-            
-            .stats-grid {{
-                grid-template-columns: 1fr;
-                padding: 20px;
-                gap: 16px;
-            }}
-            
-            .content {{
-                padding: 20px;
-            }}
-            
-            .tabs {{
-                padding: 0 20px;
-            }}
-            
-            table {{
-                font-size: 13px;
-            }}
-            
-            th, td {{
-                padding: 10px 12px;
-            }}
-            
-            .members-grid {{
-                grid-template-columns: 1fr;
-            }}
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <!-- Header -->
-        <div class="header">
-            <h1>
-                <span>📊</span>
-                Dashboard Configuración Neotel
-            </h1>
-            <div class="timestamp">
-                <span>🕐</span>
-                Snapshot: {datetime.fromisoformat(timestamp).strftime('%d/%m/%Y %H:%M:%S')}
-            </div>
-        </div>
-        
-        <!-- Stats -->
-        <div class="stats-grid">
-            <div class="stat-card">
-                <div class="icon">📞</div>
-                <div class="label">Extensiones</div>
-                <div class="value">{len(extensiones)}</div>
-                <div class="breakdown">
-                    Extensiones de cada agente
-                </div>
-            </div>
-            
-            <div class="stat-card success">
-                <div class="icon">📱</div>
-                <div class="label">DIDs</div>
-                <div class="value">{len(dids)}</div>
-                <div class="breakdown">
-                    Números de teléfono configurados
-                </div>
-            </div>
-            
-            <div class="stat-card warning">
-                <div class="icon">📋</div>
-                <div class="label">Colas</div>
-                <div class="value">{len(colas)}</div>
-                <div class="breakdown">
-                    Colas de gestión configuradas
-                </div>
-            </div>
-        </div>
-        
-        <!-- Tabs -->
-        <div class="tabs">
-            <button class="tab active" onclick="showTab('extensiones')">
-                📞 Extensiones
-            </button>
-            <button class="tab" onclick="showTab('dids')">
-                📱 DIDs
-            </button>
-            <button class="tab" onclick="showTab('colas')">
-                📋 Colas
-            </button>
-        </div>
-        
-        <!-- Content -->
-        <div class="content">
-            <!-- Extensiones Tab -->
-            <div id="extensiones" class="tab-content active">
-                <div class="search-bar">
-                    <input type="text" id="searchExtensiones" placeholder="Buscar extensiones..." onkeyup="filterTable('extensionesTable', 'searchExtensiones')">
-                </div>
-                
-                <div class="table-container">
-                    <table id="extensionesTable">
-                        <thead>
-                            <tr>
-                                <th>Extensión</th>
-                                <th>Nombre</th>
-                                <th>Grupo</th>
-                                <th>Agente Asignado</th>
-                                <th>Número Saliente</th>
-                                <th>Estado Colas</th>
-                            </tr>
-                        </thead>
-                        <tbody>
-                            {self._generate_extensiones_rows(extensiones)}
-                        </tbody>
-                    </table>
-                </div>
-            </div>
-            
-            <!-- DIDs Tab -->
-            <div id="dids" class="tab-content">
-                <div class="search-bar">
-                    <input type="text" id="searchDids" placeholder="Buscar DIDs..." onkeyup="filterTable('didsTable', 'searchDids')">
-                </div>
-                
-                <div class="table-container">
-                    <table id="didsTable">
-                        <thead>
-                            <tr>
-                                <th>Número</th>
-                                <th>Locución</th>
-                                <th>Acción 1</th>
-                                <th>Acción 2</th>
-                                <th>Acción 3</th>
-                            </tr>
-                        </thead>
-                        <tbody>
-                            {self._generate_dids_rows(dids)}
-                        </tbody>
-                    </table>
-                </div>
-            </div>
-            
-            <!-- Colas Tab -->
-            <div id="colas" class="tab-content">
-                <div class="search-bar">
-                    <input type="text" id="searchColas" placeholder="Buscar colas..." onkeyup="filterColas('searchColas')">
-                </div>
-                
-                <div id="colasAccordion">
-                    {self._generate_colas_accordion(colas, extensiones)}
-                </div>
-            </div>
-        </div>
-    </div>
+        loader = get_loader()
+        f.write(loader.get('dashboard_head.html').render(
+            estilos=loader.asset_tag('dashboard.css', f.name, self_contained),
+            snapshot=datetime.fromisoformat(timestamp).strftime('%d/%m/%Y %H:%M:%S'),
+            total_extensiones=len(extensiones),
+            total_dids=len(dids),
+            total_colas=len(colas)
+        ))
+        f.writelines(self._generate_extensiones_rows(extensiones))
+        f.write(loader.get('dashboard_dids.html').render())
+        f.writelines(self._generate_dids_rows(dids))
+        f.write(loader.get('dashboard_colas.html').render())
+        f.writelines(self._generate_colas_accordion(colas, extensiones))
+        f.write(loader.get('dashboard_end.html').render(
+            scripts=loader.asset_tag('dashboard.js', f.name, self_contained)))
     
-    <script>
-        // Tab Navigation
-        function showTab(tabName) {{
-            // Hide all tabs
-            const tabs = document.querySelectorAll('.tab-content');
-            tabs.forEach(tab => tab.classList.remove('active'));
-            
-            // Remove active from buttons
-            const buttons = document.querySelectorAll('.tab');
-            buttons.forEach(btn => btn.classList.remove('active'));
-            
-            // Show selected tab
-            document.getElementById(tabName).classList.add('active');
-            
-            // Activate button
-            event.target.classList.add('active');
-        }}
-        
-        // Table Filter
-        function filterTable(tableId, searchId) {{
-            const input = document.getElementById(searchId);
-            const filter = input.value.toUpperCase();
-            const table = document.getElementById(tableId);
-            const tr = table.getElementsByTagName('tr');
-            
-            for (let i = 1; i < tr.length; i++) {{
-                let visible = false;
-                const td = tr[i].getElementsByTagName('td');
-                
-                for (let j = 0; j < td.length; j++) {{
-                    if (td[j]) {{
-                        const txtValue = td[j].textContent || td[j].innerText;
-                        if (txtValue.toUpperCase().indexOf(filter) > -1) {{
-                            visible = true;
-                            break;
-                        }}
-                    }}
-                }}
-                
-                tr[i].style.display = visible ? '' : 'none';
-            }}
-        }}
-        
-        // Accordion Toggle
-        function toggleAccordion(id) {{
-            const header = document.querySelector(`[data-accordion="${{id}}"]`);
-            const content = document.getElementById(id);
-            
-            header.classList.toggle('active');
-            content.classList.toggle('active');
-        }}
+    def _write_data_html(self, f, config_data, timestamp, self_contained=False):
+        """Escribir el dashboard en modo datos (JSON incrustado + listas virtualizadas)"""
+        data = self.dashboard_data(config_data)
+        
+        # JSON dentro de <script>: '<' escapado para que ningún valor cierre la etiqueta
+        payload = json_backend.dumps(data).decode('utf-8').replace('<', '\\u003c')
+        
+        loader = get_loader()
+        f.write(loader.get('dashboard_data.html').render(
+            estilos=Markup(loader.asset_tag('dashboard.css', f.name, self_contained) + '\n    '
+                           + loader.asset_tag('dashboard_data.css', f.name, self_contained)),
+            snapshot=datetime.fromisoformat(timestamp).strftime('%d/%m/%Y %H:%M:%S'),
+            total_extensiones=len(data['extensiones']),
+            total_dids=len(data['dids']),
+            total_colas=len(data['colas']),
+            pestanas=loader.get('dashboard_tabs.html').render(),
+            datos=Markup(payload),
+            scripts=loader.asset_tag('dashboard_data.js', f.name, self_contained)
+        ))
+    
+    def dashboard_data(self, config_data):
+        """
+        Datos del modo datos en forma de columnas (listas, sin nombres de campo)
         
-        // Filter Colas
-        function filterColas(searchId) {{
-            const input = document.getElementById(searchId);
-            const filter = input.value.toUpperCase();
-            const accordions = document.querySelectorAll('.accordion');
-            
-            accordions.forEach(accordion => {{
-                const header = accordion.querySelector('.accordion-header');
-                const title = header.querySelector('.accordion-title').textContent;
-                
-                if (title.toUpperCase().indexOf(filter) > -1) {{
-                    accordion.style.display = '';
-                }} else {{
-                    accordion.style.display = 'none';
-                }}
-            }});
-        }}
-    </script>
-</body>
-</html>"""
+        También son los fragmentos diarios del historial (history_dashboard).
         
-        return html
-    
-    def _calculate_stats(self, config_data):
-        """Calcular estadísticas"""
+        Returns:
+            {'extensiones': [[extensión, nombre, grupo, agente, saliente, estado_colas]],
+             'dids': [[número, locución, acción 1, acción 2, acción 3]],
+             'colas': [[nombre, [[extensión, nombre de usuario, estado, detalle]]]]}
+        """
         extensiones = config_data.get('extensiones', [])
-        
-        ext_activas = sum(1 for e in extensiones if e.get('estado_colas') == 'todas_activas')
-        ext_pausadas = sum(1 for e in extensiones if e.get('estado_colas') == 'todas_pausadas')
-        ext_mixto = sum(1 for e in extensiones if e.get('estado_colas') == 'mixto')
+        resolver = ExtensionResolver(extensiones)
         
         return {
-            'ext_activas': ext_activas,
-            'ext_pausadas': ext_pausadas,
-            'ext_mixto': ext_mixto
+            'extensiones': [
+                [ext.get('extension', ''), ext.get('nombre', ''), ext.get('grupo', '-'),
+                 ext.get('agente_asignado', '-'), ext.get('numero_saliente', '-'), ext.get('estado_colas', '')]
+                for ext in extensiones
+            ],
+            'dids': [
+                [did.get('numero', ''), did.get('locucion', ''), did.get('accion1', ''),
+                 did.get('accion2', ''), did.get('accion3', '')]
+                for did in config_data.get('dids', [])
+            ],
+            'colas': [
+                [cola.get('nombre', ''), [
+                    [miembro.get('extension', ''),
+                     self._get_extension_name(miembro.get('extension', ''), resolver),
+                     miembro.get('estado', ''),
+                     self._member_detail(cola, miembro)]
+                    for miembro in cola.get('miembros', [])
+                ]]
+                for cola in config_data.get('colas', [])
+            ]
         }
     
-    def _get_extension_name(self, extension_code, extensiones):
-        """Obtener nombre de usuario desde código de extensión"""
-        for ext in extensiones:
-            if ext.get('extension', '') == extension_code:
-                nombre = ext.get('nombre', '').strip()
-                return nombre if nombre else extension_code
-        return extension_code
+    def _get_extension_name(self, extension_code, resolver):
+        """Obtener nombre de usuario desde código de extensión (el código si no se encuentra)"""
+        return resolver.resolve(extension_code) or extension_code
+    
+    def _member_detail(self, cola, miembro):
+        """Línea de detalle de un miembro (Ext y contadores Est/Pen/Pri)"""
+        extension_code = miembro.get('extension', '')
+        texto_completo = member_info(cola, miembro)
+        
+        # Extraer información del texto (Est, Pen, Pri)
+        info_parts = []
+        if 'Est:' in texto_completo:
+            info_parts.append(f"Ext: {extension_code}")
+        if texto_completo:
+            # Mantener solo Est, Pen, Pri del texto original
+            parts = texto_completo.split('Extensión:')[0].strip()
+            if parts:
+                info_parts.append(parts)
+        
+        return ' | '.join(info_parts) if info_parts else f"Ext: {extension_code}"
     
     def _generate_extensiones_rows(self, extensiones):
-        """Generar filas de tabla de extensiones"""
-        rows = []
+        """Generar filas de tabla de extensiones (una a una)"""
+        row = get_template('dashboard_extension_row.html')
+        empty = True
         for ext in extensiones:
-            estado = ext.get('estado_colas', '')
+            empty = False
             
             # Badge según estado
-            if estado == 'todas_activas':
-                badge = '<span class="badge success">✓ Activas</span>'
-            elif estado == 'todas_pausadas':
-                badge = '<span class="badge danger">⏸ Pausadas</span>'
-            elif estado == 'mixto':
-                badge = '<span class="badge warning">⚡ Mixto</span>'
-            else:
-                badge = '<span class="badge info">○ Sin Colas</span>'
-            
-            rows.append(f"""
-                <tr>
-                    <td><strong>{ext.get('extension', '')}</strong></td>
-                    <td>{ext.get('nombre', '')}</td>
-                    <td>{ext.get('grupo', '-')}</td>
-                    <td>{ext.get('agente_asignado', '-')}</td>
-                    <td>{ext.get('numero_saliente', '-')}</td>
-                    <td>{badge}</td>
-                </tr>
-            """)
-        
-        return '\n'.join(rows) if rows else '<tr><td colspan="6" class="empty-state"><div class="icon">📭</div><div>No hay extensiones</div></td></tr>'
+            badge_class, badge = ESTADO_BADGES.get(ext.get('estado_colas', ''), ESTADO_BADGES['sin_colas'])
+            
+            yield row.render(
+                extension=ext.get('extension', ''),
+                nombre=ext.get('nombre', ''),
+                grupo=ext.get('grupo', '-'),
+                agente_asignado=ext.get('agente_asignado', '-'),
+                numero_saliente=ext.get('numero_saliente', '-'),
+                badge_clase=badge_class,
+                badge=badge
+            )
+        
+        if empty:
+            yield get_template('dashboard_empty_row.html').render(columnas=6, mensaje='No hay extensiones')
 
     def _generate_dids_rows(self, dids):
-        """Generar filas de tabla de DIDs"""
-        rows = []
+        """Generar filas de tabla de DIDs (una a una)"""
+        row = get_template('dashboard_did_row.html')
+        empty = True
         for did in dids:
-            rows.append(f"""
-                <tr>
-                    <td><strong>{did.get('numero', '')}</strong></td>
-                    <td>{did.get('locucion', '')}</td>
-                    <td>{did.get('accion1', '')}</td>
-                    <td>{did.get('accion2', '')}</td>
-                    <td>{did.get('accion3', '')}</td>
-                </tr>
-            """)
-        
-        return '\n'.join(rows) if rows else '<tr><td colspan="5" class="empty-state"><div class="icon">📭</div><div>No hay DIDs</div></td></tr>'
+            empty = False
+            yield row.render(
+                numero=did.get('numero', ''),
+                locucion=did.get('locucion', ''),
+                accion1=did.get('accion1', ''),
+                accion2=did.get('accion2', ''),
+                accion3=did.get('accion3', '')
+            )
+        
+        if empty:
+            yield get_template('dashboard_empty_row.html').render(columnas=5, mensaje='No hay DIDs')
     
     def _generate_colas_accordion(self, colas, extensiones):
-        """Generar acordeones para colas"""
+        """Generar acordeones para colas (uno a uno)"""
         if not colas:
-            return '<div class="empty-state"><div class="icon">📭</div><div>No hay colas configuradas</div></div>'
+            yield EMPTY_COLAS
+            return
+        
+        cola_start = get_template('dashboard_cola_start.html')
+        cola_end = get_template('dashboard_cola_end.html').render()
+        member_card = get_template('dashboard_member.html')
+        resolver = ExtensionResolver(extensiones)
         
-        accordions = []
         for idx, cola in enumerate(colas):
             miembros = cola.get('miembros', [])
             activos = sum(1 for m in miembros if m.get('estado') == 'activo')
             pausados = sum(1 for m in miembros if m.get('estado') == 'pausado')
             
-            # Generar cards de miembros con nombres
-            member_cards = []
+            yield cola_start.render(indice=idx, nombre=cola.get('nombre', ''),
+                                    activos=activos, pausados=pausados, total=len(miembros))
+            
+            # Cards de miembros con nombres
             for miembro in miembros:
-                extension_code = miembro.get('extension', '')
                 estado = miembro.get('estado', '')
-                texto_completo = miembro.get('texto', '')
-                
-                # Obtener nombre del usuario
-                nombre_usuario = self._get_extension_name(extension_code, extensiones)
-                
-                # Determinar clase y icono según estado
-                estado_class = 'paused' if estado == 'pausado' else ''
-                estado_icon = '⏸' if estado == 'pausado' else '▶'
-                
-                # Extraer información del texto (Est, Pen, Pri)
-                info_parts = []
-                if 'Est:' in texto_completo:
-                    info_parts.append(f"Ext: {extension_code}")
-                if texto_completo:
-                    # Mantener solo Est, Pen, Pri del texto original
-                    parts = texto_completo.split('Extensión:')[0].strip()
-                    if parts:
-                        info_parts.append(parts)
-                
-                info_line = ' | '.join(info_parts) if info_parts else f"Ext: {extension_code}"
-                
-                member_cards.append(f"""
-                    <div class="member-card {estado_class}">
-                        <div class="member-name">
-                            <span>{estado_icon}</span>
-                            <span>{nombre_usuario}</span>
-                        </div>
-                        <div class="member-details">{info_line}</div>
-                    </div>
-                """)
-            
-            members_html = '\n'.join(member_cards) if member_cards else '<div class="empty-state">Sin miembros</div>'
-            
-            accordions.append(f"""
-                <div class="accordion">
-                    <div class="accordion-header" data-accordion="cola{idx}" onclick="toggleAccordion('cola{idx}')">
-                        <div class="accordion-title">
-                            <span>📋</span>
-                            <span>{cola.get('nombre', '')}</span>
-                        </div>
-                        <div class="accordion-stats">
-                            <span class="badge success">▶ {activos}</span>
-                            <span class="badge danger">⏸ {pausados}</span>
-                            <span class="badge info">👥 {len(miembros)}</span>
-                        </div>
-                        <span class="accordion-icon">▼</span>
-                    </div>
-                    <div class="accordion-content" id="cola{idx}">
-                        <div class="members-grid">
-                            {members_html}
-                        </div>
-                    </div>
-                </div>
-            """)
-        
-        return '\n'.join(accordions)
+                yield member_card.render(
+                    clase='paused' if estado == 'pausado' else '',
+                    icono='⏸' if estado == 'pausado' else '▶',
+                    nombre=self._get_extension_name(miembro.get('extension', ''), resolver),
+                    detalle=self._member_detail(cola, miembro)
+                )
+            
+            if not miembros:
+                yield EMPTY_MEMBERS
+            yield cola_end
 
-def generate_latest_dashboard():
+def generate_latest_dashboard(mode=None, self_contained=None):
     """Generar dashboard del snapshot más reciente"""
     try:
         # Buscar el snapshot más reciente
-        snapshots = sorted(ConfigAudit.SNAPSHOTS_DIR.glob("*.json"), reverse=True)
+        snapshots = ConfigAudit.list_snapshot_files()
         
         if not snapshots:
             print("❌ No se encontraron snapshots")
             return
         
-        latest_snapshot = snapshots[0]
+        latest_snapshot = snapshots[-1][1]
         print(f"📁 Snapshot más reciente: {latest_snapshot.name}")
         
         # Generar dashboard
         generator = DashboardGenerator()
-        dashboard_file = generator.generate_html_dashboard(latest_snapshot)
+        dashboard_file = generator.generate_html_dashboard(latest_snapshot, mode=mode, self_contained=self_contained)
         
         print()
         print("=" * 80)
@@ -913,12 +345,13 @@ def generate_latest_dashboard():
         print(f"\n❌ Error: {str(e)}")
         sys.exit(1)
 
-def generate_specific_dashboard(date_str):
+def generate_specific_dashboard(date_str, mode=None, self_contained=None):
     """Generar dashboard de un snapshot específico"""
     try:
-        snapshot_file = ConfigAudit.SNAPSHOTS_DIR / f"{date_str}_snapshot.json"
+        snapshot_date = datetime.strptime(date_str, '%Y-%m-%d').date()
+        snapshot_file = ConfigAudit.find_snapshot_file(snapshot_date)
         
-        if not snapshot_file.exists():
+        if snapshot_file is None:
             print(f"❌ No se encontró snapshot para la fecha {date_str}")
             return
         
@@ -926,7 +359,7 @@ def generate_specific_dashboard(date_str):
         
         # Generar dashboard
         generator = DashboardGenerator()
-        dashboard_file = generator.generate_html_dashboard(snapshot_file)
+        dashboard_file = generator.generate_html_dashboard(snapshot_file, mode=mode, self_contained=self_contained)
         
         print()
         print("=" * 80)
@@ -941,20 +374,27 @@ def generate_specific_dashboard(date_str):
 
 def main():
     """Función principal"""
+    parser = argparse.ArgumentParser(description="Generar el dashboard HTML de un snapshot Neotel")
+    parser.add_argument('fecha', nargs='?', help="Fecha del snapshot YYYY-MM-DD (default: el más reciente)")
+    parser.add_argument('--modo', choices=[MODE_HTML, MODE_DATA],
+                        help="html: filas literales; datos: JSON incrustado y listas virtualizadas (default: según tamaño)")
+    parser.add_argument('--autocontenido', '--self-contained', dest='autocontenido', action='store_true', default=None,
+                        help="Incrustar CSS/JS en el HTML (p.ej. para adjuntarlo a un email)")
+    args = parser.parse_args()
+    
     print("=" * 80)
     print("🎨 GENERADOR DE DASHBOARD HTML - NEOTEL")
     print("=" * 80)
     print()
     
-    if len(sys.argv) > 1:
+    if args.fecha:
         # Generar dashboard específico
-        date_str = sys.argv[1]
-        print(f"Generando dashboard de fecha: {date_str}")
-        generate_specific_dashboard(date_str)
+        print(f"Generando dashboard de fecha: {args.fecha}")
+        generate_specific_dashboard(args.fecha, args.modo, args.autocontenido)
     else:
         # Generar dashboard del más reciente
         print("Generando dashboard del snapshot más reciente...")
-        generate_latest_dashboard()
+        generate_latest_dashboard(args.modo, args.autocontenido)
 
 
 if __name__ == "__main__":
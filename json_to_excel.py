@@ -4,26 +4,48 @@ Convertidor de snapshots JSON a Excel Profesional
 Genera un archivo Excel corporativo con estilo minimalista
 """
 
-import json
 import sys
 from datetime import datetime
+from itertools import chain, islice
 from pathlib import Path
 from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill, Alignment, Border, Side, NamedStyle
 from openpyxl.utils import get_column_letter
 
 # Importar configuración
 from config_audit import ConfigAudit
+from snapshot_format import open_snapshot
+from normalization import member_info
+from extension_resolver import ExtensionResolver
+from artifact_cache import ArtifactCache, artifact_key, snapshot_fingerprint
+
+# Versión del generador: subir al cambiar hojas, columnas o estilos para no
+# servir Excel antiguos desde la caché de artefactos
+EXCEL_GENERATOR_VERSION = 3
+
+# Filas usadas para calcular el ancho de las columnas: el resto se escribe
+# sin retenerlas en memoria
+WIDTH_SAMPLE_ROWS = 1000
+
+def excel_artifact(snapshot):
+    """
+    Clave en la caché de artefactos y nombre de archivo del Excel de un snapshot
+    
+    Mismo snapshot y misma versión del generador -> misma clave.
+    """
+    key = artifact_key('excel', snapshot_fingerprint(snapshot), EXCEL_GENERATOR_VERSION)
+    return key, f"neotel_config_{snapshot.date or 'snapshot'}_{key[:12]}.xlsx"
+
 
 class ExcelProfessionalConverter:
     """Convertidor profesional de JSON a Excel con estilo corporativo"""
     
     def __init__(self):
         """Inicializar convertidor con paleta corporativa"""
-        self.workbook = Workbook()
-        # Eliminar hoja por defecto
-        if 'Sheet' in self.workbook.sheetnames:
-            del self.workbook['Sheet']
+        # Libro en modo solo escritura: cada fila se vuelca al archivo al
+        # añadirla, sin mantener las celdas en memoria
+        self.workbook = Workbook(write_only=True)
         
         # Paleta corporativa minimalista (igual al dashboard)
         self.colors = {
@@ -42,378 +64,285 @@ class ExcelProfessionalConverter:
             'paused_light': 'F8D7DA',      # Rojo claro
             'mixed_light': 'FFF3CD',       # Amarillo claro
         }
+        
+        self.register_styles()
     
-    def apply_title_style(self, cell):
-        """Estilo para títulos principales"""
-        cell.font = Font(bold=True, size=16, color=self.colors['primary'])
-        cell.alignment = Alignment(horizontal='left', vertical='center')
+    def register_styles(self):
+        """Registrar los estilos con nombre del libro (una sola vez, compartidos por todas las celdas)"""
+        side = Side(style='thin', color=self.colors['border'])
+        self.border = Border(left=side, right=side, top=side, bottom=side)
+        self.data_styles = {}
+        
+        # Títulos principales
+        self.workbook.add_named_style(NamedStyle(
+            name='neotel_titulo',
+            font=Font(bold=True, size=16, color=self.colors['primary']),
+            alignment=Alignment(horizontal='left', vertical='center')
+        ))
+        
+        # Encabezados de tabla
+        self.workbook.add_named_style(NamedStyle(
+            name='neotel_encabezado',
+            font=Font(bold=True, size=11, color='FFFFFF'),
+            fill=PatternFill(start_color=self.colors['primary'],
+                             end_color=self.colors['primary'],
+                             fill_type='solid'),
+            alignment=Alignment(horizontal='center', vertical='center', wrap_text=True),
+            border=self.border
+        ))
     
-    def apply_header_style(self, cell):
-        """Estilo para encabezados de tabla"""
-        cell.font = Font(bold=True, size=11, color='FFFFFF')
-        cell.fill = PatternFill(start_color=self.colors['primary'], 
-                               end_color=self.colors['primary'], 
-                               fill_type='solid')
-        cell.alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
-        
-        border = Border(
-            left=Side(style='thin', color=self.colors['border']),
-            right=Side(style='thin', color=self.colors['border']),
-            top=Side(style='thin', color=self.colors['border']),
-            bottom=Side(style='thin', color=self.colors['border'])
-        )
-        cell.border = border
+    def data_style(self, bg_color=None, bold=False, align='left'):
+        """Nombre del estilo para celdas de datos (se registra la primera vez que se usa)"""
+        key = (bg_color, bold, align)
+        name = self.data_styles.get(key)
+        if name is None:
+            name = f"neotel_dato_{len(self.data_styles) + 1}"
+            style = NamedStyle(
+                name=name,
+                font=Font(size=10, bold=bold),
+                alignment=Alignment(horizontal=align, vertical='center', wrap_text=False),
+                border=self.border
+            )
+            if bg_color:
+                style.fill = PatternFill(start_color=bg_color,
+                                         end_color=bg_color,
+                                         fill_type='solid')
+            self.workbook.add_named_style(style)
+            self.data_styles[key] = name
+        return name
     
-    def apply_data_cell_style(self, cell, bg_color=None, bold=False, align='left'):
-        """Estilo para celdas de datos"""
-        cell.font = Font(size=10, bold=bold)
-        cell.alignment = Alignment(horizontal=align, vertical='center', wrap_text=False)
-        
-        if bg_color:
-            cell.fill = PatternFill(start_color=bg_color, 
-                                   end_color=bg_color, 
-                                   fill_type='solid')
-        
-        border = Border(
-            left=Side(style='thin', color=self.colors['border']),
-            right=Side(style='thin', color=self.colors['border']),
-            top=Side(style='thin', color=self.colors['border']),
-            bottom=Side(style='thin', color=self.colors['border'])
-        )
-        cell.border = border
+    def styled_cell(self, ws, value, style):
+        """Celda con un estilo con nombre"""
+        cell = WriteOnlyCell(ws, value=value)
+        cell.style = style
+        return cell
     
-    def auto_adjust_columns(self, worksheet):
-        """Ajustar automáticamente el ancho de columnas"""
-        for column in worksheet.columns:
-            max_length = 0
-            column_letter = get_column_letter(column[0].column)
-            
-            for cell in column:
-                try:
-                    if cell.value:
-                        cell_length = len(str(cell.value))
-                        max_length = max(max_length, cell_length)
-                except:
-                    pass
-            
-            # Ancho ajustado con límites
-            adjusted_width = min(max(max_length + 3, 12), 60)
-            worksheet.column_dimensions[column_letter].width = adjusted_width
+    def column_widths(self, title, headers, rows):
+        """
+        Ancho de cada columna según su contenido (título, encabezado y datos)
+        
+        En modo solo escritura las columnas se escriben antes que las filas,
+        así que los anchos se calculan sobre los valores antes de volcarlos
+        (una muestra de las primeras filas en hojas grandes).
+        """
+        lengths = [len(header) for header in headers]
+        lengths[0] = max(lengths[0], len(title))
+        
+        for values, _ in rows:
+            for col_idx, value in enumerate(values):
+                if value:
+                    lengths[col_idx] = max(lengths[col_idx], len(str(value)))
+        
+        # Ancho ajustado con límites
+        return [min(max(length + 3, 12), 60) for length in lengths]
     
-    def create_extensiones_sheet(self, extensiones):
-        """Crear pestaña de extensiones con estilo profesional"""
-        ws = self.workbook.create_sheet("📞 Extensiones")
-        
-        # Título
-        ws['A1'] = '📞 Configuración de Extensiones'
-        self.apply_title_style(ws['A1'])
-        ws.merge_cells('A1:F1')
+    def write_sheet(self, sheet_name, title, title_range, headers, rows, bold_col=1, aligns=None):
+        """
+        Escribir una pestaña: título, encabezados y filas de datos
+        
+        Args:
+            title_range: Rango combinado del título (p.ej. 'A1:F1')
+            rows: Iterable de tuplas (valores, color de fondo o None); solo
+                se retienen las WIDTH_SAMPLE_ROWS primeras
+            bold_col: Columna (desde 1) en negrita
+            aligns: Alineación de cada columna (default: todas a la izquierda)
+        """
+        ws = self.workbook.create_sheet(sheet_name)
+        aligns = aligns or ['left'] * len(headers)
+        
+        # Todo lo que va antes de los datos debe fijarse antes de la primera fila
+        rows = iter(rows)
+        sample = list(islice(rows, WIDTH_SAMPLE_ROWS))
+        for col_idx, width in enumerate(self.column_widths(title, headers, sample), 1):
+            ws.column_dimensions[get_column_letter(col_idx)].width = width
         ws.row_dimensions[1].height = 25
-        
-        # Espacio
-        ws.row_dimensions[2].height = 10
-        
-        # Encabezados (con nueva columna)
-        headers = ['Extensión', 'Nombre', 'Grupo', 'Número Saliente', 'Estado Colas']
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=3, column=col, value=header)
-            self.apply_header_style(cell)
-        
-        # Datos
-        for row_idx, ext in enumerate(extensiones, 4):
-            estado = ext.get('estado_colas', 'sin_colas')
-            
-            # Determinar color según estado
-            estado_config = {
-                'todas_activas': ('✓ Activas', self.colors['active_light']),
-                'todas_pausadas': ('⏸ Pausadas', self.colors['paused_light']),
-                'mixto': ('⚡ Mixto', self.colors['mixed_light']),
-                'sin_colas': ('○ Sin Colas', self.colors['surface'])
-            }
-            
-            estado_label, bg_color = estado_config.get(estado, ('', self.colors['surface']))
-            
-            # Escribir datos (con nuevo campo)
-            data = [
-                ext.get('extension', ''),
-                ext.get('nombre', ''),
-                ext.get('agente_asignado', '-'),  # ⭐ NUEVO CAMPO
-                ext.get('numero_saliente', '-'),
-                estado_label
-            ]
-            
-            for col_idx, value in enumerate(data, 1):
-                cell = ws.cell(row=row_idx, column=col_idx, value=value)
-                is_bold = (col_idx == 1)  # Bold en extensión
-                self.apply_data_cell_style(cell, bg_color=bg_color, bold=is_bold)
+        ws.row_dimensions[2].height = 10  # Espacio
         
         # Congelar filas de encabezado
         ws.freeze_panes = 'A4'
         
-        # Filtros automáticos
-        ws.auto_filter.ref = f"A3:E{len(extensiones) + 3}"  # ⭐ Cambiar E por F
-        
-        self.auto_adjust_columns(ws)
-
-    def create_dids_sheet(self, dids):
-        """Crear pestaña de DIDs con estilo profesional"""
-        ws = self.workbook.create_sheet("📱 DIDs")
-        
         # Título
-        ws['A1'] = '📱 Configuración de DIDs'
-        self.apply_title_style(ws['A1'])
-        ws.merge_cells('A1:F1')
-        ws.row_dimensions[1].height = 25
-        
-        # Espacio
-        ws.row_dimensions[2].height = 10
+        ws.merged_cells.add(title_range)
+        ws.append([self.styled_cell(ws, title, 'neotel_titulo')])
+        ws.append([])
         
         # Encabezados
-        headers = ['Número', 'Locución', 'Acción 1', 'Acción 2', 'Acción 3']
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=3, column=col, value=header)
-            self.apply_header_style(cell)
-        
-        # Datos
-        for row_idx, did in enumerate(dids, 4):
-            data = [
-                did.get('numero', ''),
-                did.get('locucion', 'N/D'),
-                did.get('accion1', 'N/D'),
-                did.get('accion2', 'N/D'),
-                did.get('accion3', 'N/D')
-            ]
-            
-            for col_idx, value in enumerate(data, 1):
-                cell = ws.cell(row=row_idx, column=col_idx, value=value)
-                is_bold = (col_idx == 1)  # Bold en número
-                self.apply_data_cell_style(cell, bold=is_bold)
-        
-        # Congelar filas de encabezado
-        ws.freeze_panes = 'A4'
+        ws.append([self.styled_cell(ws, header, 'neotel_encabezado') for header in headers])
+        
+        # Datos: estilos de cada columna resueltos una vez por color de fondo
+        row_styles = {}
+        written = 0
+        for values, bg_color in chain(sample, rows):
+            styles = row_styles.get(bg_color)
+            if styles is None:
+                styles = row_styles[bg_color] = [
+                    self.data_style(bg_color=bg_color, bold=(col_idx == bold_col), align=align)
+                    for col_idx, align in enumerate(aligns, 1)
+                ]
+            ws.append([self.styled_cell(ws, value, style) for value, style in zip(values, styles)])
+            written += 1
         
         # Filtros automáticos
-        ws.auto_filter.ref = f"A3:E{len(dids) + 3}"
+        ws.auto_filter.ref = f"A3:{get_column_letter(len(headers))}{written + 3}"
+    
+    def create_extensiones_sheet(self, extensiones):
+        """Crear pestaña de extensiones con estilo profesional"""
+        # Etiqueta y color según estado
+        estado_config = {
+            'todas_activas': ('✓ Activas', self.colors['active_light']),
+            'todas_pausadas': ('⏸ Pausadas', self.colors['paused_light']),
+            'mixto': ('⚡ Mixto', self.colors['mixed_light']),
+            'sin_colas': ('○ Sin Colas', self.colors['surface'])
+        }
         
-        self.auto_adjust_columns(ws)
+        def rows():
+            for ext in extensiones:
+                estado = ext.get('estado_colas', 'sin_colas')
+                estado_label, bg_color = estado_config.get(estado, ('', self.colors['surface']))
+                yield ((
+                    ext.get('extension', ''),
+                    ext.get('nombre', ''),
+                    ext.get('agente_asignado', '-'),  # ⭐ NUEVO CAMPO
+                    ext.get('numero_saliente', '-'),
+                    estado_label
+                ), bg_color)
+        
+        # Encabezados (con nueva columna); bold en extensión
+        headers = ['Extensión', 'Nombre', 'Grupo', 'Número Saliente', 'Estado Colas']
+        self.write_sheet("📞 Extensiones", '📞 Configuración de Extensiones', 'A1:F1', headers, rows())
+
+    def create_dids_sheet(self, dids):
+        """Crear pestaña de DIDs con estilo profesional"""
+        rows = (((
+            did.get('numero', ''),
+            did.get('locucion', 'N/D'),
+            did.get('accion1', 'N/D'),
+            did.get('accion2', 'N/D'),
+            did.get('accion3', 'N/D')
+        ), None) for did in dids)
+        
+        # Bold en número
+        headers = ['Número', 'Locución', 'Acción 1', 'Acción 2', 'Acción 3']
+        self.write_sheet("📱 DIDs", '📱 Configuración de DIDs', 'A1:F1', headers, rows)
     
     def create_colas_sheet(self, colas):
         """Crear pestaña de colas con resumen"""
-        ws = self.workbook.create_sheet("📋 Colas - Resumen")
+        def rows():
+            for cola in colas:
+                miembros = cola.get('miembros', [])
+                activos = sum(1 for m in miembros if m.get('estado') == 'activo')
+                pausados = sum(1 for m in miembros if m.get('estado') == 'pausado')
+                yield ((cola.get('nombre', ''), len(miembros), activos, pausados), None)
         
-        # Título
-        ws['A1'] = '📋 Resumen de Colas'
-        self.apply_title_style(ws['A1'])
-        ws.merge_cells('A1:F1')
-        ws.row_dimensions[1].height = 25
-        
-        # Espacio
-        ws.row_dimensions[2].height = 10
-        
-        # Encabezados
         headers = ['Cola', 'Total Miembros', '▶ Activos', '⏸ Pausados']
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=3, column=col, value=header)
-            self.apply_header_style(cell)
-        
-        # Datos
-        for row_idx, cola in enumerate(colas, 4):
-            miembros = cola.get('miembros', [])
-            activos = sum(1 for m in miembros if m.get('estado') == 'activo')
-            pausados = sum(1 for m in miembros if m.get('estado') == 'pausado')
-            
-            data = [
-                cola.get('nombre', ''),
-                len(miembros),
-                activos,
-                pausados
-            ]
-            
-            for col_idx, value in enumerate(data, 1):
-                cell = ws.cell(row=row_idx, column=col_idx, value=value)
-                is_bold = (col_idx == 1)
-                align = 'center' if col_idx > 1 else 'left'
-                self.apply_data_cell_style(cell, bold=is_bold, align=align)
-        
-        # Congelar filas de encabezado
-        ws.freeze_panes = 'A4'
-        
-        # Filtros automáticos
-        ws.auto_filter.ref = f"A3:D{len(colas) + 3}"
-        
-        self.auto_adjust_columns(ws)
+        self.write_sheet("📋 Colas - Resumen", '📋 Resumen de Colas', 'A1:F1', headers, rows(),
+                         aligns=['left', 'center', 'center', 'center'])
     
     def create_miembros_sheet(self, colas, extensiones):
         """Crear pestaña detallada de miembros con nombres (mejorado)"""
-        ws = self.workbook.create_sheet("📋 Colas - Detalle")
-        
-        # Título
-        ws['A1'] = '📋 Miembros de Colas (Detallado)'
-        self.apply_title_style(ws['A1'])
-        ws.merge_cells('A1:E1')
-        ws.row_dimensions[1].height = 25
-        
-        # Espacio
-        ws.row_dimensions[2].height = 10
-        
-        # Encabezados
-        headers = ['Cola', 'Nombre Usuario', 'Extensión', 'Estado', 'Información']
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=3, column=col, value=header)
-            self.apply_header_style(cell)
-        
-        # Crear diccionario de extensiones con NORMALIZACIÓN
-        # Normalizar: eliminar espacios, guiones, etc para hacer match robusto
-        ext_dict = {}
-        ext_dict_raw = {}  # Diccionario con códigos originales
-        
-        for ext in extensiones:
-            codigo_original = ext.get('extension', '').strip()
-            nombre = ext.get('nombre', '').strip()
-            
-            # Guardar con código original
-            ext_dict_raw[codigo_original] = nombre
-            
-            # También guardar versiones normalizadas para búsqueda flexible
-            codigo_normalizado = codigo_original.replace('-', '').replace(' ', '').upper()
-            if codigo_normalizado:
-                ext_dict[codigo_normalizado] = nombre
+        # Índices de nombres (exacto, normalizado y por dígitos) para match robusto
+        resolver = ExtensionResolver(extensiones)
         
         # Debug: mostrar algunos mapeos
         print(f"\n🔍 Debug - Primeras 5 extensiones en diccionario:")
-        for i, (codigo, nombre) in enumerate(list(ext_dict_raw.items())[:5]):
+        for i, (codigo, nombre) in enumerate(list(resolver.exact.items())[:5]):
             print(f"   {codigo} -> {nombre}")
         
-        # Datos
-        row_idx = 4
-        extensiones_no_encontradas = set()
-        
-        for cola in colas:
-            cola_nombre = cola.get('nombre', '')
-            
-            for miembro in cola.get('miembros', []):
-                estado = miembro.get('estado', 'desconocido')
-                extension_code = miembro.get('extension', '').strip()
+        # Datos (generados al escribir la hoja)
+        def rows():
+            for cola in colas:
+                cola_nombre = cola.get('nombre', '')
                 
-                # BÚSQUEDA MEJORADA DEL NOMBRE
-                nombre_usuario = None
-                
-                # 1. Intentar match exacto
-                if extension_code in ext_dict_raw:
-                    nombre_usuario = ext_dict_raw[extension_code]
-                
-                # 2. Intentar match normalizado
-                if not nombre_usuario:
-                    codigo_normalizado = extension_code.replace('-', '').replace(' ', '').upper()
-                    if codigo_normalizado in ext_dict:
-                        nombre_usuario = ext_dict[codigo_normalizado]
-                
-                # 3. Intentar buscar por subcadena (últimos dígitos)
-                if not nombre_usuario:
-                    # Extraer solo números del código
-                    numeros_codigo = ''.join(filter(str.isdigit, extension_code))
+                for miembro in cola.get('miembros', []):
+                    estado = miembro.get('estado', 'desconocido')
+                    extension_code = miembro.get('extension', '').strip()
                     
-                    for codigo_ext, nombre_ext in ext_dict_raw.items():
-                        numeros_ext = ''.join(filter(str.isdigit, codigo_ext))
-                        if numeros_codigo and numeros_ext and numeros_codigo in numeros_ext:
-                            nombre_usuario = nombre_ext
-                            break
-                
-                # 4. Si aún no se encuentra, usar código como fallback
-                if not nombre_usuario or nombre_usuario == '':
-                    nombre_usuario = f"⚠️ {extension_code}"
-                    extensiones_no_encontradas.add(extension_code)
-                
-                # Color y label según estado
-                if estado == 'activo':
-                    bg_color = self.colors['active_light']
-                    estado_label = '▶ Activo'
-                elif estado == 'pausado':
-                    bg_color = self.colors['paused_light']
-                    estado_label = '⏸ Pausado'
-                else:
-                    bg_color = self.colors['surface']
-                    estado_label = '? Desconocido'
-                
-                # Extraer info limpia
-                texto = miembro.get('texto', '')
-                info = texto.split('Extensión:')[0].strip() if 'Extensión:' in texto else f"Ext: {extension_code}"
-                
-                data = [
-                    cola_nombre,
-                    nombre_usuario,
-                    extension_code,
-                    estado_label,
-                    info
-                ]
-                
-                for col_idx, value in enumerate(data, 1):
-                    cell = ws.cell(row=row_idx, column=col_idx, value=value)
-                    is_bold = (col_idx == 2)  # Bold en nombre
-                    self.apply_data_cell_style(cell, bg_color=bg_color, bold=is_bold)
-                
-                row_idx += 1
+                    # Si no se encuentra, usar código como fallback
+                    nombre_usuario = resolver.resolve(extension_code) or f"⚠️ {extension_code}"
+                    
+                    # Color y label según estado
+                    if estado == 'activo':
+                        bg_color = self.colors['active_light']
+                        estado_label = '▶ Activo'
+                    elif estado == 'pausado':
+                        bg_color = self.colors['paused_light']
+                        estado_label = '⏸ Pausado'
+                    else:
+                        bg_color = self.colors['surface']
+                        estado_label = '? Desconocido'
+                    
+                    # Extraer info limpia
+                    texto = member_info(cola, miembro)
+                    info = texto.split('Extensión:')[0].strip() if 'Extensión:' in texto else f"Ext: {extension_code}"
+                    
+                    yield ((
+                        cola_nombre,
+                        nombre_usuario,
+                        extension_code,
+                        estado_label,
+                        info
+                    ), bg_color)
+        
+        # Bold en nombre
+        headers = ['Cola', 'Nombre Usuario', 'Extensión', 'Estado', 'Información']
+        self.write_sheet("📋 Colas - Detalle", '📋 Miembros de Colas (Detallado)', 'A1:E1', headers, rows(),
+                         bold_col=2)
         
-        # Mostrar advertencia si hay extensiones no encontradas
+        # Mostrar advertencia si hay extensiones no encontradas (ya resueltas al escribir)
+        extensiones_no_encontradas = resolver.unresolved
         if extensiones_no_encontradas:
             print(f"\n⚠️  ADVERTENCIA: {len(extensiones_no_encontradas)} extensiones no encontradas:")
             for ext_code in sorted(list(extensiones_no_encontradas))[:10]:
                 print(f"   - {ext_code}")
             if len(extensiones_no_encontradas) > 10:
                 print(f"   ... y {len(extensiones_no_encontradas) - 10} más")
-        
-        # Congelar filas de encabezado
-        ws.freeze_panes = 'A4'
-        
-        # Filtros automáticos
-        ws.auto_filter.ref = f"A3:E{row_idx - 1}"
-        
-        self.auto_adjust_columns(ws)
 
     def convert_json_to_excel(self, json_file, output_file=None):
-        """Convertir archivo JSON a Excel profesional"""
+        """
+        Convertir archivo JSON a Excel profesional
+        
+        Sin output_file se usa la caché de artefactos: si ya existe el Excel
+        de este snapshot con la misma versión del generador, se devuelve sin
+        regenerarlo.
+        """
         try:
-            print(f"📖 Leyendo archivo JSON: {json_file}")
-            
-            # Leer JSON
-            with open(json_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            # Extraer configuración
-            if 'config' in data:
-                config_data = data['config']
-            else:
-                config_data = data
+            print(f"📖 Leyendo snapshot: {json_file}")
             
-            print("🎨 Generando Excel profesional...")
+            # Abrir snapshot: las secciones se decodifican al acceder a ellas
+            snapshot = open_snapshot(json_file)
             
-            extensiones = config_data.get('extensiones', [])
-            dids = config_data.get('dids', [])
-            colas = config_data.get('colas', [])
-            
-            # Crear hojas en orden (SIN DASHBOARD)
-            self.create_extensiones_sheet(extensiones)
-            self.create_dids_sheet(dids)
-            self.create_colas_sheet(colas)
-            self.create_miembros_sheet(colas, extensiones)
+            def build(path):
+                print("🎨 Generando Excel profesional...")
+                
+                extensiones = snapshot.extensiones
+                colas = snapshot.colas
+                
+                # Crear hojas en orden (SIN DASHBOARD)
+                self.create_extensiones_sheet(extensiones)
+                self.create_dids_sheet(snapshot.dids)
+                self.create_colas_sheet(colas)
+                self.create_miembros_sheet(colas, extensiones)
+                
+                # Guardar
+                self.workbook.save(path)
             
-            # Generar nombre de archivo si no se proporciona
+            cached = False
             if output_file is None:
-                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                output_file = ConfigAudit.REPORTS_DIR / f"neotel_config_{timestamp}.xlsx"
-            
-            # Guardar
-            self.workbook.save(output_file)
+                key, filename = excel_artifact(snapshot)
+                output_file, cached = ArtifactCache().build('excel', key, filename, build)
+            else:
+                build(output_file)
             
             print()
             print("=" * 80)
-            print("✅ EXCEL PROFESIONAL GENERADO")
+            print("♻️  EXCEL AL DÍA (CACHÉ)" if cached else "✅ EXCEL PROFESIONAL GENERADO")
             print("=" * 80)
             print(f"\n📊 Archivo: {output_file}")
-            print(f"📋 Pestañas creadas: {len(self.workbook.sheetnames)}")
-            print(f"   • {len(extensiones)} Extensiones")
-            print(f"   • {len(dids)} DIDs")
-            print(f"   • {len(colas)} Colas (resumen y detalle)")
+            if not cached:
+                print(f"📋 Pestañas creadas: {len(self.workbook.sheetnames)}")
+            print(f"   • {snapshot.count('extensiones')} Extensiones")
+            print(f"   • {snapshot.count('dids')} DIDs")
+            print(f"   • {snapshot.count('colas')} Colas (resumen y detalle)")
             
             return output_file
             
@@ -425,13 +354,13 @@ def convert_latest_snapshot():
     """Convertir el snapshot más reciente a Excel"""
     try:
         # Buscar el snapshot más reciente
-        snapshots = sorted(ConfigAudit.SNAPSHOTS_DIR.glob("*.json"), reverse=True)
+        snapshots = ConfigAudit.list_snapshot_files()
         
         if not snapshots:
             print("❌ No se encontraron snapshots")
             return
         
-        latest_snapshot = snapshots[0]
+        latest_snapshot = snapshots[-1][1]
         print(f"📁 Snapshot más reciente: {latest_snapshot.name}")
         print()
         
@@ -449,9 +378,10 @@ def convert_latest_snapshot():
 def convert_specific_snapshot(date_str):
     """Convertir un snapshot específico por fecha"""
     try:
-        snapshot_file = ConfigAudit.SNAPSHOTS_DIR / f"{date_str}_snapshot.json"
+        snapshot_date = datetime.strptime(date_str, '%Y-%m-%d').date()
+        snapshot_file = ConfigAudit.find_snapshot_file(snapshot_date)
         
-        if not snapshot_file.exists():
+        if snapshot_file is None:
             print(f"❌ No se encontró snapshot para la fecha {date_str}")
             return
         
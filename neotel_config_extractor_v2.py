@@ -4,7 +4,6 @@ Auditor de Configuración Neotel - VERSIÓN COMPLETA
 Extrae DIDs, Extensiones y Colas con configuración detallada
 """
 
-import json
 import logging
 import os
 import sys
@@ -27,6 +26,18 @@ from selenium.webdriver.common.keys import Keys
 # Importar módulos propios
 from config_audit import ConfigAudit
 from email_sender import EmailSender
+from snapshot_format import write_snapshot, open_snapshot
+from diff_engine import SCHEMAS, diff_configs, diff_entity
+from json_backend import canonicalize_config
+from snapshot_retention import SnapshotCompactor
+from normalization import keep_previous_values, normalize_cola, normalize_config, queue_status
+from range_diff import nearest_snapshot, save_delta
+from rename_detector import RenameDetector
+from change_log import append_events
+from crawl_scheduler import CrawlScheduler
+from change_report import render_report
+from report_model import build_report, write_report
+from history_dashboard import HistoryBuilder
 
 try:
     import psutil
@@ -41,6 +52,8 @@ class NeotelConfigExtractor:
         self.logger = self._setup_logging()
         self.driver = None
         self.temp_dir = None
+        self.current_page = None  # Sección abierta (extracción puntual)
+        self.scheduler = None  # Orden y presupuesto del recorrido (CrawlScheduler)
         self.email_sender = EmailSender(ConfigAudit.EMAIL_CONFIG)
         
         ConfigAudit.create_directories()
@@ -52,18 +65,19 @@ class NeotelConfigExtractor:
         self.logger.info("🔍 AUDITOR DE CONFIGURACIÓN NEOTEL - VERSIÓN COMPLETA")
         self.logger.info("=" * 80)
     
-    def select_chosen_option_by_text(self, select_id, option_text):
+    def select_chosen_option_by_text(self, select_id, option_text, timeout=10):
         """
         Seleccionar una opción en un dropdown de Chosen.js por su texto
         
         Args:
             select_id: ID del select original (sin #)
             option_text: Texto de la opción a seleccionar
+            timeout: Espera máxima del contenedor Chosen
         """
         try:
             chosen_container_id = f"{select_id}_chosen"
             
-            wait = WebDriverWait(self.driver, 10)
+            wait = WebDriverWait(self.driver, timeout)
             chosen_container = wait.until(
                 EC.presence_of_element_located((By.ID, chosen_container_id))
             )
@@ -109,15 +123,16 @@ class NeotelConfigExtractor:
             self.logger.error(f"    Error seleccionando opción en Chosen: {str(e)}")
             return False
 
-    def click_view_button(self, button_id):
+    def click_view_button(self, button_id, timeout=10):
         """
         Hacer click en el botón "Ver"
         
         Args:
             button_id: ID del botón (sin #)
+            timeout: Espera máxima hasta que el botón sea clicable
         """
         try:
-            wait = WebDriverWait(self.driver, 10)
+            wait = WebDriverWait(self.driver, timeout)
             button = wait.until(
                 EC.element_to_be_clickable((By.ID, button_id))
             )
@@ -349,6 +364,170 @@ class NeotelConfigExtractor:
         except:
             return False
         
+    def _open_configuration(self, fresh=False):
+        """
+        Abrir el menú de Configuración
+
+        Args:
+            fresh: Recargar antes la página (descarta modales y estado de Chosen)
+        """
+        self.current_page = None
+        if fresh:
+            self.driver.refresh()
+            time.sleep(5)
+        self.click_menu_item("Configuración", wait_time=2)
+
+    def _wait_for_list(self, selector, timeout=None, options=False):
+        """
+        Esperar a que una lista termine de cargar, en lugar de una pausa fija
+
+        La lista está cargada cuando tiene elementos y su número no cambia
+        entre dos sondeos. Si no se estabiliza se sigue igualmente: la espera
+        del elemento que viene después decide si la página cargó.
+
+        Args:
+            selector: Filas de una tabla o, con options, un <select>
+            timeout: Espera máxima
+            options: Contar las opciones del <select> en lugar de elementos
+        """
+        script = ("var select = document.querySelector(arguments[0]); return select ? select.options.length : 0;"
+                  if options else "return document.querySelectorAll(arguments[0]).length;")
+        last_count = [None]
+
+        def loaded(driver):
+            count = driver.execute_script(script, selector)
+            stable = count > 0 and count == last_count[0]
+            last_count[0] = count
+            return stable
+
+        try:
+            WebDriverWait(self.driver, timeout or ConfigAudit.ELEMENT_WAIT_TIMEOUT).until(loaded)
+        except TimeoutException:
+            self.logger.warning(f"⚠️  La lista {selector} no terminó de cargar ({last_count[0]} elementos)")
+
+    def _open_extensions_table(self, fresh=False, timeout=None, settle=None):
+        """
+        Navegar a Extensiones y devolver las filas de la tabla
+
+        Args:
+            fresh: Recargar antes la página
+            timeout: Espera máxima de la tabla
+            settle: Pausa fija en lugar de esperar a que la tabla se estabilice
+        """
+        if fresh:
+            self._open_configuration(fresh=True)
+        else:
+            self.click_menu_item("Configuración", wait_time=2)
+        self.click_menu_item("Extensiones", wait_time=3)
+        
+        # Esperar carga de tabla
+        if settle is None:
+            self._wait_for_list(ConfigAudit.SELECTORES['extensions_table'], timeout)
+        else:
+            time.sleep(settle)
+
+        wait = WebDriverWait(self.driver, timeout or ConfigAudit.ELEMENT_WAIT_TIMEOUT)
+        wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, '.table')))
+        
+        return self.driver.find_elements(By.CSS_SELECTOR, ConfigAudit.SELECTORES['extensions_table'])
+
+    def _parse_extension_row(self, row):
+        """
+        Leer una fila de la tabla de extensiones
+
+        Returns:
+            Diccionario de la extensión o None si la fila no es de datos
+        """
+        cells = row.find_elements(By.TAG_NAME, 'td')
+        
+        if len(cells) < 10:
+            return None
+        
+        extension_code = cells[0].text.strip()
+        name = cells[1].text.strip()
+        group = cells[2].text.strip()
+        agente_asignado = cells[3].text.strip()  # ⭐ NUEVO CAMPO
+        numero_saliente = cells[4].text.strip()
+        
+        # Detectar estado de colas mirando las CLASES CSS de los botones
+        action_cell = cells[9]
+        
+        # Buscar botones por ID
+        reanudar_habilitado = False
+        pausar_habilitado = False
+        
+        try:
+            # Buscar botón de Reanudar
+            reanudar_button = action_cell.find_element(By.ID, f'play_queue_{extension_code}')
+            button_classes = reanudar_button.get_attribute('class')
+            # Habilitado = tiene clase 'btn-success' (verde)
+            reanudar_habilitado = 'btn-success' in button_classes
+        except:
+            pass
+        
+        try:
+            # Buscar botón de Pausar
+            pausar_button = action_cell.find_element(By.ID, f'pause_queue_{extension_code}')
+            button_classes = pausar_button.get_attribute('class')
+            # Habilitado = tiene clase 'btn-danger' (rojo)
+            pausar_habilitado = 'btn-danger' in button_classes
+        except:
+            pass
+        
+        return {
+            'extension': extension_code,
+            'nombre': name,
+            'grupo': group,
+            'agente_asignado': agente_asignado,  # ⭐ NUEVO CAMPO
+            'numero_saliente': numero_saliente,
+            # Determinar estado según combinación de botones
+            'estado_colas': queue_status(reanudar_habilitado, pausar_habilitado)
+        }
+
+    def _extension_table_view(self):
+        """
+        Todas las filas de la tabla de extensiones en una sola llamada
+
+        Mismos campos que _parse_extension_row, leídos en el navegador en
+        lugar de celda a celda.
+
+        Returns:
+            Tupla (extensiones, índices de las filas que no se pudieron
+            clasificar: sin código o sin botones de colas todavía)
+        """
+        table = self.driver.execute_script("""
+            var result = {rows: [], pending: []};
+            var rows = document.querySelectorAll(arguments[0]);
+            for (var i = 0; i < rows.length; i++) {
+                var cells = rows[i].querySelectorAll('td');
+                if (cells.length < 10) { continue; }
+                var values = [];
+                for (var j = 0; j < 5; j++) {
+                    values.push((cells[j].innerText || '').trim());
+                }
+                var play = cells[9].querySelector('[id="play_queue_' + values[0] + '"]');
+                var pause = cells[9].querySelector('[id="pause_queue_' + values[0] + '"]');
+                if (!values[0] || !(play || pause)) {
+                    result.pending.push(i);
+                    continue;
+                }
+                values.push(!!(play && play.classList.contains('btn-success')));
+                values.push(!!(pause && pause.classList.contains('btn-danger')));
+                result.rows.push(values);
+            }
+            return result;
+        """, ConfigAudit.SELECTORES['extensions_table'])
+
+        extensions = [{
+            'extension': code,
+            'nombre': name,
+            'grupo': group,
+            'agente_asignado': agente_asignado,
+            'numero_saliente': numero_saliente,
+            'estado_colas': queue_status(reanudar, pausar)
+        } for code, name, group, agente_asignado, numero_saliente, reanudar, pausar in table['rows']]
+        return extensions, table['pending']
+
     def extract_extensions(self):
         """
         Extraer configuración de extensiones
@@ -356,78 +535,31 @@ class NeotelConfigExtractor:
         """
         try:
             self.logger.info("📞 Extrayendo configuración de extensiones...")
-            
+
             # Navegar con clicks en menú
-            self.click_menu_item("Configuración", wait_time=2)
-            self.click_menu_item("Extensiones", wait_time=3)
-            
-            time.sleep(15)  # Esperar carga de tabla
-            
-            wait = WebDriverWait(self.driver, ConfigAudit.ELEMENT_WAIT_TIMEOUT)
-            wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, '.table')))
-            
-            extensions = []
-            rows = self.driver.find_elements(By.CSS_SELECTOR, ConfigAudit.SELECTORES['extensions_table'])
-            
+            rows = self._open_extensions_table()
+
             self.logger.info(f"📊 Encontradas {len(rows)} extensiones")
-            
-            for idx, row in enumerate(rows):
+
+            # Toda la tabla en una llamada; fila a fila solo lo que no se pudo
+            # clasificar. Comprobación previa: tabla igual que en el snapshot
+            # anterior, no hay más que leer
+            if self.scheduler is not None:
+                extensions, pending = self._extension_table_view()
+                if not pending and self.scheduler.table_unchanged('extensiones', extensions):
+                    self.logger.info(f"✅ Extraídas {len(extensions)} extensiones (tabla sin cambios)")
+                    return extensions
+                if pending:
+                    self.logger.info(f"🔁 {len(pending)} filas sin clasificar, se leen celda a celda")
+            else:
+                extensions, pending = [], range(len(rows))
+
+            for idx in pending:
                 try:
-                    cells = row.find_elements(By.TAG_NAME, 'td')
-                    
-                    if len(cells) < 10:
+                    extension = self._parse_extension_row(rows[idx])
+                    if extension is None:
                         continue
                     
-                    extension_code = cells[0].text.strip()
-                    name = cells[1].text.strip()
-                    group = cells[2].text.strip()
-                    agente_asignado = cells[3].text.strip()  # ⭐ NUEVO CAMPO
-                    numero_saliente = cells[4].text.strip()
-                    
-                    # Detectar estado de colas mirando las CLASES CSS de los botones
-                    action_cell = cells[9]
-                    
-                    # Buscar botones por ID
-                    reanudar_habilitado = False
-                    pausar_habilitado = False
-                    
-                    try:
-                        # Buscar botón de Reanudar
-                        reanudar_button = action_cell.find_element(By.ID, f'play_queue_{extension_code}')
-                        button_classes = reanudar_button.get_attribute('class')
-                        # Habilitado = tiene clase 'btn-success' (verde)
-                        reanudar_habilitado = 'btn-success' in button_classes
-                    except:
-                        pass
-                    
-                    try:
-                        # Buscar botón de Pausar
-                        pausar_button = action_cell.find_element(By.ID, f'pause_queue_{extension_code}')
-                        button_classes = pausar_button.get_attribute('class')
-                        # Habilitado = tiene clase 'btn-danger' (rojo)
-                        pausar_habilitado = 'btn-danger' in button_classes
-                    except:
-                        pass
-                    
-                    # Determinar estado según combinación de botones
-                    if reanudar_habilitado and pausar_habilitado:
-                        queue_status = "mixto"
-                    elif reanudar_habilitado and not pausar_habilitado:
-                        queue_status = "todas_pausadas"
-                    elif not reanudar_habilitado and pausar_habilitado:
-                        queue_status = "todas_activas"
-                    else:
-                        queue_status = "sin_colas"
-                    
-                    extension = {
-                        'extension': extension_code,
-                        'nombre': name,
-                        'grupo': group,
-                        'agente_asignado': agente_asignado,  # ⭐ NUEVO CAMPO
-                        'numero_saliente': numero_saliente,
-                        'estado_colas': queue_status
-                    }
-                    
                     extensions.append(extension)
                     
                     # Log cada 20 extensiones
@@ -445,6 +577,127 @@ class NeotelConfigExtractor:
             self.logger.error(f"❌ Error extrayendo extensiones: {str(e)}")
             raise
 
+    def _select_options(self, select_selector):
+        """Opciones (texto, valor) de un <select>, leídas en una sola llamada"""
+        options = self.driver.execute_script("""
+            var select = document.querySelector(arguments[0]);
+            if (!select) { return []; }
+            var result = [];
+            for (var i = 0; i < select.options.length; i++) {
+                var option = select.options[i];
+                result.push([(option.text || option.textContent).trim(), option.value]);
+            }
+            return result;
+        """, select_selector)
+        return [(text, value) for text, value in options if text and value]
+
+    def _scheduled_options(self, section, select_selector):
+        """
+        Opciones de un desplegable según el plan de la comprobación previa,
+        en el orden del planificador
+
+        Returns:
+            Tupla (opciones a visitar, instante límite o None)
+        """
+        options = self._select_options(select_selector)
+        if self.scheduler is None:
+            return options, None
+        options = self.scheduler.plan(section, options)
+        return options, self.scheduler.section_deadline(section, len(options))
+
+    def _open_dids_select(self, fresh=False, timeout=None):
+        """Navegar a DIDs y devolver el <select> con todos los DIDs"""
+        if fresh:
+            self._open_configuration(fresh=True)
+
+        for did_text in ["DIDs", "DID", "dids"]:
+            if self.click_menu_item(did_text, wait_time=3):
+                self.logger.info(f"✅ Navegación a {did_text}")
+                break
+
+        self._wait_for_list(ConfigAudit.SELECTORES['dids_select'], timeout, options=True)
+
+        wait = WebDriverWait(self.driver, timeout or ConfigAudit.ELEMENT_WAIT_TIMEOUT)
+        
+        self.logger.info(f"🔍 Buscando select: {ConfigAudit.SELECTORES['dids_select']}")
+        
+        try:
+            select_element = wait.until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, ConfigAudit.SELECTORES['dids_select']))
+            )
+            self.logger.info("✅ Select de DIDs encontrado")
+        except TimeoutException:
+            self.logger.error(f"❌ TIMEOUT buscando select de DIDs")
+            self.logger.error(f"   URL actual: {self.driver.current_url}")
+            self.logger.error(f"   Título: {self.driver.title}")
+            raise
+        
+        return Select(select_element)
+
+    def _extract_did_detail(self, did_numero, did_id_interno, timeout=None):
+        """
+        Abrir el detalle de un DID y leer locución y acciones 1–5
+
+        Args:
+            did_numero: Número del DID (texto de la opción)
+            did_id_interno: Valor de la opción
+            timeout: Espera máxima de cada elemento
+
+        Returns:
+            Diccionario del DID o None si no se pudo abrir el detalle
+        """
+        timeout = timeout or ConfigAudit.ELEMENT_WAIT_TIMEOUT
+        wait = WebDriverWait(self.driver, timeout)
+
+        # USAR CHOSEN.JS en lugar de select.select_by_value()
+        if not self.select_chosen_option_by_text('configuration_dids_view_did_list_dids', did_numero, timeout):
+            self.logger.warning(f"  ⚠️  No se pudo seleccionar DID {did_numero}")
+            return None
+        
+        # HACER CLICK EN BOTÓN "VER"
+        if not self.click_view_button('configuration_dids_view_did_list_button_view', timeout):
+            self.logger.warning(f"  ⚠️  No se pudo hacer click en botón Ver para DID {did_numero}")
+            return None
+
+        # Esperar a que cargue el panel de detalle
+        wait.until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, ConfigAudit.SELECTORES['did_detail_panel']))
+        )
+
+        def safe_get_text(selector, field_name="campo"):
+            try:
+                el = self.driver.find_element(By.CSS_SELECTOR, selector)
+                text = el.text.strip()
+                if not text:
+                    try:
+                        text = el.find_element(By.TAG_NAME, 'i').text.strip()
+                    except:
+                        pass
+                return text if text else "N/D"
+            except:
+                return "N/D"
+
+        # Extraer campos del panel de detalle
+        did = {
+            'numero': did_numero,
+            'id_interno': did_id_interno,
+            'locucion': safe_get_text(ConfigAudit.SELECTORES['did_locucion'], 'Locución'),
+            'accion1': safe_get_text(ConfigAudit.SELECTORES['did_accion1'], 'Acción 1'),
+            'accion2': safe_get_text(ConfigAudit.SELECTORES['did_accion2'], 'Acción 2'),
+            'accion3': safe_get_text(ConfigAudit.SELECTORES['did_accion3'], 'Acción 3'),
+            'accion4': safe_get_text(ConfigAudit.SELECTORES['did_accion4'], 'Acción 4'),
+            'accion5': safe_get_text(ConfigAudit.SELECTORES['did_accion5'], 'Acción 5'),
+        }
+        
+        # Cerrar modal con ESC
+        try:
+            self.driver.find_element(By.TAG_NAME, 'body').send_keys(Keys.ESCAPE)
+            time.sleep(1)
+        except:
+            pass
+
+        return did
+
     def extract_dids(self):
         """
         Extraer configuración completa de DIDs
@@ -454,101 +707,28 @@ class NeotelConfigExtractor:
             self.logger.info("📱 Extrayendo configuración detallada de DIDs...")
 
             # Navegar a sección de DIDs
-            for did_text in ["DIDs", "DID", "dids"]:
-                if self.click_menu_item(did_text, wait_time=3):
-                    self.logger.info(f"✅ Navegación a {did_text}")
-                    break
-
-            time.sleep(10)
+            self._open_dids_select()
+            options, deadline = self._scheduled_options('dids', ConfigAudit.SELECTORES['dids_select'])
 
             dids = []
 
-            wait = WebDriverWait(self.driver, ConfigAudit.ELEMENT_WAIT_TIMEOUT)
-            
-            self.logger.info(f"🔍 Buscando select: {ConfigAudit.SELECTORES['dids_select']}")
-            
-            try:
-                select_element = wait.until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, ConfigAudit.SELECTORES['dids_select']))
-                )
-                self.logger.info("✅ Select de DIDs encontrado")
-            except TimeoutException:
-                self.logger.error(f"❌ TIMEOUT buscando select de DIDs")
-                self.logger.error(f"   URL actual: {self.driver.current_url}")
-                self.logger.error(f"   Título: {self.driver.title}")
-                raise
-            
-            select = Select(select_element)
-            options = select.options
-
-            self.logger.info(f"📊 Encontrados {len(options)} DIDs en el selector")
-
-            for idx, option in enumerate(options):
-                try:
-                    did_numero = option.text.strip() or option.get_attribute('textContent').strip()
-                    did_id_interno = option.get_attribute('value')
+            self.logger.info(f"📊 {len(options)} DIDs a visitar")
 
-                    if not did_numero or not did_id_interno:
-                        continue
+            for idx, (did_numero, did_id_interno) in enumerate(options):
+                # Presupuesto agotado: el resto se arrastra del snapshot anterior
+                if deadline and time.time() >= deadline:
+                    self.scheduler.mark_unvisited('dids', [numero for numero, _ in options[idx:]])
+                    break
 
-                    # USAR CHOSEN.JS en lugar de select.select_by_value()
-                    if not self.select_chosen_option_by_text('configuration_dids_view_did_list_dids', did_numero):
-                        self.logger.warning(f"  ⚠️  No se pudo seleccionar DID {did_numero}")
-                        continue
-                    
-                    # HACER CLICK EN BOTÓN "VER"
-                    if not self.click_view_button('configuration_dids_view_did_list_button_view'):
-                        self.logger.warning(f"  ⚠️  No se pudo hacer click en botón Ver para DID {did_numero}")
+                try:
+                    did = self._extract_did_detail(did_numero, did_id_interno)
+                    if did is None:
                         continue
-
-                    # Esperar a que cargue el panel de detalle
-                    wait.until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, ConfigAudit.SELECTORES['did_detail_panel']))
-                    )
-
-                    def safe_get_text(selector, field_name="campo"):
-                        try:
-                            el = self.driver.find_element(By.CSS_SELECTOR, selector)
-                            text = el.text.strip()
-                            if not text:
-                                try:
-                                    text = el.find_element(By.TAG_NAME, 'i').text.strip()
-                                except:
-                                    pass
-                            return text if text else "N/D"
-                        except:
-                            return "N/D"
-
-                    # Extraer campos del panel de detalle
-                    locucion = safe_get_text(ConfigAudit.SELECTORES['did_locucion'], 'Locución')
-                    accion1 = safe_get_text(ConfigAudit.SELECTORES['did_accion1'], 'Acción 1')
-                    accion2 = safe_get_text(ConfigAudit.SELECTORES['did_accion2'], 'Acción 2')
-                    accion3 = safe_get_text(ConfigAudit.SELECTORES['did_accion3'], 'Acción 3')
-                    accion4 = safe_get_text(ConfigAudit.SELECTORES['did_accion4'], 'Acción 4')
-                    accion5 = safe_get_text(ConfigAudit.SELECTORES['did_accion5'], 'Acción 5')
-
-                    did = {
-                        'numero': did_numero,
-                        'id_interno': did_id_interno,
-                        'locucion': locucion,
-                        'accion1': accion1,
-                        'accion2': accion2,
-                        'accion3': accion3,
-                        'accion4': accion4,
-                        'accion5': accion5,
-                    }
                     dids.append(did)
 
                     # Log cada 20 DIDs
                     if (idx + 1) % 20 == 0:
                         self.logger.info(f"  Procesados {idx + 1}/{len(options)} DIDs...")
-                    
-                    # Cerrar modal con ESC
-                    try:
-                        self.driver.find_element(By.TAG_NAME, 'body').send_keys(Keys.ESCAPE)
-                        time.sleep(1)
-                    except:
-                        pass
 
                 except Exception as e:
                     self.logger.warning(f"⚠️  Error procesando DID en índice {idx + 1}: {str(e)}")
@@ -569,122 +749,149 @@ class NeotelConfigExtractor:
             self.logger.error(f"Traceback completo:\n{traceback.format_exc()}")
             raise
 
-    def extract_colas(self):
-        """
-        Extraer configuración completa de colas y miembros
-        Incluye número de extensión y estado (activo/pausado)
-        """
-        try:
-            self.logger.info("📋 Extrayendo configuración detallada de colas...")
+    def _open_colas_select(self, fresh=False, timeout=None):
+        """Navegar a Colas y devolver el <select> con todas las colas"""
+        if fresh:
+            self._open_configuration(fresh=True)
 
-            # Navegar a sección de Colas
-            for cola_text in ["Colas", "Cola"]:
-                if self.click_menu_item(cola_text, wait_time=3):
-                    self.logger.info(f"✅ Navegación a {cola_text}")
-                    break
+        for cola_text in ["Colas", "Cola"]:
+            if self.click_menu_item(cola_text, wait_time=3):
+                self.logger.info(f"✅ Navegación a {cola_text}")
+                break
 
-            time.sleep(10)
+        self._wait_for_list(ConfigAudit.SELECTORES['colas_select'], timeout, options=True)
 
-            colas = []
+        wait = WebDriverWait(self.driver, timeout or ConfigAudit.ELEMENT_WAIT_TIMEOUT)
+        
+        select_element = wait.until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, ConfigAudit.SELECTORES['colas_select']))
+        )
+        self.logger.info("✅ Select de Colas encontrado")
+        
+        return Select(select_element)
 
-            wait = WebDriverWait(self.driver, ConfigAudit.ELEMENT_WAIT_TIMEOUT)
-            
-            select_element = wait.until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, ConfigAudit.SELECTORES['colas_select']))
-            )
-            self.logger.info("✅ Select de Colas encontrado")
-            
-            select = Select(select_element)
-            options = select.options
+    def _extract_cola_detail(self, cola_nombre, cola_id_interno, timeout=None):
+        """
+        Abrir el detalle de una cola y leer sus miembros
 
-            self.logger.info(f"📊 Encontradas {len(options)} colas en el selector")
+        Args:
+            cola_nombre: Nombre de la cola (texto de la opción)
+            cola_id_interno: Valor de la opción
+            timeout: Espera máxima de cada elemento
 
-            for idx, option in enumerate(options):
-                try:
-                    cola_nombre = option.text.strip() or option.get_attribute('textContent').strip()
-                    cola_id_interno = option.get_attribute('value')
+        Returns:
+            Cola normalizada o None si no se pudo abrir el detalle
+        """
+        timeout = timeout or ConfigAudit.ELEMENT_WAIT_TIMEOUT
+        wait = WebDriverWait(self.driver, timeout)
 
-                    if not cola_nombre or not cola_id_interno:
-                        continue
+        # Asegurar que no hay modales abiertos
+        try:
+            self.driver.find_element(By.TAG_NAME, 'body').send_keys(Keys.ESCAPE)
+            time.sleep(0.5)
+        except:
+            pass
+        
+        # Scroll hacia arriba
+        self.driver.execute_script("window.scrollTo(0, 0);")
+        time.sleep(0.5)
 
-                    # Asegurar que no hay modales abiertos
-                    try:
-                        self.driver.find_element(By.TAG_NAME, 'body').send_keys(Keys.ESCAPE)
-                        time.sleep(0.5)
-                    except:
-                        pass
-                    
-                    # Scroll hacia arriba
-                    self.driver.execute_script("window.scrollTo(0, 0);")
-                    time.sleep(0.5)
+        # USAR CHOSEN.JS para seleccionar
+        if not self.select_chosen_option_by_text('configuration_queues_view_queue_list_queues', cola_nombre, timeout):
+            self.logger.warning(f"  ⚠️  No se pudo seleccionar cola {cola_nombre}")
+            return None
+        
+        # HACER CLICK EN BOTÓN "VER"
+        if not self.click_view_button('configuration_queues_view_queue_list_button_view', timeout):
+            self.logger.warning(f"  ⚠️  No se pudo hacer click en botón Ver para cola {cola_nombre}")
+            return None
+        
+        time.sleep(2)
 
-                    # USAR CHOSEN.JS para seleccionar
-                    if not self.select_chosen_option_by_text('configuration_queues_view_queue_list_queues', cola_nombre):
-                        self.logger.warning(f"  ⚠️  No se pudo seleccionar cola {cola_nombre}")
-                        continue
-                    
-                    # HACER CLICK EN BOTÓN "VER"
-                    if not self.click_view_button('configuration_queues_view_queue_list_button_view'):
-                        self.logger.warning(f"  ⚠️  No se pudo hacer click en botón Ver para cola {cola_nombre}")
-                        continue
-                    
-                    time.sleep(2)
+        # Esperar el detalle
+        wait.until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, ConfigAudit.SELECTORES['colas_detalle']))
+        )
 
-                    # Esperar el detalle
-                    wait.until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, ConfigAudit.SELECTORES['colas_detalle']))
-                    )
+        # Buscar miembros
+        miembros = []
+        try:
+            miembros_container = self.driver.find_element(By.CSS_SELECTOR, ConfigAudit.SELECTORES['colas_miembros'])
+            miembros_divs = miembros_container.find_elements(By.CSS_SELECTOR, 'div[data-extension]')
 
-                    # Buscar miembros
-                    miembros = []
+            for div in miembros_divs:
+                try:
+                    ext = div.get_attribute('data-extension')
+                    texto = div.text.strip()
+
+                    estado = "desconocido"
                     try:
-                        miembros_container = self.driver.find_element(By.CSS_SELECTOR, ConfigAudit.SELECTORES['colas_miembros'])
-                        miembros_divs = miembros_container.find_elements(By.CSS_SELECTOR, 'div[data-extension]')
-
-                        for div in miembros_divs:
-                            try:
-                                ext = div.get_attribute('data-extension')
-                                texto = div.text.strip()
-
-                                estado = "desconocido"
-                                try:
-                                    svg = div.find_element(By.TAG_NAME, 'svg')
-                                    svg_class = svg.get_attribute('class')
-                                    if 'fa-play' in svg_class:
-                                        estado = "activo"
-                                    elif 'fa-pause' in svg_class:
-                                        estado = "pausado"
-                                except:
-                                    pass
-
-                                miembros.append({
-                                    'extension': ext,
-                                    'texto': texto,
-                                    'estado': estado
-                                })
-                            except:
-                                continue
+                        svg = div.find_element(By.TAG_NAME, 'svg')
+                        svg_class = svg.get_attribute('class')
+                        if 'fa-play' in svg_class:
+                            estado = "activo"
+                        elif 'fa-pause' in svg_class:
+                            estado = "pausado"
                     except:
                         pass
 
-                    colas.append({
-                        'nombre': cola_nombre,
-                        'id_interno': cola_id_interno,
-                        'miembros': miembros
+                    miembros.append({
+                        'extension': ext,
+                        'texto': texto,
+                        'estado': estado
                     })
+                except:
+                    continue
+        except:
+            pass
+
+        # Cerrar modal con ESC
+        try:
+            self.driver.find_element(By.TAG_NAME, 'body').send_keys(Keys.ESCAPE)
+            time.sleep(1)
+            self.driver.find_element(By.TAG_NAME, 'body').send_keys(Keys.ESCAPE)
+            time.sleep(0.5)
+        except:
+            pass
+
+        # Miembros canónicos; los contadores Est/Pen/Pri van aparte
+        return normalize_cola({
+            'nombre': cola_nombre,
+            'id_interno': cola_id_interno,
+            'miembros': miembros
+        })
+
+    def extract_colas(self):
+        """
+        Extraer configuración completa de colas y miembros
+        Incluye número de extensión y estado (activo/pausado)
+        """
+        try:
+            self.logger.info("📋 Extrayendo configuración detallada de colas...")
+
+            # Navegar a sección de Colas
+            self._open_colas_select()
+            options, deadline = self._scheduled_options('colas', ConfigAudit.SELECTORES['colas_select'])
+
+            colas = []
+
+            self.logger.info(f"📊 {len(options)} colas a visitar")
+
+            for idx, (cola_nombre, cola_id_interno) in enumerate(options):
+                # Presupuesto agotado: el resto se arrastra del snapshot anterior
+                if deadline and time.time() >= deadline:
+                    self.scheduler.mark_unvisited('colas', [nombre for nombre, _ in options[idx:]])
+                    break
+
+                try:
+                    cola = self._extract_cola_detail(cola_nombre, cola_id_interno)
+                    if cola is None:
+                        continue
+                    colas.append(cola)
 
                     # Log cada 10 colas
                     if (idx + 1) % 10 == 0:
                         self.logger.info(f"  Procesadas {idx + 1}/{len(options)} colas...")
-                    
-                    # Cerrar modal con ESC
-                    try:
-                        self.driver.find_element(By.TAG_NAME, 'body').send_keys(Keys.ESCAPE)
-                        time.sleep(1)
-                        self.driver.find_element(By.TAG_NAME, 'body').send_keys(Keys.ESCAPE)
-                        time.sleep(0.5)
-                    except:
-                        pass
 
                 except Exception as e:
                     self.logger.warning(f"⚠️  Error procesando cola en índice {idx + 1}: {str(e)}")
@@ -704,19 +911,301 @@ class NeotelConfigExtractor:
             self.logger.error(f"❌ Error extrayendo colas: {str(e)}")
             raise
 
-    def save_snapshot(self, config_data, date=None):
-        """Guardar snapshot de configuración"""
-        try:
-            snapshot_file = ConfigAudit.get_snapshot_filename(date)
+    # === EXTRACCIÓN PUNTUAL (una entidad, sesión reutilizada) ===
+    
+    def _ensure_session(self):
+        """Abrir navegador e iniciar sesión solo si no hay sesión abierta"""
+        if self.driver is None:
+            self.setup_driver()
+            self.login_to_neotel()
+            self.current_page = None
+    
+    def _goto_section(self, section):
+        """Navegar a una sección salvo que ya esté abierta en esta sesión"""
+        self._ensure_session()
+        if self.current_page == section:
+            return
+        
+        self.current_page = None
+        if section == 'extensiones':
+            self._open_extensions_table()
+        else:
+            self._open_configuration()
+            if section == 'dids':
+                self._open_dids_select()
+            else:
+                self._open_colas_select()
+        self.current_page = section
+    
+    def _option_value(self, select_selector, text):
+        """Valor de la opción de un <select> con un texto dado (None si no existe)"""
+        return self.driver.execute_script("""
+            var select = document.querySelector(arguments[0]);
+            if (!select) { return null; }
+            for (var i = 0; i < select.options.length; i++) {
+                if (select.options[i].textContent.trim() === arguments[1]) {
+                    return select.options[i].value;
+                }
+            }
+            return null;
+        """, select_selector, text)
+    
+    def extract_did(self, numero):
+        """
+        Extraer un único DID
+        
+        Args:
+            numero: Número del DID
+            
+        Returns:
+            Diccionario del DID o None si no existe en Neotel
+        """
+        self._goto_section('dids')
+        id_interno = self._option_value(ConfigAudit.SELECTORES['dids_select'], numero)
+        if id_interno is None:
+            return None
+        
+        did = self._extract_did_detail(numero, id_interno)
+        if did is None:
+            raise Exception(f"No se pudo abrir el detalle del DID {numero}")
+        return normalize_config({'dids': [did]})[0]['dids'][0]
+    
+    def extract_cola(self, nombre):
+        """
+        Extraer una única cola con sus miembros
+        
+        Args:
+            nombre: Nombre de la cola
             
-            snapshot = {
-                'timestamp': datetime.now().isoformat(),
-                'date': (date or datetime.now().date()).isoformat(),
-                'config': config_data
+        Returns:
+            Diccionario de la cola o None si no existe en Neotel
+        """
+        self._goto_section('colas')
+        id_interno = self._option_value(ConfigAudit.SELECTORES['colas_select'], nombre)
+        if id_interno is None:
+            return None
+        
+        cola = self._extract_cola_detail(nombre, id_interno)
+        if cola is None:
+            raise Exception(f"No se pudo abrir el detalle de la cola {nombre}")
+        return canonicalize_config(normalize_config({'colas': [cola]})[0])['colas'][0]
+    
+    def extract_extension(self, code):
+        """
+        Extraer una única extensión de la tabla
+        
+        Args:
+            code: Código de la extensión
+            
+        Returns:
+            Diccionario de la extensión o None si no existe en Neotel
+        """
+        self._goto_section('extensiones')
+        # Localizar la fila directamente en el navegador, sin recorrer la tabla
+        row = self.driver.execute_script("""
+            var rows = document.querySelectorAll(arguments[0]);
+            for (var i = 0; i < rows.length; i++) {
+                var cell = rows[i].querySelector('td');
+                if (cell && cell.textContent.trim() === arguments[1]) {
+                    return rows[i];
+                }
             }
+            return null;
+        """, ConfigAudit.SELECTORES['extensions_table'], code)
+        if row is None:
+            return None
+        
+        extension = self._parse_extension_row(row)
+        return normalize_config({'extensiones': [extension]})[0]['extensiones'][0] if extension else None
+    
+    def read_queue_states(self, settle=None):
+        """
+        Leer el estado de colas de todas las extensiones en una sola llamada
+
+        Solo recarga la tabla de extensiones (la página más barata) y
+        clasifica los botones Reanudar/Pausar de cada fila en el navegador.
+
+        Returns:
+            Diccionario código de extensión -> estado_colas
+        """
+        self._ensure_session()
+        self.current_page = None
+        self._open_extensions_table(settle=ConfigAudit.WATCH_SETTLE_SECONDS if settle is None else settle)
+        self.current_page = 'extensiones'
+
+        rows = self.driver.execute_script("""
+            var result = [];
+            var rows = document.querySelectorAll(arguments[0]);
+            for (var i = 0; i < rows.length; i++) {
+                var cells = rows[i].querySelectorAll('td');
+                if (cells.length < 10) { continue; }
+                var code = cells[0].textContent.trim();
+                var play = rows[i].querySelector('[id="play_queue_' + code + '"]');
+                var pause = rows[i].querySelector('[id="pause_queue_' + code + '"]');
+                result.push([
+                    code,
+                    !!(play && play.classList.contains('btn-success')),
+                    !!(pause && pause.classList.contains('btn-danger'))
+                ]);
+            }
+            return result;
+        """, ConfigAudit.SELECTORES['extensions_table'])
+
+        return {code: queue_status(reanudar, pausar) for code, reanudar, pausar in rows if code}
+
+    def _refetch_entities(self, section, keys, timeout):
+        """
+        Volver a leer entidades concretas desde una página recién cargada
+
+        Returns:
+            Diccionario clave -> (estado, entidad). Estados: 'ok' (releída),
+            'ausente' (ya no aparece en la lista), 'error' (aparece pero no se
+            pudo leer)
+        """
+        results = {}
+
+        if section == 'extensiones':
+            rows = self._open_extensions_table(fresh=True, timeout=timeout)
+            pending = set(keys)
+            for row in rows:
+                try:
+                    extension = self._parse_extension_row(row)
+                except Exception:
+                    continue
+                if extension and extension['extension'] in pending:
+                    results[extension['extension']] = ('ok', extension)
+                    pending.discard(extension['extension'])
+            for key in pending:
+                results[key] = ('ausente', None)
+            return results
+
+        if section == 'dids':
+            select = self._open_dids_select(fresh=True, timeout=timeout)
+            extract_detail = self._extract_did_detail
+        else:
+            select = self._open_colas_select(fresh=True, timeout=timeout)
+            extract_detail = self._extract_cola_detail
+
+        options = {}
+        for option in select.options:
+            text = option.text.strip() or option.get_attribute('textContent').strip()
+            if text:
+                options[text] = option.get_attribute('value')
+
+        for key in keys:
+            if key not in options:
+                results[key] = ('ausente', None)
+                continue
+            try:
+                entity = extract_detail(key, options[key], timeout)
+                results[key] = ('ok', entity) if entity else ('error', None)
+            except Exception as e:
+                self.logger.warning(f"  ⚠️  Error releyendo {key}: {str(e)}")
+                try:
+                    self.driver.find_element(By.TAG_NAME, 'body').send_keys(Keys.ESCAPE)
+                    time.sleep(0.5)
+                except:
+                    pass
+                results[key] = ('error', None)
+
+        return results
+
+    def verify_changes(self, changes, current_config):
+        """
+        Segunda pasada sobre las entidades eliminadas o modificadas
+
+        Las entidades marcadas se vuelven a extraer desde una página recién
+        cargada y con esperas más largas. Una eliminación se confirma solo si
+        la entidad ya no aparece en la lista; si aparece, se retracta (con
+        los datos releídos o, si no se pudieron leer, los anteriores). Una
+        modificación se sustituye por la lectura nueva, que la confirma o la
+        retracta.
+
+        Args:
+            changes: Resultado de compare_configs
+            current_config: Configuración extraída en la primera pasada
+
+        Returns:
+            Tupla (configuración corregida, resumen por resultado)
+        """
+        timeout = ConfigAudit.VERIFY_TIMEOUT
+        budget = ConfigAudit.VERIFY_MAX_ENTITIES
+        summary = {'confirmados': 0, 'retractados': 0, 'no_verificados': 0}
+        corrected = dict(current_config)
+
+        for schema in SCHEMAS:
+            _, removed_key, modified_key = schema.change_keys
+            # Eliminaciones primero: son las falsas alarmas más costosas
+            flagged = [(entity[schema.key], entity, True) for entity in changes.get(removed_key, [])]
+            flagged += [(entry[schema.key], entry['anterior'], False) for entry in changes.get(modified_key, [])]
+            if not flagged:
+                continue
+
+            if len(flagged) > budget:
+                self.logger.warning(f"⚠️  {schema.title}: {len(flagged) - budget} cambios quedan sin verificar "
+                                    f"(máximo {ConfigAudit.VERIFY_MAX_ENTITIES} por auditoría)")
+                summary['no_verificados'] += len(flagged) - budget
+                flagged = flagged[:budget]
+            if not flagged:
+                continue
+            budget -= len(flagged)
+
+            self.logger.info(f"🔁 Verificando {len(flagged)} cambios en {schema.title}...")
+            try:
+                results = self._refetch_entities(schema.name, [key for key, _, _ in flagged], timeout)
+            except Exception as e:
+                self.logger.warning(f"⚠️  No se pudo verificar {schema.title}: {str(e)}")
+                summary['no_verificados'] += len(flagged)
+                continue
+
+            entities = {entity[schema.key]: entity for entity in corrected.get(schema.name, [])}
+            for key, previous, removed in flagged:
+                status, entity = results.get(key, ('error', None))
+
+                if status == 'ausente':
+                    if removed:
+                        summary['confirmados'] += 1
+                    else:
+                        summary['no_verificados'] += 1
+                    continue
+
+                if status == 'error':
+                    if removed:
+                        # Sigue en la lista: no es una eliminación
+                        entities[key] = previous
+                        summary['retractados'] += 1
+                        self.logger.info(f"  ↩️  {key}: sigue existiendo (se conserva la versión anterior)")
+                    else:
+                        summary['no_verificados'] += 1
+                    continue
+
+                entities[key] = entity
+                if removed or diff_entity(schema, previous, entity) is None:
+                    summary['retractados'] += 1
+                    self.logger.info(f"  ↩️  {key}: cambio retractado tras releer")
+                else:
+                    summary['confirmados'] += 1
+
+            corrected[schema.name] = list(entities.values())
+
+        corrected, _ = normalize_config(corrected)
+        corrected = canonicalize_config(corrected)
+
+        self.logger.info(f"✅ Verificación: {summary['confirmados']} confirmados, "
+                         f"{summary['retractados']} retractados, {summary['no_verificados']} sin verificar")
+        return corrected, summary
+
+    def save_snapshot(self, config_data, date=None):
+        """Guardar snapshot de configuración (formato contenedor por secciones)"""
+        try:
+            snapshot_file = ConfigAudit.get_snapshot_container_filename(date)
             
-            with open(snapshot_file, 'w', encoding='utf-8') as f:
-                json.dump(snapshot, f, indent=2, ensure_ascii=False)
+            write_snapshot(
+                snapshot_file,
+                config_data,
+                timestamp=datetime.now().isoformat(),
+                date_str=(date or datetime.now().date()).isoformat()
+            )
             
             self.logger.info(f"💾 Snapshot guardado: {snapshot_file}")
             return snapshot_file
@@ -726,24 +1215,32 @@ class NeotelConfigExtractor:
             raise
     
     def load_snapshot(self, date):
-        """Cargar snapshot de una fecha específica"""
+        """
+        Cargar snapshot de una fecha específica
+        
+        Devuelve un mapping perezoso: cada sección (extensiones, dids, colas)
+        solo se decodifica cuando se accede a ella.
+        """
         try:
-            snapshot_file = ConfigAudit.get_snapshot_filename(date)
+            snapshot_file = ConfigAudit.find_snapshot_file(date)
             
-            if not snapshot_file.exists():
+            if snapshot_file is None:
                 return None
             
-            with open(snapshot_file, 'r', encoding='utf-8') as f:
-                snapshot = json.load(f)
-            
-            return snapshot.get('config')
+            return open_snapshot(snapshot_file).config
             
         except Exception as e:
             self.logger.warning(f"⚠️  Error cargando snapshot de {date}: {str(e)}")
             return None
     
     def compare_configs(self, current_config, previous_config):
-        """Comparar dos configuraciones y detectar cambios"""
+        """
+        Comparar dos configuraciones y detectar cambios
+        
+        La comparación la realiza el motor declarativo (diff_engine): el
+        resultado incluye el detalle por campo y por miembro de cada entidad
+        modificada, que el reporte y el email consumen directamente.
+        """
         if previous_config is None:
             self.logger.info("ℹ️  No hay configuración anterior para comparar")
             return {
@@ -754,545 +1251,61 @@ class NeotelConfigExtractor:
         
         self.logger.info("🔍 Comparando configuraciones...")
         
-        changes = {
-            'has_changes': False,
-            'is_first_run': False,
-            'dids_added': [],
-            'dids_removed': [],
-            'dids_modified': [],
-            'extensions_added': [],
-            'extensions_removed': [],
-            'extensions_modified': [],
-            'colas_added': [],
-            'colas_removed': [],
-            'colas_modified': []
-        }
-        
-        # Comparar DIDs
-        current_dids = {d['numero']: d for d in current_config.get('dids', [])}
-        previous_dids = {d['numero']: d for d in previous_config.get('dids', [])}
-        
-        for did_num, did_data in current_dids.items():
-            if did_num not in previous_dids:
-                changes['dids_added'].append(did_data)
-            elif did_data != previous_dids[did_num]:
-                changes['dids_modified'].append({
-                    'numero': did_num,
-                    'anterior': previous_dids[did_num],
-                    'actual': did_data
-                })
-        
-        for did_num in previous_dids:
-            if did_num not in current_dids:
-                changes['dids_removed'].append(previous_dids[did_num])
-        
-        # Comparar Extensiones
-        current_exts = {e['extension']: e for e in current_config.get('extensiones', [])}
-        previous_exts = {e['extension']: e for e in previous_config.get('extensiones', [])}
+        changes = diff_configs(current_config, previous_config)
         
-        for ext_num, ext_data in current_exts.items():
-            if ext_num not in previous_exts:
-                changes['extensions_added'].append(ext_data)
-            elif ext_data != previous_exts[ext_num]:
-                changes['extensions_modified'].append({
-                    'extension': ext_num,
-                    'anterior': previous_exts[ext_num],
-                    'actual': ext_data
-                })
+        # Emparejar eliminadas/añadidas que en realidad son renombrados
+        if ConfigAudit.RENAME_DETECTION and changes['has_changes']:
+            changes = RenameDetector().detect(changes)
         
-        for ext_num in previous_exts:
-            if ext_num not in current_exts:
-                changes['extensions_removed'].append(previous_exts[ext_num])
-        
-        # Comparar Colas
-        current_colas = {c['nombre']: c for c in current_config.get('colas', [])}
-        previous_colas = {c['nombre']: c for c in previous_config.get('colas', [])}
-        
-        for cola_name, cola_data in current_colas.items():
-            if cola_name not in previous_colas:
-                changes['colas_added'].append(cola_data)
-            elif cola_data != previous_colas[cola_name]:
-                changes['colas_modified'].append({
-                    'nombre': cola_name,
-                    'anterior': previous_colas[cola_name],
-                    'actual': cola_data
-                })
-        
-        for cola_name in previous_colas:
-            if cola_name not in current_colas:
-                changes['colas_removed'].append(previous_colas[cola_name])
-        
-        # Determinar si hay cambios
-        changes['has_changes'] = any([
-            changes['dids_added'],
-            changes['dids_removed'],
-            changes['dids_modified'],
-            changes['extensions_added'],
-            changes['extensions_removed'],
-            changes['extensions_modified'],
-            changes['colas_added'],
-            changes['colas_removed'],
-            changes['colas_modified']
-        ])
+        for rule, count in sorted(changes.get('suprimidos', {}).items()):
+            self.logger.info(f"🔇 Regla '{rule}': {count} cambios suprimidos")
         
         if changes['has_changes']:
-            total = sum([
-                len(changes['dids_added']),
-                len(changes['dids_removed']),
-                len(changes['dids_modified']),
-                len(changes['extensions_added']),
-                len(changes['extensions_removed']),
-                len(changes['extensions_modified']),
-                len(changes['colas_added']),
-                len(changes['colas_removed']),
-                len(changes['colas_modified'])
-            ])
-            self.logger.info(f"⚠️  CAMBIOS DETECTADOS: {total} modificaciones")
+            self.logger.info(f"⚠️  CAMBIOS DETECTADOS: {changes['totales']['total']} modificaciones")
         else:
             self.logger.info("✅ No se detectaron cambios")
         
         return changes
     
-    def generate_html_report(self, changes, report_date):
-        """Generar reporte HTML profesional con cambios"""
-        try:
-            report_file = ConfigAudit.get_report_filename(report_date)
-            
-            # Calcular totales
-            total_changes = sum([
-                len(changes.get('dids_added', [])),
-                len(changes.get('dids_removed', [])),
-                len(changes.get('dids_modified', [])),
-                len(changes.get('extensions_added', [])),
-                len(changes.get('extensions_removed', [])),
-                len(changes.get('extensions_modified', [])),
-                len(changes.get('colas_added', [])),
-                len(changes.get('colas_removed', [])),
-                len(changes.get('colas_modified', []))
-            ])
-            
-            html = f"""<!DOCTYPE html>
-    <html lang="es">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>Reporte de Cambios - Neotel</title>
-        <style>
-            * {{
-                margin: 0;
-                padding: 0;
-                box-sizing: border-box;
-            }}
-            
-            :root {{
-                --primary: #2c3e50;
-                --accent: #3498db;
-                --success: #27ae60;
-                --warning: #f39c12;
-                --danger: #e74c3c;
-                --background: #f8f9fa;
-                --surface: #ffffff;
-                --border: #dee2e6;
-                --text-primary: #2c3e50;
-                --text-secondary: #7f8c8d;
-            }}
-            
-            body {{
-                font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, Cantarell, sans-serif;
-                background: var(--background);
-                padding: 20px;
-                color: var(--text-primary);
-            }}
-            
-            .container {{
-                max-width: 1200px;
-                margin: 0 auto;
-                background: var(--surface);
-                border-radius: 8px;
-                box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-                overflow: hidden;
-            }}
-            
-            /* Header */
-            .header {{
-                background: var(--primary);
-                color: white;
-                padding: 30px 40px;
-                border-bottom: 3px solid var(--accent);
-            }}
-            
-            .header h1 {{
-                font-size: 24px;
-                font-weight: 600;
-                margin-bottom: 8px;
-            }}
-            
-            .header .date {{
-                font-size: 14px;
-                opacity: 0.9;
-            }}
-            
-            /* Summary Box */
-            .summary {{
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                color: white;
-                padding: 30px 40px;
-                display: grid;
-                grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-                gap: 20px;
-            }}
-            
-            .summary-card {{
-                text-align: center;
-            }}
-            
-            .summary-card .number {{
-                font-size: 36px;
-                font-weight: bold;
-                margin-bottom: 5px;
-            }}
-            
-            .summary-card .label {{
-                font-size: 12px;
-                text-transform: uppercase;
-                opacity: 0.9;
-                letter-spacing: 0.5px;
-            }}
-            
-            /* Tabs */
-            .tabs {{
-                display: flex;
-                background: var(--surface);
-                border-bottom: 1px solid var(--border);
-                padding: 0 40px;
-                gap: 8px;
-                overflow-x: auto;
-            }}
-            
-            .tab {{
-                padding: 14px 20px;
-                background: transparent;
-                border: none;
-                color: var(--text-secondary);
-                cursor: pointer;
-                font-size: 14px;
-                font-weight: 500;
-                transition: all 0.2s ease;
-                border-bottom: 2px solid transparent;
-                white-space: nowrap;
-            }}
-            
-            .tab:hover {{
-                color: var(--primary);
-                background: rgba(52, 73, 94, 0.04);
-            }}
-            
-            .tab.active {{
-                color: var(--primary);
-                border-bottom-color: var(--accent);
-            }}
-            
-            /* Content */
-            .content {{
-                padding: 40px;
-            }}
-            
-            .tab-content {{
-                display: none;
-            }}
-            
-            .tab-content.active {{
-                display: block;
-                animation: fadeIn 0.2s ease;
-            }}
-            
-            @keyframes fadeIn {{
-                from {{ opacity: 0; transform: translateY(4px); }}
-                to {{ opacity: 1; transform: translateY(0); }}
-            }}
-            
-            /* Change Sections */
-            .change-section {{
-                margin-bottom: 30px;
-            }}
-            
-            .change-section h3 {{
-                font-size: 16px;
-                font-weight: 600;
-                color: var(--text-primary);
-                margin-bottom: 15px;
-                padding-left: 10px;
-                border-left: 4px solid var(--primary);
-            }}
-            
-            .change-section.added h3 {{
-                border-left-color: var(--success);
-                color: var(--success);
-            }}
-            
-            .change-section.removed h3 {{
-                border-left-color: var(--danger);
-                color: var(--danger);
-            }}
-            
-            .change-section.modified h3 {{
-                border-left-color: var(--warning);
-                color: var(--warning);
-            }}
-            
-            .change-list {{
-                list-style: none;
-            }}
-            
-            .change-item {{
-                background: var(--surface);
-                border: 1px solid var(--border);
-                border-radius: 6px;
-                padding: 15px;
-                margin-bottom: 10px;
-                transition: box-shadow 0.2s ease;
-            }}
-            
-            .change-item:hover {{
-                box-shadow: 0 2px 8px rgba(0,0,0,0.1);
-            }}
-            
-            .change-item.added {{
-                border-left: 3px solid var(--success);
-                background: #f0f9f4;
-            }}
-            
-            .change-item.removed {{
-                border-left: 3px solid var(--danger);
-                background: #fef3f2;
-            }}
-            
-            .change-item.modified {{
-                border-left: 3px solid var(--warning);
-                background: #fefbf3;
-            }}
-            
-            .change-item-header {{
-                font-weight: 600;
-                font-size: 14px;
-                color: var(--text-primary);
-                margin-bottom: 8px;
-            }}
-            
-            .change-item-details {{
-                font-size: 13px;
-                color: var(--text-secondary);
-                line-height: 1.6;
-            }}
-            
-            .change-detail {{
-                display: flex;
-                align-items: center;
-                margin: 5px 0;
-                gap: 8px;
-            }}
-            
-            .change-detail .field {{
-                font-weight: 500;
-                color: var(--text-primary);
-                min-width: 120px;
-            }}
-            
-            .change-detail .arrow {{
-                color: var(--warning);
-                font-weight: bold;
-            }}
-            
-            .change-detail .value {{
-                color: var(--text-secondary);
-            }}
-            
-            .change-detail .value.old {{
-                text-decoration: line-through;
-                opacity: 0.7;
-            }}
-            
-            .change-detail .value.new {{
-                color: var(--success);
-                font-weight: 500;
-            }}
-            
-            .empty-state {{
-                text-align: center;
-                padding: 40px;
-                color: var(--text-secondary);
-            }}
-            
-            .empty-state .icon {{
-                font-size: 48px;
-                margin-bottom: 10px;
-                opacity: 0.3;
-            }}
-            
-            /* No changes message */
-            .no-changes {{
-                background: #e8f5e9;
-                border: 1px solid #c8e6c9;
-                border-radius: 6px;
-                padding: 20px;
-                text-align: center;
-                color: #2e7d32;
-            }}
-            
-            .no-changes .icon {{
-                font-size: 32px;
-                margin-bottom: 10px;
-            }}
-            
-            /* Footer */
-            .footer {{
-                background: var(--background);
-                padding: 20px 40px;
-                text-align: center;
-                font-size: 12px;
-                color: var(--text-secondary);
-                border-top: 1px solid var(--border);
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <!-- Header -->
-            <div class="header">
-                <h1>🔍 Reporte de Cambios - Configuración Neotel</h1>
-                <div class="date">
-                    📅 {report_date.strftime('%d/%m/%Y')} | 
-                    🕐 Generado: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}
-                </div>
-            </div>
-            
-            <!-- Summary -->
-            <div class="summary">
-                <div class="summary-card">
-                    <div class="number">{total_changes}</div>
-                    <div class="label">Cambios Totales</div>
-                </div>
-                <div class="summary-card">
-                    <div class="number">{len(changes.get('extensions_added', [])) + len(changes.get('extensions_removed', [])) + len(changes.get('extensions_modified', []))}</div>
-                    <div class="label">📞 Extensiones</div>
-                </div>
-                <div class="summary-card">
-                    <div class="number">{len(changes.get('dids_added', [])) + len(changes.get('dids_removed', [])) + len(changes.get('dids_modified', []))}</div>
-                    <div class="label">📱 DIDs</div>
-                </div>
-                <div class="summary-card">
-                    <div class="number">{len(changes.get('colas_added', [])) + len(changes.get('colas_removed', [])) + len(changes.get('colas_modified', []))}</div>
-                    <div class="label">📋 Colas</div>
-                </div>
-            </div>
-            
-            <!-- Tabs -->
-            <div class="tabs">
-                <button class="tab active" onclick="showTab('extensiones')">📞 Extensiones</button>
-                <button class="tab" onclick="showTab('dids')">📱 DIDs</button>
-                <button class="tab" onclick="showTab('colas')">📋 Colas</button>
-            </div>
-            
-            <!-- Content -->
-            <div class="content">
-                <!-- Extensiones Tab -->
-                <div id="extensiones" class="tab-content active">
-                    {self._generate_extensions_changes_html(changes)}
-                </div>
-                
-                <!-- DIDs Tab -->
-                <div id="dids" class="tab-content">
-                    {self._generate_dids_changes_html(changes)}
-                </div>
-                
-                <!-- Colas Tab -->
-                <div id="colas" class="tab-content">
-                    {self._generate_colas_changes_html(changes)}
-                </div>
-            </div>
-            
-            <!-- Footer -->
-            <div class="footer">
-                Reporte automático generado por el Sistema de Auditoría Neotel
-            </div>
-        </div>
+    def generate_html_report(self, report):
+        """
+        Generar reporte HTML profesional con cambios (plantillas de templates/)
         
-        <script>
-            function showTab(tabName) {{
-                // Hide all tabs
-                const tabs = document.querySelectorAll('.tab-content');
-                tabs.forEach(tab => tab.classList.remove('active'));
-                
-                // Remove active from buttons
-                const buttons = document.querySelectorAll('.tab');
-                buttons.forEach(btn => btn.classList.remove('active'));
-                
-                // Show selected tab
-                document.getElementById(tabName).classList.add('active');
-                
-                // Activate button
-                event.target.classList.add('active');
-            }}
-        </script>
-    </body>
-    </html>"""
-            
-            with open(report_file, 'w', encoding='utf-8') as f:
-                f.write(html)
+        Junto al HTML se guardan los formatos de ConfigAudit.REPORT_FORMATS,
+        renderizados del mismo modelo (report_model.build_report).
+        """
+        try:
+            report_file = render_report(report, logger=self.logger)
             
             self.logger.info(f"✅ Reporte HTML generado: {report_file}")
+            for fmt in ConfigAudit.REPORT_FORMATS:
+                self.logger.info(f"📝 Reporte {fmt} generado: {write_report(report, fmt)}")
             return report_file
             
         except Exception as e:
             self.logger.error(f"❌ Error generando reporte HTML: {str(e)}")
             return None
-
-    def _generate_changes_html(self, items, title, change_type):
-        """Helper para generar HTML de cambios"""
-        if not items:
-            return ""
-        
-        html = f'<div class="change {change_type}"><h4>{title} ({len(items)})</h4><ul>'
-        for item in items[:20]:  # Máximo 20 por tipo
-            # Convertir dict a string legible
-            item_str = str(item) if not isinstance(item, dict) else ', '.join([f"{k}: {v}" for k, v in list(item.items())[:3]])
-            html += f'<li>{item_str}</li>'
-        if len(items) > 20:
-            html += f'<li>... y {len(items) - 20} más</li>'
-        html += '</ul></div>'
-        return html
     
     def cleanup_old_snapshots(self):
-        """Limpiar snapshots antiguos"""
+        """Compactar snapshots antiguos (retención escalonada, sin perder cambios)"""
         try:
-            self.logger.info(f"🧹 Limpiando snapshots antiguos (>{ConfigAudit.RETENTION_DAYS} días)...")
-            
-            cutoff_date = datetime.now() - timedelta(days=ConfigAudit.RETENTION_DAYS)
-            deleted_count = 0
-            
-            for snapshot_file in ConfigAudit.SNAPSHOTS_DIR.glob("*.json"):
-                try:
-                    date_str = snapshot_file.stem.split('_')[0]
-                    file_date = datetime.strptime(date_str, '%Y-%m-%d')
-                    
-                    if file_date < cutoff_date:
-                        snapshot_file.unlink()
-                        deleted_count += 1
-                
-                except:
-                    continue
+            SnapshotCompactor(logger=self.logger).run()
             
-            if deleted_count > 0:
-                self.logger.info(f"✅ Eliminados {deleted_count} snapshots antiguos")
+        except Exception as e:
+            self.logger.warning(f"⚠️  Error compactando snapshots: {str(e)}")
+    
+    def update_history_dashboard(self):
+        """Añadir el snapshot del día al dashboard de historial"""
+        try:
+            HistoryBuilder(logger=self.logger).update()
             
         except Exception as e:
-            self.logger.warning(f"⚠️  Error limpiando snapshots: {str(e)}")
+            self.logger.warning(f"⚠️  Error actualizando el historial: {str(e)}")
     
     def run_audit(self):
         """Ejecutar auditoría completa"""
         try:
             audit_date = datetime.now().date()
-            previous_date = audit_date - timedelta(days=1)
             
             self.logger.info(f"📅 Fecha de auditoría: {audit_date}")
             
@@ -1305,17 +1318,36 @@ class NeotelConfigExtractor:
             self.logger.info("📥 EXTRAYENDO CONFIGURACIÓN ACTUAL")
             self.logger.info("=" * 80)
             
-            current_config = {
+            # Cargar snapshot anterior (el más reciente, aunque no sea de ayer)
+            previous = nearest_snapshot(audit_date, strictly_before=True)
+            previous_date = previous[0] if previous else None
+            previous_config = self.load_snapshot(previous_date) if previous_date else None
+            
+            if previous_date and previous_date != audit_date - timedelta(days=1):
+                self.logger.warning(f"⚠️  No hay snapshot de ayer; se compara con el de {previous_date}")
+            
+            # Recorrido priorizado por frecuencia de cambios y antigüedad
+            self.scheduler = CrawlScheduler(
+                open_snapshot(previous[1]) if previous_config is not None else None,
+                previous_date, audit_date,
+                budget_minutes=ConfigAudit.CRAWL_TIME_BUDGET_MINUTES,
+                logger=self.logger
+            )
+            
+            # Normalizadores de las reglas de ruido y forma canónica (orden por
+            # clave natural) igual que en disco
+            current_config, normalized = normalize_config({
                 'extensiones': self.extract_extensions(),
                 'dids': self.extract_dids(),
                 'colas': self.extract_colas()
-            }
+            })
+            if normalized:
+                self.logger.info(f"🧹 {sum(normalized.values())} valores normalizados al extraer")
             
-            # Guardar snapshot
-            self.save_snapshot(current_config, audit_date)
-            
-            # Cargar snapshot anterior
-            previous_config = self.load_snapshot(previous_date)
+            carried = self.scheduler.carry_over(current_config)
+            if carried:
+                self.logger.warning(f"⏭️  {carried} entidades sin visitar se arrastran del snapshot anterior")
+            current_config = canonicalize_config(current_config)
             
             # Comparar
             self.logger.info("=" * 80)
@@ -1323,19 +1355,54 @@ class NeotelConfigExtractor:
             self.logger.info("=" * 80)
             
             changes = self.compare_configs(current_config, previous_config)
+            changes['arrastrados'] = carried
+            
+            # Segunda pasada: confirmar o retractar eliminaciones y modificaciones
+            if ConfigAudit.VERIFY_CHANGES and any(
+                    changes.get(key) for schema in SCHEMAS for key in schema.change_keys[1:]):
+                self.logger.info("=" * 80)
+                self.logger.info("🔁 VERIFICANDO CAMBIOS")
+                self.logger.info("=" * 80)
+                
+                current_config, verification = self.verify_changes(changes, current_config)
+                if verification['retractados']:
+                    changes = self.compare_configs(current_config, previous_config)
+                    changes['arrastrados'] = carried
+            
+            # Donde hoy se leyó un marcador (cambio ya suprimido por su regla)
+            # se guarda el valor anterior, como con las entidades arrastradas
+            if previous_config is not None:
+                current_config, kept = keep_previous_values(current_config, previous_config)
+                if kept:
+                    self.logger.info(f"🧷 {sum(kept.values())} marcadores sustituidos por el valor anterior")
+            
+            # Guardar snapshot (ya verificado)
+            self.save_snapshot(current_config, audit_date)
+            
+            # Guardar delta diario (base de las consultas por rango) y eventos
+            if not changes.get('is_first_run'):
+                save_delta(previous_date, audit_date, changes)
+                events = append_events(changes, audit_date, previous_date)
+                self.logger.info(f"📝 {events} eventos añadidos al flujo de cambios")
             
             # Generar reporte y enviar email
             if changes.get('is_first_run'):
                 self.logger.info("ℹ️  Primera ejecución - no se envía email")
             elif changes.get('has_changes'):
-                report_file = self.generate_html_report(changes, audit_date)
-                self.email_sender.send_change_report(report_file, changes, audit_date)
+                # Modelo del reporte: una sola vez para el HTML, el email y los demás formatos
+                report = build_report(changes, audit_date)
+                report_file = self.generate_html_report(report)
+                self.email_sender.send_change_report(report_file, changes, audit_date, report=report)
             else:
                 self.email_sender.send_no_changes_notification(audit_date)
             
             # Limpieza
             self.cleanup_old_snapshots()
             
+            # Historial (después de compactar: sin los días eliminados)
+            if ConfigAudit.HISTORY_DASHBOARD:
+                self.update_history_dashboard()
+            
             self.logger.info("=" * 80)
             self.logger.info("✅ AUDITORÍA COMPLETADA EXITOSAMENTE")
             self.logger.info("=" * 80)
@@ -1347,299 +1414,6 @@ class NeotelConfigExtractor:
         finally:
             self.cleanup()
     
-    def _generate_extensions_changes_html(self, changes):
-        """Generar HTML de cambios en extensiones"""
-        html = []
-        
-        # Añadidas
-        if changes.get('extensions_added'):
-            html.append('<div class="change-section added">')
-            html.append(f'<h3>✅ AÑADIDAS ({len(changes["extensions_added"])})</h3>')
-            html.append('<ul class="change-list">')
-            for ext in changes['extensions_added']:
-                html.append(f'''
-                    <li class="change-item added">
-                        <div class="change-item-header">📞 {ext.get("extension", "")} - {ext.get("nombre", "")}</div>
-                        <div class="change-item-details">
-                            Grupo: {ext.get("grupo", "-")} | 
-                            Agente: {ext.get("agente_asignado", "-")} | 
-                            Estado: {ext.get("estado_colas", "").replace("_", " ").title()}
-                        </div>
-                    </li>
-                ''')
-            html.append('</ul></div>')
-        
-        # Eliminadas
-        if changes.get('extensions_removed'):
-            html.append('<div class="change-section removed">')
-            html.append(f'<h3>❌ ELIMINADAS ({len(changes["extensions_removed"])})</h3>')
-            html.append('<ul class="change-list">')
-            for ext in changes['extensions_removed']:
-                html.append(f'''
-                    <li class="change-item removed">
-                        <div class="change-item-header">📞 {ext.get("extension", "")} - {ext.get("nombre", "")}</div>
-                        <div class="change-item-details">
-                            Grupo: {ext.get("grupo", "-")} | 
-                            Agente: {ext.get("agente_asignado", "-")}
-                        </div>
-                    </li>
-                ''')
-            html.append('</ul></div>')
-        
-        # Modificadas
-        if changes.get('extensions_modified'):
-            html.append('<div class="change-section modified">')
-            html.append(f'<h3>🔄 MODIFICADAS ({len(changes["extensions_modified"])})</h3>')
-            html.append('<ul class="change-list">')
-            for change in changes['extensions_modified']:
-                ext_code = change.get('extension', '')
-                anterior = change.get('anterior', {})
-                actual = change.get('actual', {})
-                
-                html.append(f'''
-                    <li class="change-item modified">
-                        <div class="change-item-header">📞 {ext_code} - {actual.get("nombre", "")}</div>
-                        <div class="change-item-details">
-                ''')
-                
-                # Detectar qué cambió
-                if anterior.get('nombre') != actual.get('nombre'):
-                    html.append(f'''
-                        <div class="change-detail">
-                            <span class="field">Nombre:</span>
-                            <span class="value old">{anterior.get('nombre', '-')}</span>
-                            <span class="arrow">→</span>
-                            <span class="value new">{actual.get('nombre', '-')}</span>
-                        </div>
-                    ''')
-                
-                if anterior.get('grupo') != actual.get('grupo'):
-                    html.append(f'''
-                        <div class="change-detail">
-                            <span class="field">Grupo:</span>
-                            <span class="value old">{anterior.get('grupo', '-')}</span>
-                            <span class="arrow">→</span>
-                            <span class="value new">{actual.get('grupo', '-')}</span>
-                        </div>
-                    ''')
-                
-                if anterior.get('agente_asignado') != actual.get('agente_asignado'):
-                    html.append(f'''
-                        <div class="change-detail">
-                            <span class="field">Agente:</span>
-                            <span class="value old">{anterior.get('agente_asignado', '-')}</span>
-                            <span class="arrow">→</span>
-                            <span class="value new">{actual.get('agente_asignado', '-')}</span>
-                        </div>
-                    ''')
-                
-                if anterior.get('numero_saliente') != actual.get('numero_saliente'):
-                    html.append(f'''
-                        <div class="change-detail">
-                            <span class="field">Nº Saliente:</span>
-                            <span class="value old">{anterior.get('numero_saliente', '-')}</span>
-                            <span class="arrow">→</span>
-                            <span class="value new">{actual.get('numero_saliente', '-')}</span>
-                        </div>
-                    ''')
-                
-                if anterior.get('estado_colas') != actual.get('estado_colas'):
-                    html.append(f'''
-                        <div class="change-detail">
-                            <span class="field">Estado Colas:</span>
-                            <span class="value old">{anterior.get('estado_colas', '').replace('_', ' ').title()}</span>
-                            <span class="arrow">→</span>
-                            <span class="value new">{actual.get('estado_colas', '').replace('_', ' ').title()}</span>
-                        </div>
-                    ''')
-                
-                html.append('</div></li>')
-            html.append('</ul></div>')
-        
-        # Sin cambios
-        if not any([changes.get('extensions_added'), changes.get('extensions_removed'), changes.get('extensions_modified')]):
-            html.append('<div class="no-changes"><div class="icon">✅</div><div>No hay cambios en extensiones</div></div>')
-        
-        return '\n'.join(html)
-
-    def _generate_dids_changes_html(self, changes):
-        """Generar HTML de cambios en DIDs"""
-        html = []
-        
-        # Añadidos
-        if changes.get('dids_added'):
-            html.append('<div class="change-section added">')
-            html.append(f'<h3>✅ AÑADIDOS ({len(changes["dids_added"])})</h3>')
-            html.append('<ul class="change-list">')
-            for did in changes['dids_added']:
-                html.append(f'''
-                    <li class="change-item added">
-                        <div class="change-item-header">📱 {did.get("numero", "")}</div>
-                        <div class="change-item-details">
-                            Locución: {did.get("locucion", "-")} | 
-                            Acción 1: {did.get("accion1", "-")[:50]}...
-                        </div>
-                    </li>
-                ''')
-            html.append('</ul></div>')
-        
-        # Eliminados
-        if changes.get('dids_removed'):
-            html.append('<div class="change-section removed">')
-            html.append(f'<h3>❌ ELIMINADOS ({len(changes["dids_removed"])})</h3>')
-            html.append('<ul class="change-list">')
-            for did in changes['dids_removed']:
-                html.append(f'''
-                    <li class="change-item removed">
-                        <div class="change-item-header">📱 {did.get("numero", "")}</div>
-                        <div class="change-item-details">
-                            Locución: {did.get("locucion", "-")}
-                        </div>
-                    </li>
-                ''')
-            html.append('</ul></div>')
-        
-        # Modificados
-        if changes.get('dids_modified'):
-            html.append('<div class="change-section modified">')
-            html.append(f'<h3>🔄 MODIFICADOS ({len(changes["dids_modified"])})</h3>')
-            html.append('<ul class="change-list">')
-            for change in changes['dids_modified']:
-                did_num = change.get('numero', '')
-                anterior = change.get('anterior', {})
-                actual = change.get('actual', {})
-                
-                html.append(f'''
-                    <li class="change-item modified">
-                        <div class="change-item-header">📱 {did_num}</div>
-                        <div class="change-item-details">
-                ''')
-                
-                # Detectar cambios
-                if anterior.get('locucion') != actual.get('locucion'):
-                    html.append(f'''
-                        <div class="change-detail">
-                            <span class="field">Locución:</span>
-                            <span class="value old">{anterior.get('locucion', '-')}</span>
-                            <span class="arrow">→</span>
-                            <span class="value new">{actual.get('locucion', '-')}</span>
-                        </div>
-                    ''')
-                
-                for i in range(1, 6):
-                    accion_key = f'accion{i}'
-                    if anterior.get(accion_key) != actual.get(accion_key):
-                        html.append(f'''
-                            <div class="change-detail">
-                                <span class="field">Acción {i}:</span>
-                                <span class="value old">{anterior.get(accion_key, '-')[:40]}...</span>
-                                <span class="arrow">→</span>
-                                <span class="value new">{actual.get(accion_key, '-')[:40]}...</span>
-                            </div>
-                        ''')
-                
-                html.append('</div></li>')
-            html.append('</ul></div>')
-        
-        # Sin cambios
-        if not any([changes.get('dids_added'), changes.get('dids_removed'), changes.get('dids_modified')]):
-            html.append('<div class="no-changes"><div class="icon">✅</div><div>No hay cambios en DIDs</div></div>')
-        
-        return '\n'.join(html)
-
-    def _generate_colas_changes_html(self, changes):
-        """Generar HTML de cambios en colas"""
-        html = []
-        
-        # Añadidas
-        if changes.get('colas_added'):
-            html.append('<div class="change-section added">')
-            html.append(f'<h3>✅ AÑADIDAS ({len(changes["colas_added"])})</h3>')
-            html.append('<ul class="change-list">')
-            for cola in changes['colas_added']:
-                miembros_count = len(cola.get('miembros', []))
-                html.append(f'''
-                    <li class="change-item added">
-                        <div class="change-item-header">📋 {cola.get("nombre", "")}</div>
-                        <div class="change-item-details">
-                            Miembros: {miembros_count}
-                        </div>
-                    </li>
-                ''')
-            html.append('</ul></div>')
-        
-        # Eliminadas
-        if changes.get('colas_removed'):
-            html.append('<div class="change-section removed">')
-            html.append(f'<h3>❌ ELIMINADAS ({len(changes["colas_removed"])})</h3>')
-            html.append('<ul class="change-list">')
-            for cola in changes['colas_removed']:
-                miembros_count = len(cola.get('miembros', []))
-                html.append(f'''
-                    <li class="change-item removed">
-                        <div class="change-item-header">📋 {cola.get("nombre", "")}</div>
-                        <div class="change-item-details">
-                            Tenía {miembros_count} miembros
-                        </div>
-                    </li>
-                ''')
-            html.append('</ul></div>')
-        
-        # Modificadas
-        if changes.get('colas_modified'):
-            html.append('<div class="change-section modified">')
-            html.append(f'<h3>🔄 MODIFICADAS ({len(changes["colas_modified"])})</h3>')
-            html.append('<ul class="change-list">')
-            for change in changes['colas_modified']:
-                cola_name = change.get('nombre', '')
-                anterior = change.get('anterior', {})
-                actual = change.get('actual', {})
-                
-                miembros_ant = {m['extension']: m for m in anterior.get('miembros', [])}
-                miembros_act = {m['extension']: m for m in actual.get('miembros', [])}
-                
-                # Detectar miembros añadidos/eliminados
-                added_members = set(miembros_act.keys()) - set(miembros_ant.keys())
-                removed_members = set(miembros_ant.keys()) - set(miembros_act.keys())
-                
-                # Detectar cambios de estado
-                estado_changes = []
-                for ext in set(miembros_ant.keys()) & set(miembros_act.keys()):
-                    if miembros_ant[ext].get('estado') != miembros_act[ext].get('estado'):
-                        estado_changes.append((ext, miembros_ant[ext].get('estado'), miembros_act[ext].get('estado')))
-                
-                html.append(f'''
-                    <li class="change-item modified">
-                        <div class="change-item-header">📋 {cola_name}</div>
-                        <div class="change-item-details">
-                ''')
-                
-                if added_members:
-                    html.append(f'<div class="change-detail"><span class="field">✅ Miembros añadidos:</span> {", ".join(added_members)}</div>')
-                
-                if removed_members:
-                    html.append(f'<div class="change-detail"><span class="field">❌ Miembros eliminados:</span> {", ".join(removed_members)}</div>')
-                
-                if estado_changes:
-                    for ext, old_state, new_state in estado_changes:
-                        html.append(f'''
-                            <div class="change-detail">
-                                <span class="field">{ext}:</span>
-                                <span class="value old">{old_state.title()}</span>
-                                <span class="arrow">→</span>
-                                <span class="value new">{new_state.title()}</span>
-                            </div>
-                        ''')
-                
-                html.append('</div></li>')
-            html.append('</ul></div>')
-        
-        # Sin cambios
-        if not any([changes.get('colas_added'), changes.get('colas_removed'), changes.get('colas_modified')]):
-            html.append('<div class="no-changes"><div class="icon">✅</div><div>No hay cambios en colas</div></div>')
-        
-        return '\n'.join(html)
-    
     def cleanup(self):
         """Limpiar recursos"""
         try:
@@ -1651,6 +1425,7 @@ class NeotelConfigExtractor:
                     pass
                 finally:
                     self.driver = None
+                    self.current_page = None
             
             if hasattr(self, 'temp_dir') and self.temp_dir and self.temp_dir.exists():
                 for attempt in range(3):
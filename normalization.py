@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Normalización de entidades extraídas antes de guardarlas y compararlas
+
+Los miembros de una cola se guardan en forma canónica: una lista ordenada
+de {extension, estado}, sin duplicados. Los contadores de texto libre que
+muestra Neotel (Est/Pen/Pri) cambian continuamente, así que se separan en
+el campo 'contadores' de la cola, que no se audita.
+
+Los normalizadores del archivo de reglas (audit_rules) se aplican a todos
+los textos antes de guardar el snapshot, así el ruido de formato no llega
+a compararse al día siguiente. Donde una regla 'conservar_anterior' suprime
+un cambio, el snapshot guarda el valor anterior en lugar del leído.
+"""
+
+from collections import Counter
+
+from audit_rules import get_rules
+from json_backend import NESTED_KEYS, SECTION_KEYS, natural_key
+
+
+def normalize_miembros(miembros):
+    """
+    Separar los miembros auditables de sus contadores volátiles
+
+    Args:
+        miembros: Lista de dicts {extension, estado, texto} en orden DOM
+
+    Returns:
+        Tupla (miembros canónicos, contadores por extensión)
+    """
+    canonical = {}
+    contadores = {}
+
+    for miembro in miembros or []:
+        extension = (miembro.get('extension') or '').strip()
+        if not extension:
+            continue
+        canonical[extension] = {
+            'extension': extension,
+            'estado': miembro.get('estado', 'desconocido')
+        }
+        texto = miembro.get('texto')
+        if texto:
+            contadores[extension] = texto
+
+    ordered = [canonical[ext] for ext in sorted(canonical, key=natural_key)]
+    return ordered, contadores
+
+
+def normalize_cola(cola):
+    """Devolver la cola con miembros canónicos y contadores separados"""
+    cola = dict(cola)
+    miembros, contadores = normalize_miembros(cola.get('miembros', []))
+    # Contadores de snapshots ya normalizados se conservan
+    contadores = {**cola.get('contadores', {}), **contadores}
+    cola['miembros'] = miembros
+    cola['contadores'] = contadores
+    return cola
+
+
+def queue_status(reanudar_habilitado, pausar_habilitado):
+    """
+    Estado de colas de una extensión según sus botones Reanudar/Pausar
+
+    Args:
+        reanudar_habilitado: Botón Reanudar en verde (hay colas en pausa)
+        pausar_habilitado: Botón Pausar en rojo (hay colas activas)
+    """
+    if reanudar_habilitado and pausar_habilitado:
+        return "mixto"
+    if reanudar_habilitado:
+        return "todas_pausadas"
+    if pausar_habilitado:
+        return "todas_activas"
+    return "sin_colas"
+
+
+def normalize_config(config_data, rules=None):
+    """
+    Aplicar los normalizadores de las reglas a todos los textos
+
+    Args:
+        config_data: Diccionario sección -> lista de entidades
+        rules: Reglas compiladas (default: las activas)
+
+    Returns:
+        Tupla (configuración normalizada, valores modificados por campo)
+    """
+    rules = rules or get_rules()
+    if not rules.normalizers:
+        return config_data, Counter()
+
+    changed = Counter()
+
+    def normalize_entity(section, entity, prefix=''):
+        normalized = {}
+        for field, value in entity.items():
+            if isinstance(value, str):
+                new_value = rules.normalize(section, prefix + field, value)
+                if new_value != value:
+                    changed[f"{section}.{prefix}{field}"] += 1
+                normalized[field] = new_value
+            elif isinstance(value, list) and not prefix:
+                normalized[field] = [
+                    normalize_entity(section, item, f"{field}.") if isinstance(item, dict) else item
+                    for item in value
+                ]
+            else:
+                normalized[field] = value
+        return normalized
+
+    normalized_config = {}
+    for section, entities in config_data.items():
+        if isinstance(entities, list):
+            normalized_config[section] = [
+                normalize_entity(section, entity) if isinstance(entity, dict) else entity
+                for entity in entities
+            ]
+        else:
+            normalized_config[section] = entities
+    return normalized_config, changed
+
+
+def keep_previous_values(config_data, previous_config, rules=None):
+    """
+    Conservar el valor del snapshot anterior donde hoy se leyó un marcador
+
+    Igual que las entidades arrastradas, un campo cuyo cambio suprime una
+    regla con 'conservar_anterior' (p.ej. 'Por extraer...' porque el panel
+    no había cargado) se guarda con el valor anterior: el marcador no llega
+    al snapshot y la siguiente auditoría compara contra el valor real.
+
+    Args:
+        config_data: Configuración extraída
+        previous_config: Configuración del snapshot anterior
+        rules: Reglas compiladas (default: las activas)
+
+    Returns:
+        Tupla (configuración, valores conservados por regla)
+    """
+    rules = rules or get_rules()
+    kept = Counter()
+    if not rules.keeping:
+        return config_data, kept
+
+    def keep_fields(section, entity, previous, prefix=''):
+        restored = None
+        for field, value in entity.items():
+            old_value = previous.get(field)
+            if not isinstance(value, str) or old_value == value:
+                continue
+            rule = rules.keeping_rule(section, prefix + field, old_value, value)
+            if rule:
+                restored = restored or dict(entity)
+                restored[field] = old_value
+                kept[rule] += 1
+        return restored or entity
+
+    def keep_entity(section, entity, previous):
+        entity = keep_fields(section, entity, previous)
+        for collection, key in NESTED_KEYS.get(section, {}).items():
+            previous_items = {item.get(key): item for item in previous.get(collection) or []}
+            items = entity.get(collection) or []
+            kept_items = [keep_fields(section, item, previous_items.get(item.get(key), {}), f"{collection}.")
+                          for item in items]
+            if kept_items != items:
+                entity = {**entity, collection: kept_items}
+        return entity
+
+    kept_config = dict(config_data)
+    for section, key in SECTION_KEYS.items():
+        if section not in config_data:
+            continue
+        # Entidades nuevas: sin valor anterior que conservar
+        previous_entities = {entity.get(key): entity for entity in previous_config.get(section, [])}
+        kept_config[section] = [keep_entity(section, entity, previous_entities.get(entity.get(key), {}))
+                                for entity in config_data[section]]
+    return kept_config, kept
+
+
+def member_info(cola, miembro):
+    """Texto informativo (contadores) de un miembro, en cualquier formato"""
+    extension = miembro.get('extension', '')
+    return cola.get('contadores', {}).get(extension) or miembro.get('texto', '')
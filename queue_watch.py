@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Vigilancia de alta frecuencia del estado de colas de las extensiones
+
+Mantiene una sesión abierta y sondea cada N segundos solo la tabla de
+extensiones, donde los botones Reanudar/Pausar indican el estado de colas
+de cada extensión. Únicamente se guardan las transiciones, en una serie
+temporal JSONL por día:
+
+    {"evento":"inicio","t":...,"estados":{ext: estado, ...}}   (al arrancar y al cambiar de día)
+    {"t":...,"ext":"4717-5","de":"todas_activas","a":"todas_pausadas"}
+    {"evento":"fin","t":...}
+
+Cada archivo diario empieza con el estado completo, así el resumen de un
+día no depende de los anteriores. Un sondeo vacío o con muchas menos
+extensiones que el anterior (la tabla no terminó de cargar) se reintenta
+una vez; si sigue incompleto no se compara: se cierra el periodo con
+"fin" y el tiempo hasta el siguiente sondeo válido queda como hueco. La
+auditoría nocturna completa sigue ejecutándose aparte para el resto de la
+configuración.
+
+Uso:
+    python queue_watch.py [--intervalo SEGUNDOS] [--horas N]
+    python queue_watch.py --resumen [YYYY-MM-DD]
+"""
+
+import argparse
+import sys
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+
+import json_backend
+from config_audit import ConfigAudit
+
+
+class QueueStateStore:
+    """Serie temporal de transiciones de estado (JSONL diario)"""
+
+    def __init__(self):
+        self.states = {}
+        self.current_date = None
+
+    def _append(self, records, when):
+        """Añadir registros al archivo del día en una sola escritura"""
+        ConfigAudit.WATCH_DIR.mkdir(parents=True, exist_ok=True)
+        with open(ConfigAudit.get_watch_filename(when.date()), 'ab') as f:
+            f.write(b''.join(json_backend.dumps(record) + b'\n' for record in records))
+
+    def incomplete(self, states):
+        """Indicar si un sondeo no leyó la tabla completa (vacío o muy por debajo del anterior)"""
+        if not states:
+            return True
+        return len(states) < len(self.states) * ConfigAudit.WATCH_MIN_READ_RATIO
+
+    def record(self, states, when=None):
+        """
+        Registrar un sondeo
+
+        Un sondeo incompleto no se compara con el anterior (generaría
+        transiciones a None y su vuelta en el siguiente): cierra el periodo
+        vigilado, como un error de lectura.
+
+        Returns:
+            Número de transiciones escritas
+        """
+        when = when or datetime.now()
+        timestamp = when.isoformat(timespec='seconds')
+
+        if self.incomplete(states):
+            self.close(when)
+            return 0
+
+        # Primer sondeo o cambio de día: el archivo empieza con el estado completo
+        if self.current_date != when.date():
+            self.current_date = when.date()
+            self.states = dict(states)
+            self._append([{'evento': 'inicio', 't': timestamp, 'estados': self.states}], when)
+            return 0
+
+        transitions = []
+        for extension in sorted(self.states.keys() | states.keys()):
+            old = self.states.get(extension)
+            new = states.get(extension)
+            if old != new:
+                transitions.append({'t': timestamp, 'ext': extension, 'de': old, 'a': new})
+
+        if transitions:
+            self._append(transitions, when)
+            self.states = dict(states)
+
+        return len(transitions)
+
+    def close(self, when=None):
+        """
+        Marcar el final de un periodo vigilado (el tiempo posterior no se
+        contabiliza); el siguiente sondeo empieza otro con el estado completo
+        """
+        if self.current_date is None:
+            return
+        when = when or datetime.now()
+        self._append([{'evento': 'fin', 't': when.isoformat(timespec='seconds')}], when)
+        self.current_date = None
+
+
+def summarize(day, now=None):
+    """
+    Tiempo que cada extensión pasó en cada estado durante un día
+
+    Solo se contabilizan los periodos vigilados (entre 'inicio' y 'fin');
+    un periodo abierto termina a medianoche o ahora si el día es hoy.
+
+    Returns:
+        Diccionario extensión -> {estado: segundos}
+    """
+    watch_file = ConfigAudit.get_watch_filename(day)
+    durations = defaultdict(Counter)
+    if not watch_file.exists():
+        return {}
+
+    states = {}
+    since = None
+
+    def close_period(until):
+        if since is None:
+            return
+        seconds = (until - since).total_seconds()
+        for extension, state in states.items():
+            if state is not None:
+                durations[extension][state] += seconds
+
+    with open(watch_file, 'rb') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json_backend.loads(line)
+            when = datetime.fromisoformat(record['t'])
+
+            if record.get('evento') == 'inicio':
+                close_period(when)
+                states = dict(record['estados'])
+                since = when
+            elif record.get('evento') == 'fin':
+                close_period(when)
+                since = None
+            elif since is not None:
+                close_period(when)
+                states[record['ext']] = record['a']
+                since = when
+
+    end_of_day = datetime.combine(day + timedelta(days=1), datetime.min.time())
+    close_period(min(now or datetime.now(), end_of_day))
+    return {extension: dict(counter) for extension, counter in durations.items()}
+
+
+def watch(interval=None, hours=None, logger=None):
+    """
+    Bucle de vigilancia sobre una sesión reutilizada
+
+    Args:
+        interval: Segundos entre sondeos
+        hours: Duración máxima (None = hasta interrumpir)
+    """
+    # Importación diferida: requiere selenium solo al vigilar
+    from neotel_config_extractor_v2 import NeotelConfigExtractor
+
+    interval = interval or ConfigAudit.WATCH_INTERVAL_SECONDS
+    deadline = datetime.now() + timedelta(hours=hours) if hours else None
+
+    extractor = NeotelConfigExtractor()
+    logger = logger or extractor.logger
+    store = QueueStateStore()
+    try:
+        while deadline is None or datetime.now() < deadline:
+            started = time.time()
+            try:
+                states = extractor.read_queue_states()
+                if store.incomplete(states):
+                    # Tabla sin terminar de cargar: un reintento con más espera
+                    states = extractor.read_queue_states(settle=ConfigAudit.WATCH_SETTLE_SECONDS * 2)
+                    if store.incomplete(states):
+                        logger.warning(f"⚠️  Sondeo incompleto ({len(states)} extensiones), se descarta")
+                transitions = store.record(states)
+                if transitions:
+                    logger.info(f"🔄 {transitions} transiciones de estado de colas")
+            except Exception as e:
+                logger.warning(f"⚠️  Error sondeando estado de colas: {str(e)}")
+                # Hueco sin datos; sesión posiblemente caducada: se abre otra
+                # en el siguiente sondeo
+                store.close()
+                extractor.cleanup()
+
+            time.sleep(max(0, interval - (time.time() - started)))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        store.close()
+        extractor.cleanup()
+
+
+def _print_summary(day):
+    """Mostrar el tiempo en pausa de cada extensión"""
+    durations = summarize(day)
+    if not durations:
+        print(f"❌ No hay datos de vigilancia para {day}")
+        return
+
+    print(f"📅 {day}")
+    print(f"{'Extensión':<15} {'Activas':>10} {'Pausadas':>10} {'Mixto':>10}")
+    rows = sorted(durations.items(), key=lambda item: -item[1].get('todas_pausadas', 0))
+    for extension, states in rows:
+        if set(states) == {'sin_colas'}:
+            continue
+        print(f"{extension:<15} "
+              f"{states.get('todas_activas', 0) / 60:>9.0f}m "
+              f"{states.get('todas_pausadas', 0) / 60:>9.0f}m "
+              f"{states.get('mixto', 0) / 60:>9.0f}m")
+
+
+def main():
+    """Función principal"""
+    parser = argparse.ArgumentParser(description="Vigilar el estado de colas de las extensiones Neotel")
+    parser.add_argument('--intervalo', type=int, help="Segundos entre sondeos")
+    parser.add_argument('--horas', type=float, help="Duración de la vigilancia (default: indefinida)")
+    parser.add_argument('--resumen', nargs='?', const='hoy', help="Resumen de tiempos por estado de un día")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("👀 VIGILANCIA DE ESTADO DE COLAS - NEOTEL")
+    print("=" * 80)
+    print()
+
+    try:
+        if args.resumen:
+            day = datetime.now().date() if args.resumen == 'hoy' else datetime.strptime(args.resumen, '%Y-%m-%d').date()
+            _print_summary(day)
+        else:
+            watch(args.intervalo, args.horas)
+
+    except Exception as e:
+        print(f"\n❌ Error: {str(e)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
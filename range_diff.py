@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Comparación entre dos fechas cualesquiera o sobre una ventana completa
+
+Cada auditoría guarda su delta diario (cambios respecto al snapshot
+anterior). Una consulta de rango encadena esos deltas y los pliega en un
+único conjunto de cambios neto, sin volver a comparar snapshots completos.
+Si la cadena de deltas no cubre el rango se comparan directamente los
+snapshots más cercanos (en o antes de cada fecha).
+
+Uso:
+    python range_diff.py DESDE [HASTA] [--diario] [--json salida.json]
+    python range_diff.py --semana | --mes
+"""
+
+import argparse
+import bisect
+import sys
+from datetime import datetime, timedelta
+
+import json_backend
+from config_audit import ConfigAudit
+from diff_engine import SCHEMAS, change_lists, diff_configs, diff_entity, empty_changes, finalize_changes
+from rename_detector import RenameDetector
+from snapshot_format import open_snapshot
+
+
+def nearest_snapshot(target_date, strictly_before=False):
+    """
+    Snapshot más cercano en (o antes de) una fecha
+
+    Args:
+        target_date: Fecha buscada
+        strictly_before: Excluir la propia fecha
+
+    Returns:
+        Tupla (fecha, ruta) o None si no hay ninguno anterior
+    """
+    snapshots = ConfigAudit.list_snapshot_files()
+    dates = [snapshot_date for snapshot_date, _ in snapshots]
+    index = bisect.bisect_left(dates, target_date) if strictly_before else bisect.bisect_right(dates, target_date)
+    if index == 0:
+        return None
+    return snapshots[index - 1]
+
+
+def save_delta(from_date, to_date, changes):
+    """Guardar el delta diario de una auditoría"""
+    ConfigAudit.DELTAS_DIR.mkdir(parents=True, exist_ok=True)
+    delta = {
+        'desde': from_date.isoformat(),
+        'hasta': to_date.isoformat(),
+        'cambios': change_lists(changes)
+    }
+    delta_file = ConfigAudit.get_delta_filename(to_date)
+    with open(delta_file, 'wb') as f:
+        f.write(json_backend.dumps(delta))
+    return delta_file
+
+
+def load_delta(to_date):
+    """Cargar el delta que termina en una fecha (None si no existe)"""
+    delta_file = ConfigAudit.get_delta_filename(to_date)
+    if not delta_file.exists():
+        return None
+    with open(delta_file, 'rb') as f:
+        return json_backend.loads(f.read())
+
+
+def delta_chain(from_date, to_date):
+    """
+    Encadenar deltas desde to_date hacia atrás hasta from_date
+
+    Returns:
+        Lista de deltas en orden cronológico, o None si la cadena no llega
+        exactamente a from_date
+    """
+    chain = []
+    current = to_date
+    while current > from_date:
+        delta = load_delta(current)
+        if delta is None:
+            return None
+        chain.append(delta)
+        current = datetime.strptime(delta['desde'], '%Y-%m-%d').date()
+
+    if current != from_date:
+        return None
+    chain.reverse()
+    return chain
+
+
+def fold_deltas(deltas, schemas=SCHEMAS):
+    """
+    Plegar deltas consecutivos en un conjunto de cambios neto
+
+    Para cada entidad se conserva su estado al inicio del rango y al final:
+    añadir y luego eliminar se anula; eliminar y volver a añadir igual no
+    es un cambio.
+    """
+    changes = empty_changes(schemas)
+
+    for schema in schemas:
+        added_key, removed_key, modified_key = schema.change_keys
+        # clave -> [estado inicial, estado final] (None = no existe)
+        states = {}
+
+        for delta in deltas:
+            step = delta.get('cambios', {})
+            for entity in step.get(added_key, []):
+                state = states.setdefault(entity[schema.key], [None, None])
+                state[1] = entity
+            for entity in step.get(removed_key, []):
+                state = states.setdefault(entity[schema.key], [entity, None])
+                state[1] = None
+            for entry in step.get(modified_key, []):
+                state = states.setdefault(entry[schema.key], [entry['anterior'], None])
+                state[1] = entry['actual']
+            # Un renombrado equivale a eliminar la clave anterior y añadir la nueva
+            for entry in step.get(schema.renamed_key, []):
+                state = states.setdefault(entry['clave_anterior'], [entry['anterior'], None])
+                state[1] = None
+                state = states.setdefault(entry['clave_actual'], [None, None])
+                state[1] = entry['actual']
+
+        for key, (initial, final) in states.items():
+            if initial is None and final is not None:
+                changes[added_key].append(final)
+            elif initial is not None and final is None:
+                changes[removed_key].append(initial)
+            elif initial is not None and final is not None:
+                entry = diff_entity(schema, initial, final)
+                if entry:
+                    changes[modified_key].append(entry)
+
+    return finalize_changes(changes, schemas)
+
+
+def daily_deltas(from_date, to_date):
+    """Deltas diarios almacenados dentro de un rango (sin plegar)"""
+    deltas = []
+    current = from_date + timedelta(days=1)
+    while current <= to_date:
+        delta = load_delta(current)
+        if delta is not None:
+            deltas.append(delta)
+        current += timedelta(days=1)
+    return deltas
+
+
+def diff_range(from_date, to_date):
+    """
+    Cambios netos entre dos fechas
+
+    Args:
+        from_date: Fecha inicial (se usa el snapshot en o antes de ella)
+        to_date: Fecha final (ídem)
+
+    Returns:
+        Conjunto de cambios con el formato de diff_engine, más 'desde' y
+        'hasta' con las fechas de snapshot realmente usadas; None si no hay
+        snapshot para alguna de las fechas
+    """
+    start = nearest_snapshot(from_date)
+    end = nearest_snapshot(to_date)
+    if start is None or end is None:
+        return None
+
+    start_date, start_file = start
+    end_date, end_file = end
+
+    chain = delta_chain(start_date, end_date)
+    if chain is not None:
+        changes = fold_deltas(chain)
+    else:
+        changes = diff_configs(open_snapshot(end_file).config, open_snapshot(start_file).config)
+
+    if ConfigAudit.RENAME_DETECTION:
+        changes = RenameDetector().detect(changes)
+
+    changes['desde'] = start_date.isoformat()
+    changes['hasta'] = end_date.isoformat()
+    return changes
+
+
+def _print_changes(changes):
+    """Mostrar un resumen del conjunto de cambios"""
+    print(f"📅 {changes.get('desde')} → {changes.get('hasta')}")
+    print(f"Total de cambios: {changes['totales']['total']}")
+    for schema in SCHEMAS:
+        added_key, removed_key, modified_key = schema.change_keys
+        if not any(changes.get(k) for k in schema.change_keys + (schema.renamed_key,)):
+            continue
+        print(f"\n{schema.title}:")
+        for entity in changes[added_key]:
+            print(f"  + {entity.get(schema.key)}")
+        for entity in changes[removed_key]:
+            print(f"  - {entity.get(schema.key)}")
+        for entry in changes.get(schema.renamed_key, []):
+            print(f"  ↪ {entry['clave_anterior']} → {entry['clave_actual']} (confianza {entry['confianza']:.0%})")
+        for entry in changes[modified_key]:
+            campos = ', '.join(c['etiqueta'] for c in entry.get('campos', []))
+            colecciones = ', '.join(entry.get('colecciones', {}))
+            detalle = ', '.join(filter(None, [campos, colecciones]))
+            print(f"  ≠ {entry.get(schema.key)} ({detalle})")
+
+
+def main():
+    """Función principal"""
+    parser = argparse.ArgumentParser(description="Comparar la configuración Neotel entre dos fechas")
+    parser.add_argument('desde', nargs='?', help="Fecha inicial YYYY-MM-DD")
+    parser.add_argument('hasta', nargs='?', help="Fecha final YYYY-MM-DD (default: hoy)")
+    parser.add_argument('--semana', action='store_true', help="Últimos 7 días")
+    parser.add_argument('--mes', action='store_true', help="Últimos 30 días")
+    parser.add_argument('--diario', action='store_true', help="Mostrar cada delta diario sin plegar")
+    parser.add_argument('--json', help="Guardar el conjunto de cambios en un archivo JSON")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("🔍 COMPARACIÓN POR RANGO DE FECHAS - NEOTEL")
+    print("=" * 80)
+    print()
+
+    try:
+        to_date = datetime.strptime(args.hasta, '%Y-%m-%d').date() if args.hasta else datetime.now().date()
+        if args.semana:
+            from_date = to_date - timedelta(days=7)
+        elif args.mes:
+            from_date = to_date - timedelta(days=30)
+        elif args.desde:
+            from_date = datetime.strptime(args.desde, '%Y-%m-%d').date()
+        else:
+            parser.error("Indica una fecha inicial, --semana o --mes")
+
+        if args.diario:
+            deltas = daily_deltas(from_date, to_date)
+            for delta in deltas:
+                changes = finalize_changes({**empty_changes(), **delta['cambios']})
+                changes['desde'] = delta['desde']
+                changes['hasta'] = delta['hasta']
+                _print_changes(changes)
+                print()
+            result = deltas
+        else:
+            result = diff_range(from_date, to_date)
+            if result is None:
+                print("❌ No hay snapshots para el rango indicado")
+                sys.exit(1)
+            _print_changes(result)
+
+        if args.json:
+            with open(args.json, 'w', encoding='utf-8') as f:
+                f.write(json_backend.dumps_pretty(result))
+            print(f"\n💾 Cambios guardados en {args.json}")
+
+    except Exception as e:
+        print(f"\n❌ Error: {str(e)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
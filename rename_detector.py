@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Detección de renombrados y movimientos tras la comparación
+
+Cuando una cola cambia de nombre, o una extensión cambia de código pero
+conserva nombre y agente, el motor de comparación ve una eliminación y una
+adición. Este emparejador indexa los atributos de las entidades eliminadas
+(índice invertido token -> entidades) y, para cada entidad añadida, solo
+puntúa los candidatos que comparten algún token. Los pares con similitud
+suficiente se reportan como renombrados con su nivel de confianza.
+"""
+
+import re
+from collections import Counter
+
+from config_audit import ConfigAudit
+from diff_engine import SCHEMAS, diff_entity, finalize_changes
+
+# Campos cuyos valores identifican a una entidad más allá de su clave
+TOKEN_FIELDS = {
+    'extensiones': ['nombre', 'agente_asignado', 'numero_saliente', 'grupo'],
+    'dids': ['id_interno', 'locucion', 'accion1', 'accion2', 'accion3', 'accion4', 'accion5'],
+    'colas': ['id_interno', 'nombre']
+}
+TOKEN_COLLECTIONS = {
+    'colas': {'miembros': 'extension'}
+}
+# Valores sin poder discriminante
+IGNORED_VALUES = {'', '-', 'n/d', 'por extraer...'}
+
+# Palabras sin el guion bajo: 'pre_VENTAS_NORTE' -> pre, ventas, norte
+_WORDS = re.compile(r'[^\W_]+', re.UNICODE)
+
+
+def entity_tokens(section, entity):
+    """Conjunto de tokens 'campo:valor' que describen una entidad"""
+    tokens = set()
+
+    for field in TOKEN_FIELDS.get(section, []):
+        value = str(entity.get(field) or '').strip().lower()
+        if value in IGNORED_VALUES:
+            continue
+        if field == 'nombre':
+            # Por palabras: un renombrado suele conservar parte del nombre
+            tokens.update(f"nombre~{word}" for word in _WORDS.findall(value))
+        else:
+            tokens.add(f"{field}={value}")
+
+    for collection, key in TOKEN_COLLECTIONS.get(section, {}).items():
+        for item in entity.get(collection) or []:
+            if item.get(key):
+                tokens.add(f"{collection}:{item[key]}")
+
+    return tokens
+
+
+class RenameDetector:
+    """Emparejador de entidades eliminadas/añadidas mediante índice invertido"""
+
+    def __init__(self, min_confidence=None, max_posting=None):
+        """
+        Args:
+            min_confidence: Similitud mínima (Jaccard) para aceptar un par
+            max_posting: Tokens presentes en más entidades se ignoran
+        """
+        self.min_confidence = min_confidence if min_confidence is not None else ConfigAudit.RENAME_MIN_CONFIDENCE
+        self.max_posting = max_posting if max_posting is not None else ConfigAudit.RENAME_MAX_POSTING
+
+    def match(self, section, removed, added):
+        """
+        Emparejar entidades eliminadas y añadidas de una sección
+
+        Returns:
+            Lista de tuplas (índice eliminada, índice añadida, confianza)
+        """
+        removed_tokens = [entity_tokens(section, entity) for entity in removed]
+        index = {}
+        for idx, tokens in enumerate(removed_tokens):
+            for token in tokens:
+                index.setdefault(token, []).append(idx)
+
+        # Tokens demasiado frecuentes (p.ej. el mismo número saliente en
+        # todas las extensiones) no discriminan: no cuentan para la similitud
+        common_tokens = {token for token, posting in index.items() if len(posting) > self.max_posting}
+        removed_sizes = [len(tokens - common_tokens) for tokens in removed_tokens]
+
+        candidates = []
+        for added_idx, entity in enumerate(added):
+            tokens = entity_tokens(section, entity) - common_tokens
+            shared = Counter()
+            for token in tokens:
+                shared.update(index.get(token, ()))
+
+            for removed_idx, common in shared.items():
+                union = len(tokens) + removed_sizes[removed_idx] - common
+                confidence = common / union if union else 0
+                if confidence >= self.min_confidence:
+                    candidates.append((confidence, removed_idx, added_idx))
+
+        # Emparejamiento voraz uno a uno por confianza descendente
+        pairs = []
+        used_removed = set()
+        used_added = set()
+        for confidence, removed_idx, added_idx in sorted(candidates, key=lambda c: -c[0]):
+            if removed_idx in used_removed or added_idx in used_added:
+                continue
+            used_removed.add(removed_idx)
+            used_added.add(added_idx)
+            pairs.append((removed_idx, added_idx, confidence))
+
+        return pairs
+
+    def detect(self, changes, schemas=SCHEMAS):
+        """
+        Convertir pares eliminada/añadida en renombrados dentro de changes
+
+        Los pares se retiran de <prefijo>_added/_removed y se añaden a
+        <prefijo>_renamed con 'anterior', 'actual', 'confianza' y el detalle
+        de campos que además han cambiado.
+        """
+        for schema in schemas:
+            added_key, removed_key, _ = schema.change_keys
+            removed = changes.get(removed_key, [])
+            added = changes.get(added_key, [])
+            if not removed or not added:
+                continue
+
+            pairs = self.match(schema.name, removed, added)
+            if not pairs:
+                continue
+
+            renamed = changes.setdefault(schema.renamed_key, [])
+            for removed_idx, added_idx, confidence in pairs:
+                previous = removed[removed_idx]
+                current = added[added_idx]
+                entry = diff_entity(schema, previous, current) or {'campos': [], 'colecciones': {}}
+                renamed.append({
+                    'clave_anterior': previous.get(schema.key),
+                    'clave_actual': current.get(schema.key),
+                    'anterior': previous,
+                    'actual': current,
+                    'confianza': round(confidence, 2),
+                    'campos': entry['campos'],
+                    'colecciones': entry['colecciones']
+                })
+
+            matched_removed = {idx for idx, _, _ in pairs}
+            matched_added = {idx for _, idx, _ in pairs}
+            changes[removed_key] = [e for i, e in enumerate(removed) if i not in matched_removed]
+            changes[added_key] = [e for i, e in enumerate(added) if i not in matched_added]
+
+        return finalize_changes(changes, schemas)
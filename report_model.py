@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+Modelo intermedio del reporte de cambios y sus formatos
+
+El conjunto de cambios (diff_configs) se convierte una sola vez en un
+modelo con todo lo que muestran los reportes: totales, una entrada por
+sección con sus grupos (añadidas, eliminadas, renombradas, modificadas) y,
+por cada cambio, cabecera, resumen, campos (anterior → actual) y miembros.
+Los valores ya vienen formateados, así todos los formatos muestran lo mismo
+y renderizar es solo recorrer el modelo:
+
+    HTML       change_report.render_report (adjunto del email)
+    texto      render_text (cuerpo del email)
+    Markdown   render_markdown
+    JSON       render_json
+
+Uso:
+    python report_model.py FECHA [--formato markdown|texto|json] [--salida archivo]
+"""
+
+import argparse
+import html
+import sys
+from datetime import datetime
+
+import json_backend
+from config_audit import ConfigAudit
+from diff_engine import SCHEMAS_BY_NAME, count_changes
+
+# Presentación de cada sección: icono, títulos de los bloques (añadidas,
+# eliminadas, renombradas, modificadas) y nombre en "No hay cambios en ..."
+SECTION_VIEWS = {
+    'extensiones': {
+        'icono': '📞',
+        'titulo': 'Extensiones',
+        'titulos': ('AÑADIDAS', 'ELIMINADAS', 'RENOMBRADAS', 'MODIFICADAS'),
+        'sin_cambios': 'extensiones'
+    },
+    'dids': {
+        'icono': '📱',
+        'titulo': 'DIDs',
+        'titulos': ('AÑADIDOS', 'ELIMINADOS', 'MOVIDOS', 'MODIFICADOS'),
+        'sin_cambios': 'DIDs'
+    },
+    'colas': {
+        'icono': '📋',
+        'titulo': 'Colas',
+        'titulos': ('AÑADIDAS', 'ELIMINADAS', 'RENOMBRADAS', 'MODIFICADAS'),
+        'sin_cambios': 'colas'
+    }
+}
+
+# Orden de las secciones en los reportes
+REPORT_SECTIONS = ['extensiones', 'dids', 'colas']
+
+# Tipo de cada grupo: (clase CSS, icono, símbolo en texto/Markdown)
+GROUP_KINDS = {
+    'added': ('added', '✅', '+'),
+    'removed': ('removed', '❌', '-'),
+    'renamed': ('modified', '🔀', '↪'),
+    'modified': ('modified', '🔄', '≠')
+}
+
+
+def _state_label(value):
+    """'todas_activas' -> 'Todas Activas'"""
+    return (value or '').replace('_', ' ').title()
+
+
+def _entity_header(section, entity):
+    """Cabecera de una entidad añadida, eliminada o modificada"""
+    icon = SECTION_VIEWS[section]['icono']
+    if section == 'extensiones':
+        return f"{icon} {entity.get('extension', '')} - {entity.get('nombre', '')}"
+    return f"{icon} {entity.get(SCHEMAS_BY_NAME[section].key, '')}"
+
+
+def _entity_summary(section, entity, added):
+    """Resumen de una entidad añadida o eliminada"""
+    if section == 'extensiones':
+        summary = f"Grupo: {entity.get('grupo', '-')} | Agente: {entity.get('agente_asignado', '-')}"
+        if added:
+            summary += f" | Estado: {_state_label(entity.get('estado_colas'))}"
+        return summary
+    if section == 'dids':
+        summary = f"Locución: {entity.get('locucion', '-')}"
+        if added:
+            summary += f" | Acción 1: {(entity.get('accion1') or '-')[:50]}..."
+        return summary
+
+    members = len(entity.get('miembros', []))
+    return f"Miembros: {members}" if added else f"Tenía {members} miembros"
+
+
+def _field_changes(campos):
+    """Campos modificados con los valores tal como se muestran"""
+    rows = []
+    for campo in campos:
+        field = campo.get('campo', '')
+        old_value = campo.get('anterior') or '-'
+        new_value = campo.get('actual') or '-'
+
+        if field == 'estado_colas':
+            old_value = _state_label(old_value)
+            new_value = _state_label(new_value)
+        elif field.startswith('accion'):
+            old_value = f"{old_value[:40]}..."
+            new_value = f"{new_value[:40]}..."
+
+        rows.append({'etiqueta': campo.get('etiqueta', field), 'anterior': old_value, 'actual': new_value})
+    return rows
+
+
+def _member_changes(colecciones):
+    """Miembros añadidos, eliminados y con otro estado (None si no hay)"""
+    miembros = colecciones.get('miembros', {})
+    members = {
+        'añadidos': [m.get('extension', '') for m in miembros.get('added', [])],
+        'eliminados': [m.get('extension', '') for m in miembros.get('removed', [])],
+        'estados': [
+            {'etiqueta': m['clave'],
+             'anterior': (m['anterior'].get('estado') or '').title(),
+             'actual': (m['actual'].get('estado') or '').title()}
+            for m in miembros.get('modified', [])
+            if m['anterior'].get('estado') != m['actual'].get('estado')
+        ]
+    }
+    return members if any(members.values()) else None
+
+
+def _entry(header, summary=None, campos=(), miembros=None):
+    return {'cabecera': header, 'resumen': summary, 'campos': list(campos), 'miembros': miembros}
+
+
+def build_section(section, changes):
+    """
+    Modelo de una sección
+
+    Args:
+        section: Nombre de la sección ('extensiones', 'dids', 'colas')
+        changes: Conjunto de cambios (basta con las listas de la sección)
+    """
+    schema = SCHEMAS_BY_NAME[section]
+    view = SECTION_VIEWS[section]
+    added_key, removed_key, modified_key = schema.change_keys
+    added_title, removed_title, renamed_title, modified_title = view['titulos']
+
+    groups = []
+
+    def group(kind, title, entries):
+        if entries:
+            groups.append({'tipo': kind, 'titulo': title, 'entradas': entries})
+
+    group('added', added_title, [
+        _entry(_entity_header(section, entity), _entity_summary(section, entity, added=True))
+        for entity in changes.get(added_key) or []
+    ])
+    group('removed', removed_title, [
+        _entry(_entity_header(section, entity), _entity_summary(section, entity, added=False))
+        for entity in changes.get(removed_key) or []
+    ])
+    # Renombrados (emparejados por rename_detector)
+    group('renamed', renamed_title, [
+        _entry(f"{view['icono']} {entry.get('clave_anterior', '')} → {entry.get('clave_actual', '')}",
+               f"Confianza: {entry.get('confianza', 0):.0%}",
+               _field_changes(entry.get('campos', [])),
+               _member_changes(entry.get('colecciones', {})))
+        for entry in changes.get(schema.renamed_key) or []
+    ])
+    # Modificados (campos y colecciones calculados por el motor de comparación)
+    group('modified', modified_title, [
+        _entry(_entity_header(section, {**change.get('actual', {}), **change}),
+               campos=_field_changes(change.get('campos', [])),
+               miembros=_member_changes(change.get('colecciones', {})))
+        for change in changes.get(modified_key) or []
+    ])
+
+    return {
+        'nombre': section,
+        'icono': view['icono'],
+        'titulo': view['titulo'],
+        'sin_cambios': view['sin_cambios'],
+        'total': sum(len(g['entradas']) for g in groups),
+        'grupos': groups
+    }
+
+
+def build_report(changes, report_date, generated=None):
+    """
+    Modelo del reporte de un conjunto de cambios
+
+    Args:
+        changes: Conjunto de cambios (diff_configs)
+        report_date: Fecha de la auditoría
+        generated: Momento de generación (default: ahora)
+
+    Returns:
+        {'fecha', 'generado', 'totales', 'arrastrados', 'secciones'}; las
+        fechas en ISO, así el modelo se serializa tal cual
+    """
+    return {
+        'fecha': report_date.strftime('%Y-%m-%d'),
+        'generado': (generated or datetime.now()).isoformat(timespec='seconds'),
+        'totales': count_changes(changes),
+        # Entidades no visitadas (copiadas del snapshot anterior)
+        'arrastrados': changes.get('arrastrados') or 0,
+        'secciones': [build_section(section, changes) for section in REPORT_SECTIONS]
+    }
+
+
+def report_day(report):
+    """Fecha del reporte como date"""
+    return datetime.strptime(report['fecha'], '%Y-%m-%d').date()
+
+
+def render_text(report):
+    """Resumen en texto plano (cuerpo del email)"""
+    lines = [
+        "REPORTE DE CAMBIOS - NEOTEL",
+        f"Fecha: {report_day(report).strftime('%d/%m/%Y')}",
+        f"Total de cambios: {report['totales']['total']}",
+        "=" * 60,
+        ""
+    ]
+
+    for section in report['secciones']:
+        if not section['total']:
+            continue
+        lines.append(f"{section['icono']} CAMBIOS EN {section['titulo'].upper()}:")
+        for group in section['grupos']:
+            symbol = GROUP_KINDS[group['tipo']][2]
+            lines.append(f"  {symbol} {group['titulo'].capitalize()}: {len(group['entradas'])}")
+        lines.append("")
+
+    lines.append("Para ver el detalle completo, consulte el reporte HTML adjunto.")
+    return "\n".join(lines)
+
+
+def render_markdown(report):
+    """Resumen en Markdown: totales por sección y cada cambio con sus campos"""
+    lines = [
+        f"# Reporte de cambios Neotel - {report_day(report).strftime('%d/%m/%Y')}",
+        "",
+        f"**Total de cambios:** {report['totales']['total']}",
+        ""
+    ]
+    if report['arrastrados']:
+        lines += [f"⏭️ {report['arrastrados']} entidades sin visitar (copiadas del snapshot anterior)", ""]
+
+    lines += ["| Sección | Cambios |", "| --- | ---: |"]
+    lines += [f"| {section['icono']} {section['titulo']} | {section['total']} |" for section in report['secciones']]
+    lines.append("")
+
+    for section in report['secciones']:
+        lines += [f"## {section['icono']} {section['titulo']}", ""]
+        if not section['total']:
+            lines += [f"No hay cambios en {section['sin_cambios']}.", ""]
+            continue
+
+        for group in section['grupos']:
+            lines += [f"### {GROUP_KINDS[group['tipo']][1]} {group['titulo']} ({len(group['entradas'])})", ""]
+            for entry in group['entradas']:
+                # Los valores de Neotel pueden contener '<' o '&': escapados fuera de `código`
+                line = f"- **{html.escape(entry['cabecera'], quote=False)}**"
+                if entry['resumen']:
+                    line += f" — {html.escape(entry['resumen'], quote=False)}"
+                lines.append(line)
+                for campo in entry['campos']:
+                    lines.append(f"  - {campo['etiqueta']}: `{campo['anterior']}` → `{campo['actual']}`")
+                miembros = entry['miembros']
+                if miembros:
+                    if miembros['añadidos']:
+                        lines.append(f"  - Miembros añadidos: `{', '.join(miembros['añadidos'])}`")
+                    if miembros['eliminados']:
+                        lines.append(f"  - Miembros eliminados: `{', '.join(miembros['eliminados'])}`")
+                    for estado in miembros['estados']:
+                        lines.append(f"  - `{estado['etiqueta']}`: {estado['anterior']} → {estado['actual']}")
+            lines.append("")
+
+    return "\n".join(lines)
+
+
+def render_json(report):
+    """El modelo completo en JSON"""
+    return json_backend.dumps_pretty(report)
+
+
+# Formatos de texto: nombre -> (función, extensión del archivo)
+RENDERERS = {
+    'texto': (render_text, '.txt'),
+    'markdown': (render_markdown, '.md'),
+    'json': (render_json, '.json')
+}
+
+
+def write_report(report, fmt, output_file=None):
+    """
+    Escribir el reporte en un formato de RENDERERS
+
+    Args:
+        output_file: Archivo de salida (default: el reporte del día con la
+                     extensión del formato)
+
+    Returns:
+        Ruta del archivo
+    """
+    render, extension = RENDERERS[fmt]
+    output_file = output_file or ConfigAudit.get_report_filename(report_day(report)).with_suffix(extension)
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write(render(report))
+    return output_file
+
+
+def main():
+    """Función principal"""
+    from range_diff import load_delta
+
+    parser = argparse.ArgumentParser(description="Generar el reporte de cambios de un día en otro formato")
+    parser.add_argument('fecha', help="Fecha de la auditoría YYYY-MM-DD")
+    parser.add_argument('--formato', choices=list(RENDERERS), default='markdown', help="Formato (default: markdown)")
+    parser.add_argument('--salida', help="Archivo de salida (default: junto al reporte HTML del día)")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("📝 REPORTE DE CAMBIOS - NEOTEL")
+    print("=" * 80)
+    print()
+
+    try:
+        audit_date = datetime.strptime(args.fecha, '%Y-%m-%d').date()
+        delta = load_delta(audit_date)
+        if delta is None:
+            print(f"❌ No hay delta guardado para la fecha {args.fecha}")
+            sys.exit(1)
+
+        report = build_report(delta['cambios'], audit_date)
+        output_file = write_report(report, args.formato, args.salida)
+        print(f"✅ Reporte generado: {output_file}")
+
+    except Exception as e:
+        print(f"\n❌ Error: {str(e)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,441 @@
+#!/usr/bin/env python3
+"""
+Formato contenedor de snapshots con lectura de secciones bajo demanda
+
+Estructura del archivo:
+    MAGIC (8 bytes) | longitud cabecera (uint32 LE) | cabecera JSON | secciones
+
+La cabecera contiene la fecha, el timestamp y, por cada sección
+(extensiones, dids, colas), su desplazamiento y longitud dentro del bloque
+de datos. El lector mapea el archivo con mmap y solo decodifica las
+secciones a las que se accede.
+
+Cada snapshot incluye además huellas (blake2b) de la configuración completa
+y de cada sección en la cabecera, y una huella por entidad en la sección
+interna "_digests", para detectar cambios sin comparar entidades enteras.
+Los campos no auditados (ConfigAudit.CAMPOS_NO_AUDITADOS) no forman parte
+de las huellas.
+
+Exportar un snapshot a JSON legible:
+    python snapshot_format.py [YYYY-MM-DD] [salida.json]
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from collections.abc import Mapping
+from datetime import datetime
+from pathlib import Path
+
+import json_backend
+from config_audit import ConfigAudit
+
+MAGIC = b'NTSNAP1\n'
+FORMAT_VERSION = 1
+DIGESTS_SECTION = '_digests'
+_HEADER_LEN = struct.Struct('<I')
+
+
+def _digest(data):
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def entity_digest(entity):
+    """Huella estable de una entidad (sobre su serialización canónica)"""
+    return _digest(json_backend.dumps(entity))
+
+
+def entity_key(entity, key):
+    """Clave de una entidad como texto (las huellas se indexan por str)"""
+    value = entity.get(key)
+    return '' if value is None else str(value)
+
+
+def compute_digests(config_data):
+    """
+    Calcular huellas por entidad, por sección y de la configuración completa
+
+    Args:
+        config_data: Diccionario sección -> lista de entidades
+
+    Returns:
+        {'config': str, 'sections': {sección: str}, 'entities': {sección: {clave: str}}}
+    """
+    config_data = json_backend.canonicalize_config(config_data)
+    sections = {}
+    entities = {}
+
+    for name in sorted(config_data):
+        if name.startswith('_'):
+            continue
+        value = config_data[name]
+        key = json_backend.SECTION_KEYS.get(name)
+
+        if key is None or not isinstance(value, list):
+            sections[name] = _digest(json_backend.dumps(value))
+            continue
+
+        volatile = ConfigAudit.CAMPOS_NO_AUDITADOS.get(name, [])
+        if volatile:
+            value = [{k: v for k, v in entity.items() if k not in volatile} for entity in value]
+
+        section_entities = {entity_key(entity, key): entity_digest(entity) for entity in value}
+        entities[name] = section_entities
+        sections[name] = _digest(json_backend.dumps(sorted(section_entities.items())))
+
+    return {
+        'config': _digest(json_backend.dumps(sections)),
+        'sections': sections,
+        'entities': entities
+    }
+
+
+def config_digests(config_data):
+    """
+    Obtener las huellas de una configuración
+
+    Si la configuración procede de un snapshot contenedor se usan las huellas
+    almacenadas; en otro caso se calculan.
+    """
+    if isinstance(config_data, LazyConfig):
+        return config_data.reader.digests
+    return compute_digests(config_data)
+
+
+def write_snapshot(snapshot_file, config_data, timestamp, date_str):
+    """
+    Escribir un snapshot en formato contenedor
+
+    Args:
+        snapshot_file: Ruta de destino
+        config_data: Diccionario sección -> lista de entidades
+        timestamp: Timestamp ISO de la extracción
+        date_str: Fecha ISO del snapshot
+    """
+    payloads = []
+    sections = {}
+    offset = 0
+
+    # Forma canónica: mismas entidades -> mismos bytes en cada sección
+    config_data = json_backend.canonicalize_config(config_data)
+    digests = compute_digests(config_data)
+    stored = dict(config_data)
+    stored[DIGESTS_SECTION] = digests['entities']
+
+    for name, value in stored.items():
+        payload = json_backend.dumps(value)
+        sections[name] = {
+            'offset': offset,
+            'length': len(payload),
+            'count': len(value) if isinstance(value, (list, dict)) else None
+        }
+        payloads.append(payload)
+        offset += len(payload)
+
+    header = {
+        'version': FORMAT_VERSION,
+        'timestamp': timestamp,
+        'date': date_str,
+        'sections': sections,
+        'digests': {
+            'config': digests['config'],
+            'sections': digests['sections']
+        }
+    }
+    header_bytes = json_backend.dumps(header)
+
+    # Escritura atómica: un lector nunca ve un contenedor a medias
+    snapshot_file = Path(snapshot_file)
+    tmp_file = snapshot_file.with_name(snapshot_file.name + '.tmp')
+    with open(tmp_file, 'wb') as f:
+        f.write(MAGIC)
+        f.write(_HEADER_LEN.pack(len(header_bytes)))
+        f.write(header_bytes)
+        for payload in payloads:
+            f.write(payload)
+    os.replace(tmp_file, snapshot_file)
+
+    return snapshot_file
+
+
+def is_container(snapshot_file):
+    """Indicar si un archivo está en formato contenedor"""
+    try:
+        with open(snapshot_file, 'rb') as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def open_snapshot(snapshot_file):
+    """
+    Abrir un snapshot en cualquiera de los formatos soportados
+
+    Returns:
+        SnapshotReader para contenedores, LegacySnapshotReader para JSON
+    """
+    if is_container(snapshot_file):
+        return SnapshotReader(snapshot_file)
+    return LegacySnapshotReader(snapshot_file)
+
+
+class LazyConfig(Mapping):
+    """Vista tipo diccionario de la configuración que decodifica por sección"""
+
+    def __init__(self, reader):
+        self._reader = reader
+
+    def __getitem__(self, name):
+        if name not in self._reader.section_names:
+            raise KeyError(name)
+        return self._reader.section(name)
+
+    def __iter__(self):
+        return iter(self._reader.section_names)
+
+    def __len__(self):
+        return len(self._reader.section_names)
+
+    @property
+    def reader(self):
+        return self._reader
+
+
+class SnapshotReader:
+    """Lector perezoso de snapshots en formato contenedor"""
+
+    def __init__(self, snapshot_file):
+        """
+        Leer solo la cabecera del snapshot
+
+        Args:
+            snapshot_file: Ruta del archivo .snap
+        """
+        self.path = Path(snapshot_file)
+        self._cache = {}
+
+        with open(self.path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{self.path.name} no es un snapshot en formato contenedor")
+            (header_len,) = _HEADER_LEN.unpack(f.read(_HEADER_LEN.size))
+            self.header = json_backend.loads(f.read(header_len))
+
+        self._data_start = len(MAGIC) + _HEADER_LEN.size + header_len
+        self._file_size = self.path.stat().st_size
+
+    @property
+    def timestamp(self):
+        return self.header.get('timestamp')
+
+    @property
+    def date(self):
+        return self.header.get('date')
+
+    @property
+    def section_names(self):
+        return [name for name in self.header.get('sections', {}) if not name.startswith('_')]
+
+    @property
+    def digests(self):
+        """
+        Huellas del snapshot (mismo formato que compute_digests)
+
+        Las huellas por entidad se decodifican solo al acceder a 'entities'.
+        """
+        stored = self.header.get('digests')
+        if stored is None:
+            # Contenedor sin huellas: calcularlas a partir de las secciones
+            return compute_digests(self.config)
+        return _StoredDigests(self, stored)
+
+    def count(self, name):
+        """Número de entidades de una sección sin decodificarla"""
+        return self.header.get('sections', {}).get(name, {}).get('count') or 0
+
+    def section(self, name, default=None):
+        """
+        Decodificar una sección (con caché)
+
+        Args:
+            name: Nombre de la sección
+            default: Valor si la sección no existe
+        """
+        if name in self._cache:
+            return self._cache[name]
+
+        meta = self.header.get('sections', {}).get(name)
+        if meta is None:
+            return default
+
+        # El mapeo se abre y se cierra en cada acceso para no retener el
+        # archivo (en Windows un archivo mapeado no se puede borrar)
+        with open(self.path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size != self._file_size:
+                raise ValueError(f"El snapshot {self.path.name} ha cambiado desde su apertura")
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                start = self._data_start + meta['offset']
+                payload = mm[start:start + meta['length']]
+
+        value = json_backend.loads(payload)
+        self._cache[name] = value
+        return value
+
+    @property
+    def extensiones(self):
+        return self.section('extensiones', [])
+
+    @property
+    def dids(self):
+        return self.section('dids', [])
+
+    @property
+    def colas(self):
+        return self.section('colas', [])
+
+    @property
+    def config(self):
+        """Configuración como mapping perezoso"""
+        return LazyConfig(self)
+
+
+class _StoredDigests(Mapping):
+    """Huellas almacenadas en un contenedor, con carga perezosa por entidad"""
+
+    def __init__(self, reader, stored):
+        self._reader = reader
+        self._stored = stored
+
+    def __getitem__(self, name):
+        if name == 'entities':
+            return self._reader.section(DIGESTS_SECTION, {})
+        return self._stored[name]
+
+    def __iter__(self):
+        return iter(('config', 'sections', 'entities'))
+
+    def __len__(self):
+        return 3
+
+
+class LegacySnapshotReader:
+    """Lector de snapshots JSON (formato anterior), con la misma interfaz"""
+
+    def __init__(self, snapshot_file):
+        """
+        Cargar el snapshot JSON completo
+
+        Args:
+            snapshot_file: Ruta del archivo .json
+        """
+        self.path = Path(snapshot_file)
+        self._digests = None
+
+        with open(self.path, 'rb') as f:
+            data = json_backend.loads(f.read())
+
+        # Soportar snapshots con metadata y JSON de configuración directa
+        if 'config' in data:
+            self._config = data['config'] or {}
+            self.header = {'timestamp': data.get('timestamp'), 'date': data.get('date')}
+        else:
+            self._config = data
+            self.header = {'timestamp': None, 'date': None}
+
+    @property
+    def timestamp(self):
+        return self.header.get('timestamp')
+
+    @property
+    def date(self):
+        return self.header.get('date')
+
+    @property
+    def section_names(self):
+        return list(self._config)
+
+    @property
+    def digests(self):
+        if self._digests is None:
+            self._digests = compute_digests(self._config)
+        return self._digests
+
+    def count(self, name):
+        return len(self._config.get(name) or [])
+
+    def section(self, name, default=None):
+        return self._config.get(name, default)
+
+    @property
+    def extensiones(self):
+        return self.section('extensiones', [])
+
+    @property
+    def dids(self):
+        return self.section('dids', [])
+
+    @property
+    def colas(self):
+        return self.section('colas', [])
+
+    @property
+    def config(self):
+        return self._config
+
+
+def export_pretty(snapshot_file, output_file):
+    """
+    Exportar un snapshot a JSON legible (indentado)
+
+    Args:
+        snapshot_file: Snapshot de origen (contenedor o JSON)
+        output_file: Ruta del JSON de salida
+    """
+    snapshot = open_snapshot(snapshot_file)
+    data = {
+        'timestamp': snapshot.timestamp,
+        'date': snapshot.date,
+        'config': {name: snapshot.section(name) for name in snapshot.section_names}
+    }
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write(json_backend.dumps_pretty(data))
+    return output_file
+
+
+def main():
+    """Función principal: exportar un snapshot en formato legible"""
+    print("=" * 80)
+    print("📄 EXPORTADOR DE SNAPSHOTS A JSON LEGIBLE - NEOTEL")
+    print("=" * 80)
+    print()
+
+    try:
+        if len(sys.argv) > 1:
+            snapshot_date = datetime.strptime(sys.argv[1], '%Y-%m-%d').date()
+            snapshot_file = ConfigAudit.find_snapshot_file(snapshot_date)
+        else:
+            snapshots = ConfigAudit.list_snapshot_files()
+            snapshot_file = snapshots[-1][1] if snapshots else None
+
+        if snapshot_file is None:
+            print("❌ No se encontró el snapshot solicitado")
+            sys.exit(1)
+
+        if len(sys.argv) > 2:
+            output_file = Path(sys.argv[2])
+        else:
+            output_file = ConfigAudit.REPORTS_DIR / f"{snapshot_file.stem}_pretty.json"
+
+        print(f"📁 Snapshot: {snapshot_file.name}")
+        export_pretty(snapshot_file, output_file)
+        print(f"✅ Exportado: {output_file}")
+        print(f"   Backend JSON: {json_backend.BACKEND}")
+
+    except Exception as e:
+        print(f"\n❌ Error: {str(e)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
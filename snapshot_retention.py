@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Retención escalonada de snapshots con compactación
+
+Mantiene resolución diaria durante los últimos RETENTION_DAILY_DAYS días,
+semanal (último snapshot de cada semana ISO) durante los últimos
+RETENTION_WEEKLY_MONTHS meses y mensual a partir de ahí. Antes de borrar un
+snapshot se registra en el log compactado (JSONL mensual) el paso hacia el
+siguiente snapshot existente, de modo que ningún cambio se pierde: el estado
+de un día compactado se reconstruye desde el snapshot conservado más próximo.
+El tamaño del log crece con los cambios, no con los días.
+
+El plan se calcula solo con los nombres de archivo; si no hay nada que
+compactar no se abre ningún snapshot.
+"""
+
+import logging
+from datetime import datetime
+
+import json_backend
+from config_audit import ConfigAudit
+from diff_engine import diff_configs, change_lists
+from snapshot_format import open_snapshot
+
+
+class SnapshotCompactor:
+    """Compactador escalonado de snapshots"""
+
+    def __init__(self, daily_days=None, weekly_months=None, today=None, logger=None):
+        """
+        Inicializar compactador
+
+        Args:
+            daily_days: Días con resolución diaria
+            weekly_months: Meses con resolución semanal
+            today: Fecha de referencia (default: hoy)
+            logger: Logger a utilizar
+        """
+        self.daily_days = daily_days if daily_days is not None else ConfigAudit.RETENTION_DAILY_DAYS
+        self.weekly_months = weekly_months if weekly_months is not None else ConfigAudit.RETENTION_WEEKLY_MONTHS
+        self.today = today or datetime.now().date()
+        self.logger = logger or logging.getLogger(__name__)
+        self._recorded = {}
+
+    def bucket_for(self, snapshot_date):
+        """
+        Periodo de retención de una fecha
+
+        Returns:
+            Tupla (nivel, identificador de periodo)
+        """
+        age_days = (self.today - snapshot_date).days
+        if age_days < self.daily_days:
+            return ('diario', snapshot_date.isoformat())
+
+        age_months = (self.today.year - snapshot_date.year) * 12 + self.today.month - snapshot_date.month
+        if age_months < self.weekly_months:
+            iso_year, iso_week, _ = snapshot_date.isocalendar()
+            return ('semanal', f"{iso_year}-W{iso_week:02d}")
+
+        return ('mensual', snapshot_date.strftime('%Y-%m'))
+
+    def plan(self, snapshots):
+        """
+        Calcular qué snapshots se compactan
+
+        Args:
+            snapshots: Lista ordenada de tuplas (fecha, ruta)
+
+        Returns:
+            Lista de fechas a compactar (se conserva el último de cada periodo)
+        """
+        latest_by_bucket = {}
+        for snapshot_date, _ in snapshots:
+            latest_by_bucket[self.bucket_for(snapshot_date)] = snapshot_date
+
+        kept = set(latest_by_bucket.values())
+        return [snapshot_date for snapshot_date, _ in snapshots if snapshot_date not in kept]
+
+    def run(self):
+        """
+        Ejecutar la compactación
+
+        Returns:
+            Número de snapshots compactados
+        """
+        snapshots = ConfigAudit.list_snapshot_files()
+        to_compact = self.plan(snapshots)
+
+        if not to_compact:
+            self.logger.info("🧹 Retención: nada que compactar")
+            return 0
+
+        self.logger.info(f"🧹 Compactando {len(to_compact)} snapshots "
+                         f"(diario {self.daily_days} días, semanal {self.weekly_months} meses, mensual después)")
+
+        files = dict(snapshots)
+        dates = [snapshot_date for snapshot_date, _ in snapshots]
+        compacted = 0
+
+        for snapshot_date in to_compact:
+            try:
+                # El siguiente snapshot de la lista original siempre existe:
+                # el último de cada periodo se conserva
+                next_date = dates[dates.index(snapshot_date) + 1]
+                self._record_step(snapshot_date, files[snapshot_date], next_date, files[next_date])
+                self._delete_snapshot(snapshot_date)
+                compacted += 1
+            except Exception as e:
+                # Sin el paso registrado no se borra el snapshot
+                self.logger.warning(f"⚠️  No se pudo compactar el snapshot de {snapshot_date}: {str(e)}")
+                break
+
+        self.logger.info(f"✅ Compactados {compacted} snapshots")
+        return compacted
+
+    def _record_step(self, from_date, from_file, to_date, to_file):
+        """
+        Añadir al log compactado el paso de un snapshot al siguiente
+
+        Los pasos sin cambios no se registran: el estado del día compactado
+        es el mismo que el del snapshot siguiente. Un paso ya registrado (el
+        borrado falló o se interrumpió la ejecución anterior) no se repite.
+        """
+        log_file = ConfigAudit.get_compacted_log_filename(from_date)
+        if (from_date.isoformat(), to_date.isoformat()) in self.recorded_steps(log_file):
+            return
+
+        changes = self._diff(open_snapshot(from_file), open_snapshot(to_file))
+        if not changes:
+            return
+
+        tier, period = self.bucket_for(from_date)
+        step = {
+            'desde': from_date.isoformat(),
+            'hasta': to_date.isoformat(),
+            'nivel': tier,
+            'periodo': period,
+            'cambios': changes
+        }
+
+        ConfigAudit.COMPACTED_DIR.mkdir(parents=True, exist_ok=True)
+        with open(log_file, 'ab') as f:
+            f.write(json_backend.dumps(step) + b'\n')
+        self._recorded[log_file].add((step['desde'], step['hasta']))
+
+    def recorded_steps(self, log_file):
+        """Pasos (desde, hasta) ya presentes en un log compactado (leído una vez por ejecución)"""
+        if log_file not in self._recorded:
+            steps = set()
+            if log_file.exists():
+                with open(log_file, 'rb') as f:
+                    for line in f:
+                        if line.strip():
+                            step = json_backend.loads(line)
+                            steps.add((step['desde'], step['hasta']))
+            self._recorded[log_file] = steps
+        return self._recorded[log_file]
+
+    def _diff(self, previous, current):
+        """Cambios entre dos snapshots (motor de comparación guiado por huellas)"""
+        return change_lists(diff_configs(current.config, previous.config))
+
+    def _delete_snapshot(self, snapshot_date):
+        """Borrar el snapshot de una fecha en todos sus formatos"""
+        for snapshot_file in (ConfigAudit.get_snapshot_container_filename(snapshot_date),
+                              ConfigAudit.get_snapshot_filename(snapshot_date)):
+            if snapshot_file.exists():
+                snapshot_file.unlink()
@@ -0,0 +1,68 @@
+// Tab Navigation
+function showTab(tabName) {
+    // Hide all tabs
+    const tabs = document.querySelectorAll('.tab-content');
+    tabs.forEach(tab => tab.classList.remove('active'));
+
+    // Remove active from buttons
+    const buttons = document.querySelectorAll('.tab');
+    buttons.forEach(btn => btn.classList.remove('active'));
+
+    // Show selected tab
+    document.getElementById(tabName).classList.add('active');
+
+    // Activate button
+    event.target.classList.add('active');
+}
+
+// Table Filter
+function filterTable(tableId, searchId) {
+    const input = document.getElementById(searchId);
+    const filter = input.value.toUpperCase();
+    const table = document.getElementById(tableId);
+    const tr = table.getElementsByTagName('tr');
+
+    for (let i = 1; i < tr.length; i++) {
+        let visible = false;
+        const td = tr[i].getElementsByTagName('td');
+
+        for (let j = 0; j < td.length; j++) {
+            if (td[j]) {
+                const txtValue = td[j].textContent || td[j].innerText;
+                if (txtValue.toUpperCase().indexOf(filter) > -1) {
+                    visible = true;
+                    break;
+                }
+            }
+        }
+
+        tr[i].style.display = visible ? '' : 'none';
+    }
+}
+
+// Accordion Toggle
+function toggleAccordion(id) {
+    const header = document.querySelector(`[data-accordion="${id}"]`);
+    const content = document.getElementById(id);
+
+    header.classList.toggle('active');
+    content.classList.toggle('active');
+}
+
+// Filter Colas
+function filterColas(searchId) {
+    const input = document.getElementById(searchId);
+    const filter = input.value.toUpperCase();
+    const accordions = document.querySelectorAll('.accordion');
+
+    accordions.forEach(accordion => {
+        const header = accordion.querySelector('.accordion-header');
+        const title = header.querySelector('.accordion-title').textContent;
+
+        if (title.toUpperCase().indexOf(filter) > -1) {
+            accordion.style.display = '';
+        } else {
+            accordion.style.display = 'none';
+        }
+    });
+}
@@ -0,0 +1,213 @@
+// Dashboard en modo datos: listas virtualizadas sobre datos en columnas
+// (DATA: {extensiones, dids, colas}); el historial carga otro día con load()
+const ROW_HEIGHT = 44;
+const OVERSCAN = 8;
+const SEARCH_DELAY = 80;
+
+const BADGES = {
+    todas_activas: ['success', '✓ Activas'],
+    todas_pausadas: ['danger', '⏸ Pausadas'],
+    mixto: ['warning', '⚡ Mixto'],
+    sin_colas: ['info', '○ Sin Colas']
+};
+
+const HTML_ESCAPES = {'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'};
+
+function escapeHtml(value) {
+    return String(value ?? '').replace(/[&<>"']/g, c => HTML_ESCAPES[c]);
+}
+
+function cell(value, strong) {
+    const text = escapeHtml(value);
+    return strong ? `<span title="${text}"><strong>${text}</strong></span>` : `<span title="${text}">${text}</span>`;
+}
+
+function badge(estado) {
+    const [cls, label] = BADGES[estado] || BADGES.sin_colas;
+    return `<span><span class="badge ${cls}">${label}</span></span>`;
+}
+
+// Lista virtualizada: un espaciador con la altura total y solo las filas
+// visibles (más un margen) pintadas en su posición
+class VirtualList {
+    constructor(viewportId, renderRow, emptyMessage) {
+        this.viewport = document.getElementById(viewportId);
+        this.spacer = this.viewport.querySelector('.virtual-spacer');
+        this.window = this.viewport.querySelector('.virtual-rows');
+        this.renderRow = renderRow;
+        this.emptyMessage = emptyMessage;
+        this.rows = [];
+        this.index = [];
+        this.visible = [];
+        this.pending = false;
+        this.viewport.addEventListener('scroll', () => this.schedule());
+    }
+
+    // Índice de búsqueda en minúsculas (una cadena por fila, construido una vez)
+    setRows(rows, text) {
+        this.rows = rows;
+        this.index = rows.map(row => text(row).toLowerCase());
+    }
+
+    filter(term) {
+        const matches = [];
+        for (let i = 0; i < this.index.length; i++) {
+            if (!term || this.index[i].includes(term)) matches.push(i);
+        }
+        this.visible = matches;
+        this.viewport.scrollTop = 0;
+        this.render();
+    }
+
+    schedule() {
+        if (this.pending) return;
+        this.pending = true;
+        requestAnimationFrame(() => {
+            this.pending = false;
+            this.render();
+        });
+    }
+
+    render() {
+        const total = this.visible.length;
+        this.spacer.style.height = `${total * ROW_HEIGHT}px`;
+        if (!total) {
+            this.window.style.transform = '';
+            this.window.innerHTML = `<div class="empty-state"><div class="icon">📭</div><div>${this.emptyMessage}</div></div>`;
+            return;
+        }
+
+        const height = this.viewport.clientHeight || 600;
+        const scrollTop = this.viewport.scrollTop;
+        const start = Math.max(0, Math.floor(scrollTop / ROW_HEIGHT) - OVERSCAN);
+        const end = Math.min(total, Math.ceil((scrollTop + height) / ROW_HEIGHT) + OVERSCAN);
+
+        let html = '';
+        for (let i = start; i < end; i++) {
+            const index = this.visible[i];
+            html += this.renderRow(this.rows[index], index);
+        }
+        this.window.style.transform = `translateY(${start * ROW_HEIGHT}px)`;
+        this.window.innerHTML = html;
+    }
+}
+
+function colaCounts(members) {
+    let activos = 0;
+    let pausados = 0;
+    for (const member of members) {
+        if (member[2] === 'activo') activos++;
+        else if (member[2] === 'pausado') pausados++;
+    }
+    return [activos, pausados];
+}
+
+function createDashboard() {
+    let data = {extensiones: [], dids: [], colas: []};
+    let selectedCola = null;
+
+    // Extensiones: [extensión, nombre, grupo, agente, saliente, estado_colas]
+    const extensiones = new VirtualList('extensionesList', row =>
+        `<div class="virtual-row extensiones-cols">${cell(row[0], true)}${cell(row[1])}${cell(row[2])}${cell(row[3])}${cell(row[4])}${badge(row[5])}</div>`,
+        'No hay extensiones');
+
+    // DIDs: [número, locución, acción 1, acción 2, acción 3]
+    const dids = new VirtualList('didsList', row =>
+        `<div class="virtual-row dids-cols">${cell(row[0], true)}${cell(row[1])}${cell(row[2])}${cell(row[3])}${cell(row[4])}</div>`,
+        'No hay DIDs');
+
+    // Colas: [nombre, [[extensión, nombre de usuario, estado, detalle], ...]]
+    const colas = new VirtualList('colasList', (row, index) => {
+        const [activos, pausados] = colaCounts(row[1]);
+        const selected = index === selectedCola ? ' selected' : '';
+        return `<div class="virtual-row colas-cols${selected}" data-index="${index}">${cell('📋 ' + row[0], true)}` +
+            `<span><span class="badge success">▶ ${activos}</span></span>` +
+            `<span><span class="badge danger">⏸ ${pausados}</span></span>` +
+            `<span><span class="badge info">👥 ${row[1].length}</span></span></div>`;
+    }, 'No hay colas configuradas');
+
+    const lists = {extensiones, dids, colas};
+    const searches = {extensiones: 'searchExtensiones', dids: 'searchDids', colas: 'searchColas'};
+
+    function searchTerm(name) {
+        return document.getElementById(searches[name]).value.trim().toLowerCase();
+    }
+
+    for (const name of Object.keys(lists)) {
+        const input = document.getElementById(searches[name]);
+        let timer = null;
+        input.addEventListener('input', () => {
+            clearTimeout(timer);
+            timer = setTimeout(() => lists[name].filter(searchTerm(name)), SEARCH_DELAY);
+        });
+    }
+
+    // Detalle de una cola: las tarjetas de miembros se pintan solo al abrirla
+    function showCola(index) {
+        selectedCola = index;
+        colas.render();
+
+        const detail = document.getElementById('colaDetalle');
+        if (index === null) {
+            detail.innerHTML = '';
+            return;
+        }
+
+        const [nombre, members] = data.colas[index];
+        const cards = members.map(member => {
+            const paused = member[2] === 'pausado';
+            return `<div class="member-card${paused ? ' paused' : ''}"><div class="member-name">` +
+                `<span>${paused ? '⏸' : '▶'}</span><span>${escapeHtml(member[1])}</span></div>` +
+                `<div class="member-details">${escapeHtml(member[3])}</div></div>`;
+        }).join('');
+
+        detail.innerHTML = `<h3><span>📋</span><span>${escapeHtml(nombre)}</span></h3>` +
+            (cards ? `<div class="members-grid">${cards}</div>` : '<div class="empty-state">Sin miembros</div>');
+    }
+
+    document.getElementById('colasList').addEventListener('click', event => {
+        const row = event.target.closest('[data-index]');
+        if (row) showCola(Number(row.dataset.index));
+    });
+
+    return {
+        // Cargar los datos de un día (se conservan los filtros escritos)
+        load(newData) {
+            // Nombre de la cola abierta en el día anterior, antes de sustituir los datos
+            const selectedName = selectedCola === null ? null : (data.colas[selectedCola] || [])[0];
+            data = newData;
+            extensiones.setRows(data.extensiones, row =>
+                row.slice(0, 5).join('\u0001') + '\u0001' + (BADGES[row[5]] || BADGES.sin_colas)[1]);
+            dids.setRows(data.dids, row => row.join('\u0001'));
+            colas.setRows(data.colas, row =>
+                row[0] + '\u0001' + row[1].map(member => member[0] + '\u0001' + member[1]).join('\u0001'));
+            for (const name of Object.keys(lists)) lists[name].filter(searchTerm(name));
+
+            // Mantener abierta la misma cola si existe en el día cargado
+            const reopened = data.colas.findIndex(row => row[0] === selectedName);
+            showCola(selectedName !== null && reopened >= 0 ? reopened : null);
+        },
+
+        render(name) {
+            lists[name].render();
+        }
+    };
+}
+
+const DASHBOARD = createDashboard();
+
+// Tab Navigation (las listas se recalculan al hacerse visibles)
+function showTab(tabName) {
+    document.querySelectorAll('.tab-content').forEach(tab => tab.classList.remove('active'));
+    document.querySelectorAll('.tab').forEach(btn => btn.classList.remove('active'));
+
+    document.getElementById(tabName).classList.add('active');
+    event.target.classList.add('active');
+    DASHBOARD.render(tabName);
+}
+
+// Datos incrustados (dashboard de un día); el historial los carga por fecha
+const EMBEDDED_DATA = document.getElementById('dashboard-data');
+if (EMBEDDED_DATA) {
+    DASHBOARD.load(JSON.parse(EMBEDDED_DATA.textContent));
+}
@@ -0,0 +1,166 @@
+// Historial: índice de resúmenes diarios (indice.js) y un fragmento de datos
+// por fecha (datos/AAAA-MM-DD.js) que solo se carga al seleccionar ese día
+const HISTORY_SERIES = [
+    ['extensiones', 'Extensiones', '#2c3e50'],
+    ['dids', 'DIDs', '#27ae60'],
+    ['colas', 'Colas', '#f39c12'],
+    ['pausadas', 'Ext. pausadas', '#e74c3c']
+];
+const CHART_WIDTH = 1000;
+const CHART_HEIGHT = 220;
+const CHART_PADDING = 12;
+const LOAD_DELAY = 120;
+
+const HISTORY = {entries: [], chunks: new Map(), pending: new Map(), current: -1, timer: null};
+
+function formatDate(isoDate) {
+    const [year, month, day] = isoDate.split('-');
+    return `${day}/${month}/${year}`;
+}
+
+// Llamada por indice.js
+function neotelHistoryIndex(entries) {
+    HISTORY.entries = entries;
+    document.getElementById('historySlider').max = Math.max(0, entries.length - 1);
+    document.getElementById('trendLegend').innerHTML = HISTORY_SERIES
+        .map(([, label, color]) => `<span style="--swatch: ${color}">${label}</span>`)
+        .join('') + '<span style="--swatch: var(--border)">Cambios</span>';
+    drawTrend();
+
+    if (entries.length) {
+        selectDate(entries.length - 1);
+    } else {
+        document.getElementById('historyStatus').textContent = 'Sin snapshots';
+    }
+}
+
+// Llamada por cada datos/AAAA-MM-DD.js
+function neotelHistoryChunk(date, data) {
+    HISTORY.chunks.set(date, data);
+    const resolve = HISTORY.pending.get(date);
+    if (resolve) {
+        HISTORY.pending.delete(date);
+        resolve(data);
+    }
+}
+
+// <script> dinámico en lugar de fetch: funciona también abriendo el HTML desde disco
+function loadChunk(entry) {
+    if (HISTORY.chunks.has(entry.fecha)) {
+        return Promise.resolve(HISTORY.chunks.get(entry.fecha));
+    }
+    return new Promise((resolve, reject) => {
+        HISTORY.pending.set(entry.fecha, resolve);
+        const script = document.createElement('script');
+        script.src = `datos/${entry.fecha}.js?v=${entry.huella}`;
+        script.onload = () => script.remove();
+        script.onerror = () => {
+            HISTORY.pending.delete(entry.fecha);
+            script.remove();
+            reject(new Error(entry.fecha));
+        };
+        document.head.appendChild(script);
+    });
+}
+
+function updateStats(entry) {
+    document.getElementById('historyDate').textContent = formatDate(entry.fecha);
+    document.getElementById('statExtensiones').textContent = entry.extensiones;
+    document.getElementById('statDids').textContent = entry.dids;
+    document.getElementById('statColas').textContent = entry.colas;
+    document.getElementById('statPausadas').textContent = `⏸ ${entry.pausadas} con todas las colas pausadas`;
+    document.getElementById('statCambios').textContent = entry.cambios === null
+        ? 'Sin delta respecto al snapshot anterior'
+        : `${entry.cambios} cambios respecto al snapshot anterior`;
+}
+
+// Los resúmenes (índice) se muestran al instante; el detalle se carga al
+// detenerse en una fecha
+function selectDate(index) {
+    const entry = HISTORY.entries[index];
+    HISTORY.current = index;
+
+    document.getElementById('historySlider').value = index;
+    document.getElementById('historyPrev').disabled = index <= 0;
+    document.getElementById('historyNext').disabled = index >= HISTORY.entries.length - 1;
+    updateStats(entry);
+    drawCursor();
+
+    const status = document.getElementById('historyStatus');
+    clearTimeout(HISTORY.timer);
+    HISTORY.timer = setTimeout(() => {
+        if (!HISTORY.chunks.has(entry.fecha)) status.textContent = 'Cargando…';
+        loadChunk(entry).then(data => {
+            // Otra fecha seleccionada mientras se cargaba
+            if (HISTORY.current !== index) return;
+            DASHBOARD.load(data);
+            status.textContent = `${index + 1} de ${HISTORY.entries.length} días`;
+        }).catch(() => {
+            if (HISTORY.current === index) status.textContent = `No se pudo cargar ${formatDate(entry.fecha)}`;
+        });
+    }, LOAD_DELAY);
+}
+
+function chartX(index) {
+    const count = HISTORY.entries.length;
+    if (count < 2) return CHART_WIDTH / 2;
+    return CHART_PADDING + index * (CHART_WIDTH - 2 * CHART_PADDING) / (count - 1);
+}
+
+function drawTrend() {
+    const entries = HISTORY.entries;
+    const svg = document.getElementById('trendChart');
+    if (!entries.length) {
+        svg.innerHTML = '';
+        return;
+    }
+
+    let lineMax = 1;
+    let changeMax = 1;
+    for (const entry of entries) {
+        for (const [key] of HISTORY_SERIES) lineMax = Math.max(lineMax, entry[key] || 0);
+        changeMax = Math.max(changeMax, entry.cambios || 0);
+    }
+    const y = value => CHART_HEIGHT - CHART_PADDING - value / lineMax * (CHART_HEIGHT - 2 * CHART_PADDING);
+    const barWidth = Math.max(2, (CHART_WIDTH - 2 * CHART_PADDING) / entries.length * 0.6);
+
+    // Barras: cambios del día (escala propia, hasta un tercio de la altura)
+    let html = '';
+    entries.forEach((entry, i) => {
+        if (!entry.cambios) return;
+        const height = entry.cambios / changeMax * CHART_HEIGHT / 3;
+        html += `<rect class="trend-bar" x="${chartX(i) - barWidth / 2}" y="${CHART_HEIGHT - height}" ` +
+            `width="${barWidth}" height="${height}"><title>${formatDate(entry.fecha)}: ${entry.cambios} cambios</title></rect>`;
+    });
+
+    for (const [key, label, color] of HISTORY_SERIES) {
+        const points = entries.map((entry, i) => `${chartX(i)},${y(entry[key] || 0)}`).join(' ');
+        html += `<polyline class="trend-line" stroke="${color}" points="${points}"><title>${label}</title></polyline>`;
+    }
+    html += `<line class="trend-cursor" id="trendCursor" x1="0" x2="0" y1="0" y2="${CHART_HEIGHT}"></line>`;
+    svg.innerHTML = html;
+    drawCursor();
+}
+
+function drawCursor() {
+    const cursor = document.getElementById('trendCursor');
+    if (!cursor || HISTORY.current < 0) return;
+    const x = chartX(HISTORY.current);
+    cursor.setAttribute('x1', x);
+    cursor.setAttribute('x2', x);
+}
+
+document.getElementById('historySlider').addEventListener('input', event => selectDate(Number(event.target.value)));
+document.getElementById('historyPrev').addEventListener('click', () => selectDate(Math.max(0, HISTORY.current - 1)));
+document.getElementById('historyNext').addEventListener('click', () =>
+    selectDate(Math.min(HISTORY.entries.length - 1, HISTORY.current + 1)));
+
+// Clic en el gráfico: fecha más cercana
+document.getElementById('trendChart').addEventListener('click', event => {
+    const count = HISTORY.entries.length;
+    if (!count) return;
+    const svg = event.currentTarget;
+    const x = event.offsetX / svg.clientWidth * CHART_WIDTH;
+    const step = count > 1 ? (CHART_WIDTH - 2 * CHART_PADDING) / (count - 1) : 1;
+    selectDate(Math.min(count - 1, Math.max(0, Math.round((x - CHART_PADDING) / step))));
+});
@@ -22,6 +22,7 @@ from pathlib import Path
 # Importa las configuraciones y el EmailSender del proyecto
 from config_audit import ConfigAudit
 from email_sender import EmailSender
+from report_model import build_report, render_text
 
 def build_sample_changes():
     # Cambios de ejemplo
@@ -74,19 +75,9 @@ def main():
 
     if not args.send:
         print("Dry-run: construyendo mensaje y adjunto (NO se enviará).")
-        # Llamamos a send_change_report pero interceptamos para no enviar;
-        # para seguridad, en dry-run solo construiremos el mensaje usando la función privada _create_text_summary
-        summary = sender._create_text_summary(changes, datetime.now(), sum([
-            len(changes.get('dids_added', [])),
-            len(changes.get('dids_removed', [])),
-            len(changes.get('dids_modified', [])),
-            len(changes.get('extensions_added', [])),
-            len(changes.get('extensions_removed', [])),
-            len(changes.get('extensions_modified', [])),
-            len(changes.get('colas_added', [])),
-            len(changes.get('colas_removed', [])),
-            len(changes.get('colas_modified', [])),
-        ]))
+        # No llamamos a send_change_report: en dry-run solo construimos el
+        # cuerpo del mensaje con el mismo renderizador de texto que usa el envío
+        summary = render_text(build_report(changes, datetime.now()))
         print("Resumen de correo (texto):")
         print("-------------------------------------------------")
         print(summary)
@@ -0,0 +1,38 @@
+"""
+Configuración común de las pruebas unitarias
+
+Los módulos del proyecto están en la raíz del repositorio; las pruebas usan
+configuraciones pequeñas en memoria y directorios temporales, sin Neotel ni
+Selenium.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config_audit import ConfigAudit  # noqa: E402
+
+
+@pytest.fixture
+def audit_dirs(tmp_path, monkeypatch):
+    """Directorios de snapshots, log compactado, deltas, eventos y vigilancia en un directorio temporal"""
+    snapshots_dir = tmp_path / "config_snapshots"
+    snapshots_dir.mkdir()
+    monkeypatch.setattr(ConfigAudit, 'SNAPSHOTS_DIR', snapshots_dir)
+    monkeypatch.setattr(ConfigAudit, 'COMPACTED_DIR', snapshots_dir / "compacted")
+    monkeypatch.setattr(ConfigAudit, 'DELTAS_DIR', snapshots_dir / "deltas")
+    monkeypatch.setattr(ConfigAudit, 'EVENTS_DIR', tmp_path / "change_events")
+    monkeypatch.setattr(ConfigAudit, 'WATCH_DIR', tmp_path / "queue_watch")
+    return tmp_path
+
+
+def make_config(extensiones=(), dids=(), colas=()):
+    """Configuración mínima con las tres secciones auditadas"""
+    return {
+        'extensiones': [dict(entity) for entity in extensiones],
+        'dids': [dict(entity) for entity in dids],
+        'colas': [dict(entity) for entity in colas]
+    }
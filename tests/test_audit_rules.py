@@ -0,0 +1,79 @@
+"""Pruebas de las reglas de ruido (audit_rules)"""
+
+import pytest
+
+from audit_rules import CompiledRules, load_rules
+
+RULES = {
+    'normalizadores': [
+        {'nombre': 'espacios', 'seccion': '*', 'campo': '*', 'tipo': 'espacios'},
+        {'nombre': 'minusculas_grupo', 'seccion': 'extensiones', 'campo': 'grupo', 'tipo': 'minusculas'},
+        {'nombre': 'prefijo', 'seccion': 'dids', 'campo': 'accion*', 'tipo': 'regex',
+         'patron': '^Cola: ', 'reemplazo': ''}
+    ],
+    'equivalencias': [
+        {'nombre': 'sin_valor', 'seccion': '*', 'campo': '*', 'valores': ['', '-', 'N/D']}
+    ],
+    'ignorar': [
+        {'nombre': 'estado_pausa', 'seccion': 'colas', 'campo': 'miembros.estado',
+         'anterior': '^activo$', 'actual': '^pausado$'}
+    ]
+}
+
+
+@pytest.fixture
+def rules():
+    return CompiledRules(RULES)
+
+
+def test_normalize_applies_field_rules(rules):
+    assert rules.normalize('extensiones', 'nombre', '  Ana   Pérez ') == 'Ana Pérez'
+    assert rules.normalize('extensiones', 'grupo', ' Soporte  N1') == 'soporte n1'
+    assert rules.normalize('dids', 'accion2', 'Cola: Ventas') == 'Ventas'
+    assert rules.normalize('dids', 'locucion', 'Cola: Ventas') == 'Cola: Ventas'
+    assert rules.normalize('extensiones', 'nombre', None) is None
+
+
+def test_normalizer_suppresses_cosmetic_changes(rules):
+    assert rules.suppressing_rule('extensiones', 'nombre', 'Ana Pérez', 'Ana  Pérez ') == 'espacios'
+    assert rules.suppressing_rule('extensiones', 'grupo', 'Soporte', 'SOPORTE') == 'minusculas_grupo'
+    assert rules.suppressing_rule('extensiones', 'nombre', 'Ana', 'ANA') is None
+
+
+def test_equivalent_values(rules):
+    assert rules.suppressing_rule('dids', 'locucion', '-', 'N/D') == 'sin_valor'
+    assert rules.suppressing_rule('dids', 'locucion', None, ' - ') == 'sin_valor'
+    assert rules.suppressing_rule('dids', 'locucion', '-', 'Bienvenida') is None
+
+
+def test_ignore_patterns(rules):
+    assert rules.suppressing_rule('colas', 'miembros.estado', 'activo', 'pausado') == 'estado_pausa'
+    assert rules.suppressing_rule('colas', 'miembros.estado', 'pausado', 'activo') is None
+    assert rules.suppressing_rule('extensiones', 'estado_colas', 'activo', 'pausado') is None
+
+
+def test_suppressed_changes_are_counted_per_rule(rules):
+    assert rules.suppresses('extensiones', 'nombre', 'Ana', ' Ana')
+    assert rules.suppresses('extensiones', 'grupo', 'Soporte', 'soporte')
+    assert rules.suppresses('dids', 'accion1', '', 'N/D')
+    assert rules.suppresses('dids', 'accion2', 'N/D', '-')
+    assert not rules.suppresses('dids', 'accion2', 'N/D', 'Ventas')
+
+    assert rules.counts == {'espacios': 1, 'minusculas_grupo': 1, 'sin_valor': 2}
+
+
+def test_empty_rules_suppress_nothing():
+    rules = CompiledRules()
+
+    assert rules.empty
+    assert not rules.suppresses('extensiones', 'nombre', 'Ana', ' Ana')
+    assert not rules.counts
+
+
+def test_missing_rules_file(tmp_path):
+    assert load_rules(tmp_path / "no_existe.json").empty
+
+
+def test_unknown_normalizer_type():
+    with pytest.raises(ValueError):
+        CompiledRules({'normalizadores': [{'nombre': 'x', 'tipo': 'mayusculas'}]})
@@ -0,0 +1,39 @@
+"""Pruebas del flujo de eventos de cambio (change_log)"""
+
+from datetime import date
+
+from change_log import ALTA, MODIFICACION, ChangeEventReader, append_events, changes_to_events
+from diff_engine import empty_changes, finalize_changes
+
+AUDIT = date(2026, 3, 5)
+PREVIOUS = date(2026, 3, 4)
+
+
+def _changes():
+    changes = empty_changes()
+    changes['extensions_added'] = [{'extension': '102', 'nombre': 'Eva'}]
+    changes['dids_modified'] = [{'numero': '910000001', 'campos': [
+        {'campo': 'locucion', 'anterior': 'Bienvenida', 'actual': 'Fuera de horario'}
+    ], 'colecciones': {}}]
+    return finalize_changes(changes)
+
+
+def test_changes_to_events():
+    events = changes_to_events(_changes(), AUDIT, PREVIOUS, timestamp='2026-03-05T07:00:00')
+
+    assert [(e['seccion'], e['clave'], e['tipo'], e['campo']) for e in events] == [
+        ('dids', '910000001', MODIFICACION, 'locucion'),
+        ('extensiones', '102', ALTA, None)
+    ]
+    assert {(e['auditoria'], e['desde']) for e in events} == {('2026-03-05', '2026-03-04')}
+
+
+def test_append_events_is_idempotent_per_audit(audit_dirs):
+    assert append_events(_changes(), AUDIT, PREVIOUS) == 2
+    # Relanzar la misma auditoría no duplica eventos
+    assert append_events(_changes(), AUDIT, PREVIOUS) == 0
+    # Otra comparación del mismo día sí se registra
+    assert append_events(_changes(), AUDIT, date(2026, 3, 1)) == 2
+
+    events = list(ChangeEventReader(AUDIT).read_available())
+    assert [e['desde'] for e in events] == ['2026-03-04', '2026-03-04', '2026-03-01', '2026-03-01']
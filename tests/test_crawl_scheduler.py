@@ -0,0 +1,88 @@
+"""Pruebas de la comprobación previa del recorrido (crawl_scheduler)"""
+
+import time
+from datetime import date
+
+import pytest
+
+from config_audit import ConfigAudit
+from conftest import make_config
+from crawl_scheduler import PLAN_FULL, PLAN_NONE, PLAN_PARTIAL, CrawlScheduler
+from snapshot_format import open_snapshot, write_snapshot
+
+PREVIOUS = date(2026, 3, 4)
+# Jueves: no es el día de recorrido completo
+TODAY = date(2026, 3, 5)
+
+ANA = {'extension': '100', 'nombre': 'Ana', 'grupo': 'Soporte', 'agente_asignado': 'ana',
+       'numero_saliente': '910000001', 'estado_colas': 'todas_activas'}
+LUIS = {'extension': '101', 'nombre': 'Luis', 'grupo': 'Soporte', 'agente_asignado': 'luis',
+        'numero_saliente': '910000001', 'estado_colas': 'sin_colas'}
+DIDS = [{'numero': f'91000{i:04d}', 'id_interno': str(i), 'locucion': 'Bienvenida'} for i in range(10)]
+COLAS = [{'nombre': f'Cola {i}', 'id_interno': str(100 + i), 'miembros': []} for i in range(10)]
+
+
+@pytest.fixture
+def scheduler(audit_dirs, monkeypatch):
+    monkeypatch.setattr(ConfigAudit, 'PRECHECK_ENABLED', True)
+    monkeypatch.setattr(ConfigAudit, 'PRECHECK_FULL_CRAWL_WEEKDAY', 6)
+    monkeypatch.setattr(ConfigAudit, 'PRECHECK_SAMPLE_SIZE', 2)
+    monkeypatch.setattr(ConfigAudit, 'PRECHECK_MAX_CHANGE_RATIO', 0.2)
+    snapshot_file = write_snapshot(ConfigAudit.get_snapshot_container_filename(PREVIOUS),
+                                   make_config([ANA, LUIS], DIDS, COLAS), "2026-03-04T06:00:00", PREVIOUS.isoformat())
+    return CrawlScheduler(open_snapshot(snapshot_file), PREVIOUS, TODAY, budget_minutes=10)
+
+
+def test_unchanged_extension_table(scheduler):
+    # Mismo contenido en otro orden y con espacios que normalizan igual
+    assert scheduler.table_unchanged('extensiones', [dict(LUIS), {**ANA, 'nombre': ' Ana '}])
+    assert scheduler.plans['extensiones'] == PLAN_NONE
+
+
+def test_modified_extension_table(scheduler):
+    assert not scheduler.table_unchanged('extensiones', [ANA, {**LUIS, 'estado_colas': 'mixto'}])
+    assert scheduler.plans['extensiones'] == PLAN_FULL
+
+
+def test_extension_table_on_full_crawl_day(scheduler, monkeypatch):
+    monkeypatch.setattr(ConfigAudit, 'PRECHECK_FULL_CRAWL_WEEKDAY', TODAY.weekday())
+
+    assert not scheduler.table_unchanged('extensiones', [ANA, LUIS])
+    assert scheduler.plans['extensiones'] == PLAN_FULL
+
+
+def test_extension_table_without_previous_snapshot(audit_dirs):
+    scheduler = CrawlScheduler(None, None, TODAY)
+
+    assert not scheduler.table_unchanged('extensiones', [ANA, LUIS])
+    assert scheduler.plans['extensiones'] == PLAN_FULL
+
+
+def test_unchanged_list_visits_only_the_sample(scheduler):
+    options = [(did['numero'], did['id_interno']) for did in DIDS]
+
+    visit = scheduler.plan('dids', options)
+
+    assert len(visit) == 2
+    assert scheduler.plans['dids'] == PLAN_PARTIAL
+    assert len(scheduler.unvisited['dids']) == 8
+
+
+def test_new_entities_are_always_visited(scheduler):
+    options = [(did['numero'], did['id_interno']) for did in DIDS] + [('910009999', '99')]
+
+    visit = scheduler.plan('dids', options)
+
+    assert visit[0] == ('910009999', '99')
+    assert len(visit) == 3
+
+
+def test_budget_is_split_by_planned_visits(scheduler, monkeypatch):
+    visit = scheduler.plan('dids', [(did['numero'], did['id_interno']) for did in DIDS])
+
+    # Colas aún sin planificar: se prevé solo su muestra (2), no sus 10 entidades
+    assert scheduler.expected_visits('colas') == 2
+    assert scheduler.section_deadline('dids', len(visit)) - time.time() == pytest.approx(300, abs=5)
+
+    monkeypatch.setattr(ConfigAudit, 'PRECHECK_ENABLED', False)
+    assert scheduler.expected_visits('colas') == 10
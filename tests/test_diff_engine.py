@@ -0,0 +1,107 @@
+"""Pruebas del motor de comparación (diff_engine)"""
+
+from audit_rules import CompiledRules
+from conftest import make_config
+from diff_engine import SCHEMAS_BY_NAME, count_changes, diff_configs, diff_entity
+
+ANA = {'extension': '100', 'nombre': 'Ana', 'grupo': 'Soporte', 'agente_asignado': 'ana'}
+LUIS = {'extension': '101', 'nombre': 'Luis', 'grupo': 'Soporte', 'agente_asignado': 'luis'}
+EVA = {'extension': '102', 'nombre': 'Eva', 'grupo': 'Ventas', 'agente_asignado': 'eva'}
+DID = {'numero': '910000001', 'locucion': 'Bienvenida', 'accion1': 'Cola Ventas'}
+VENTAS = {'nombre': 'Ventas', 'id_interno': '7',
+          'miembros': [{'extension': '100', 'estado': 'activo'}]}
+
+
+def _previous():
+    return make_config([ANA, LUIS], [DID], [VENTAS])
+
+
+def _current():
+    return make_config(
+        [ANA, EVA],
+        [{**DID, 'locucion': 'Fuera de horario'}],
+        [{**VENTAS, 'miembros': [{'extension': '101', 'estado': 'activo'},
+                                 {'extension': '100', 'estado': 'pausado'}]}]
+    )
+
+
+def test_identical_configs_have_no_changes():
+    changes = diff_configs(_previous(), _previous(), rules=CompiledRules())
+
+    assert not changes['has_changes']
+    assert changes['totales']['total'] == 0
+    assert changes['suprimidos'] == {}
+
+
+def test_diff_configs_classifies_changes():
+    changes = diff_configs(_current(), _previous(), rules=CompiledRules())
+
+    assert changes['has_changes']
+    assert changes['extensions_added'] == [EVA]
+    assert changes['extensions_removed'] == [LUIS]
+    assert changes['extensions_modified'] == []
+
+    [did] = changes['dids_modified']
+    assert did['numero'] == DID['numero']
+    assert did['campos'] == [{'campo': 'locucion', 'etiqueta': 'Locución',
+                              'anterior': 'Bienvenida', 'actual': 'Fuera de horario'}]
+
+    [cola] = changes['colas_modified']
+    assert cola['campos'] == []
+    miembros = cola['colecciones']['miembros']
+    assert miembros['added'] == [{'extension': '101', 'estado': 'activo'}]
+    assert miembros['removed'] == []
+    [member] = miembros['modified']
+    assert member['clave'] == '100'
+    assert member['campos'][0]['campo'] == 'estado'
+    assert (member['anterior']['estado'], member['actual']['estado']) == ('activo', 'pausado')
+
+
+def test_count_changes_per_section():
+    changes = diff_configs(_current(), _previous(), rules=CompiledRules())
+
+    assert count_changes(changes) == {'dids': 1, 'extensions': 2, 'colas': 1, 'total': 4}
+    assert changes['totales'] == count_changes(changes)
+
+
+def test_count_changes_includes_renamed():
+    changes = {'extensions_renamed': [{'clave_anterior': '101', 'clave_actual': '102'}],
+               'dids_added': [DID]}
+
+    assert count_changes(changes) == {'dids': 1, 'extensions': 1, 'colas': 0, 'total': 2}
+
+
+def test_diff_entity_without_changes():
+    schema = SCHEMAS_BY_NAME['extensiones']
+
+    assert diff_entity(schema, ANA, dict(ANA), CompiledRules()) is None
+
+
+def test_diff_entity_ignores_unaudited_fields_and_member_order():
+    schema = SCHEMAS_BY_NAME['colas']
+    previous = {**VENTAS, 'miembros': [{'extension': '100', 'estado': 'activo'},
+                                       {'extension': '101', 'estado': 'activo'}]}
+    current = {**VENTAS, 'miembros': [{'extension': '101', 'estado': 'activo', 'contadores': '3/0/1'},
+                                      {'extension': '100', 'estado': 'activo'}]}
+
+    assert diff_entity(schema, previous, current, CompiledRules()) is None
+
+
+def test_diff_entity_reports_fields():
+    schema = SCHEMAS_BY_NAME['extensiones']
+    entry = diff_entity(schema, ANA, {**ANA, 'grupo': 'Ventas'}, CompiledRules())
+
+    assert entry['extension'] == '100'
+    assert entry['anterior'] == ANA
+    assert [campo['campo'] for campo in entry['campos']] == ['grupo']
+    assert entry['colecciones'] == {}
+
+
+def test_suppressed_changes_are_counted():
+    rules = CompiledRules({'ignorar': [
+        {'nombre': 'grupo', 'seccion': 'extensiones', 'campo': 'grupo', 'actual': '^Ventas$'}
+    ]})
+    changes = diff_configs(make_config([{**ANA, 'grupo': 'Ventas'}]), make_config([ANA]), rules=rules)
+
+    assert not changes['has_changes']
+    assert changes['suprimidos'] == {'grupo': 1}
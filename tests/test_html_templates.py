@@ -0,0 +1,38 @@
+"""Pruebas de las plantillas HTML precompiladas (html_templates)"""
+
+import pytest
+
+from html_templates import Markup, Template, _compile_source, _split_field_name
+
+
+def _render(source, **context):
+    return Template('prueba', _compile_source(source, 'prueba')).render(**context)
+
+
+@pytest.mark.parametrize('field_name, expected', [
+    ('nombre', ('nombre', [])),
+    ('item[clave]', ('item', [(False, 'clave')])),
+    ('filas[0].valor', ('filas', [(False, 0), (True, 'valor')])),
+    ('a[b c].d.e', ('a', [(False, 'b c'), (True, 'd'), (True, 'e')]))
+])
+def test_split_field_name(field_name, expected):
+    assert _split_field_name(field_name) == expected
+
+
+@pytest.mark.parametrize('field_name', ['', '.a', 'a[b', 'a..b', 'a[b]c', 'a.b-c'])
+def test_invalid_field_names(field_name):
+    with pytest.raises(ValueError):
+        _split_field_name(field_name)
+
+
+def test_render_escapes_values():
+    html = _render("<p>{item[nombre]} {total:.0%}</p>{contenido!m}",
+                   item={'nombre': '<Ventas & Soporte>'}, total=0.5, contenido=Markup('<b>ok</b>'))
+
+    assert html == "<p>&lt;Ventas &amp; Soporte&gt; 50%</p><b>ok</b>"
+    assert isinstance(html, Markup)
+
+
+def test_unsupported_conversion():
+    with pytest.raises(ValueError):
+        _compile_source("{valor!r}", 'prueba')
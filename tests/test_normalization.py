@@ -0,0 +1,57 @@
+"""Pruebas de la normalización de entidades extraídas (normalization)"""
+
+from audit_rules import CompiledRules
+from conftest import make_config
+from normalization import keep_previous_values, normalize_config
+
+RULES = CompiledRules({
+    'normalizadores': [{'nombre': 'espacios', 'tipo': 'espacios'}],
+    'equivalencias': [{'nombre': 'sin_valor', 'valores': ['', '-', 'N/D', 'Por extraer...']}],
+    'ignorar': [{'nombre': 'marcador_actual', 'actual': r'^Por extraer\.\.\.$', 'conservar_anterior': True}]
+})
+
+ANA = {'extension': '100', 'nombre': 'Ana', 'grupo': 'Soporte', 'estado_colas': 'todas_activas'}
+VENTAS = {'nombre': 'Ventas', 'id_interno': '7', 'miembros': [{'extension': '100', 'estado': 'activo'}]}
+
+
+def test_normalize_config_counts_changed_values():
+    config, changed = normalize_config(make_config([{**ANA, 'nombre': ' Ana  '}]), RULES)
+
+    assert config['extensiones'][0]['nombre'] == 'Ana'
+    assert changed == {'extensiones.nombre': 1}
+
+
+def test_placeholder_keeps_previous_value():
+    current = make_config([{**ANA, 'grupo': 'Por extraer...', 'estado_colas': 'mixto'}],
+                          colas=[{**VENTAS, 'miembros': [{'extension': '100', 'estado': 'Por extraer...'},
+                                                         {'extension': '101', 'estado': 'Por extraer...'}]}])
+    current['_arrastrados'] = {}
+
+    config, kept = keep_previous_values(current, make_config([ANA], colas=[VENTAS]), RULES)
+
+    # Marcador -> valor anterior; cambios reales y entidades nuevas sin tocar
+    assert config['extensiones'] == [{**ANA, 'estado_colas': 'mixto'}]
+    assert config['colas'][0]['miembros'] == [{'extension': '100', 'estado': 'activo'},
+                                              {'extension': '101', 'estado': 'Por extraer...'}]
+    assert config['_arrastrados'] == {}
+    assert kept == {'marcador_actual': 2}
+    assert current['extensiones'][0]['grupo'] == 'Por extraer...'
+
+
+def test_cleared_value_is_not_replaced():
+    current = make_config([{**ANA, 'grupo': 'N/D'}])
+
+    config, kept = keep_previous_values(current, make_config([ANA]), RULES)
+
+    assert config['extensiones'][0]['grupo'] == 'N/D'
+    assert not kept
+
+
+def test_without_keeping_rules_nothing_changes():
+    current = make_config([{**ANA, 'grupo': 'N/D'}])
+    rules = CompiledRules({'ignorar': [{'nombre': 'marcador_actual', 'actual': '^N/D$'}]})
+
+    config, kept = keep_previous_values(current, make_config([ANA]), rules)
+
+    assert config is current
+    assert not kept
@@ -0,0 +1,43 @@
+"""Pruebas de la serie temporal de estados de colas (queue_watch)"""
+
+from datetime import date, datetime
+
+import json_backend
+from config_audit import ConfigAudit
+from queue_watch import QueueStateStore, summarize
+
+DAY = date(2026, 3, 5)
+STATES = {'100': 'todas_activas', '101': 'todas_activas', '102': 'sin_colas'}
+
+
+def _at(hour, minute=0):
+    return datetime(2026, 3, 5, hour, minute)
+
+
+def _records():
+    with open(ConfigAudit.get_watch_filename(DAY), 'rb') as f:
+        return [json_backend.loads(line) for line in f if line.strip()]
+
+
+def test_only_transitions_are_written(audit_dirs):
+    store = QueueStateStore()
+    store.record(STATES, _at(9))
+    assert store.record(dict(STATES), _at(9, 1)) == 0
+    assert store.record({**STATES, '100': 'todas_pausadas'}, _at(9, 2)) == 1
+
+    assert [record.get('evento') for record in _records()] == ['inicio', None]
+    assert _records()[1] == {'t': '2026-03-05T09:02:00', 'ext': '100',
+                             'de': 'todas_activas', 'a': 'todas_pausadas'}
+
+
+def test_incomplete_read_is_a_gap(audit_dirs):
+    store = QueueStateStore()
+    store.record(STATES, _at(9))
+    assert store.record({}, _at(10)) == 0
+    assert store.record({'100': 'todas_activas'}, _at(10, 30)) == 0
+    store.record(STATES, _at(11))
+
+    # Sin transiciones a None: el periodo se cierra y vuelve a abrirse completo
+    assert [record.get('evento') for record in _records()] == ['inicio', 'fin', 'inicio']
+    durations = summarize(DAY, now=_at(12))
+    assert durations['100'] == {'todas_activas': 2 * 3600}
@@ -0,0 +1,128 @@
+"""Pruebas de la comparación por rangos (range_diff)"""
+
+from datetime import date
+
+import pytest
+
+import range_diff
+from audit_rules import CompiledRules
+from config_audit import ConfigAudit
+from conftest import make_config
+from diff_engine import diff_configs
+from range_diff import diff_range, fold_deltas, save_delta
+from snapshot_format import write_snapshot
+
+ANA = {'extension': '100', 'nombre': 'Ana', 'grupo': 'Soporte'}
+LUIS = {'extension': '101', 'nombre': 'Luis', 'grupo': 'Soporte'}
+
+
+def _delta(**cambios):
+    return {'desde': None, 'hasta': None, 'cambios': cambios}
+
+
+def _modified(previous, current, field):
+    return {'extension': current['extension'], 'anterior': previous, 'actual': current,
+            'campos': [{'campo': field, 'anterior': previous[field], 'actual': current[field]}],
+            'colecciones': {}}
+
+
+def test_added_then_removed_cancels():
+    changes = fold_deltas([_delta(extensions_added=[ANA]), _delta(extensions_removed=[ANA])])
+
+    assert not changes['has_changes']
+
+
+def test_removed_then_added_unchanged_is_not_a_change():
+    changes = fold_deltas([_delta(extensions_removed=[ANA]), _delta(extensions_added=[dict(ANA)])])
+
+    assert not changes['has_changes']
+
+
+def test_removed_then_added_changed_is_a_modification():
+    changes = fold_deltas([_delta(extensions_removed=[ANA]),
+                           _delta(extensions_added=[{**ANA, 'grupo': 'Ventas'}])])
+
+    [entry] = changes['extensions_modified']
+    assert entry['anterior'] == ANA
+    assert [campo['campo'] for campo in entry['campos']] == ['grupo']
+
+
+def test_consecutive_modifications_fold_to_first_and_last_state():
+    middle = {**ANA, 'grupo': 'Ventas'}
+    last = {**ANA, 'grupo': 'Calidad'}
+    changes = fold_deltas([_delta(extensions_modified=[_modified(ANA, middle, 'grupo')]),
+                           _delta(extensions_modified=[_modified(middle, last, 'grupo')])])
+
+    [entry] = changes['extensions_modified']
+    assert entry['campos'][0]['anterior'] == 'Soporte'
+    assert entry['campos'][0]['actual'] == 'Calidad'
+    assert changes['totales']['total'] == 1
+
+
+def test_modification_reverted_is_not_a_change():
+    middle = {**ANA, 'grupo': 'Ventas'}
+    changes = fold_deltas([_delta(extensions_modified=[_modified(ANA, middle, 'grupo')]),
+                           _delta(extensions_modified=[_modified(middle, ANA, 'grupo')])])
+
+    assert not changes['has_changes']
+
+
+def test_rename_folds_as_removal_and_addition():
+    renamed = {**LUIS, 'extension': '102'}
+    changes = fold_deltas([_delta(extensions_renamed=[{'clave_anterior': '101', 'clave_actual': '102',
+                                                      'anterior': LUIS, 'actual': renamed}])])
+
+    assert changes['extensions_removed'] == [LUIS]
+    assert changes['extensions_added'] == [renamed]
+
+
+@pytest.fixture
+def history(audit_dirs, monkeypatch):
+    """Tres snapshots (1, 3 y 5 de marzo) con sus deltas diarios"""
+    monkeypatch.setattr(ConfigAudit, 'RENAME_DETECTION', False)
+    configs = {
+        date(2026, 3, 1): make_config([ANA, LUIS]),
+        date(2026, 3, 3): make_config([{**ANA, 'grupo': 'Ventas'}, LUIS]),
+        date(2026, 3, 5): make_config([{**ANA, 'grupo': 'Ventas'}])
+    }
+    previous = None
+    for snapshot_date, config in configs.items():
+        write_snapshot(ConfigAudit.get_snapshot_container_filename(snapshot_date), config,
+                       f"{snapshot_date.isoformat()}T06:00:00", snapshot_date.isoformat())
+        if previous is not None:
+            save_delta(previous, snapshot_date, diff_configs(config, configs[previous], rules=CompiledRules()))
+        previous = snapshot_date
+    return configs
+
+
+def _summary(changes):
+    return (changes['desde'], changes['hasta'],
+            [e['extension'] for e in changes['extensions_modified']],
+            [e['extension'] for e in changes['extensions_removed']])
+
+
+def test_diff_range_folds_delta_chain(history, monkeypatch):
+    # Con la cadena de deltas completa no se comparan snapshots
+    monkeypatch.setattr(range_diff, 'diff_configs', None)
+    changes = diff_range(date(2026, 3, 1), date(2026, 3, 5))
+
+    assert _summary(changes) == ('2026-03-01', '2026-03-05', ['100'], ['101'])
+
+
+def test_diff_range_uses_nearest_snapshots(history):
+    changes = diff_range(date(2026, 3, 2), date(2026, 3, 4))
+
+    assert _summary(changes) == ('2026-03-01', '2026-03-03', ['100'], [])
+
+
+def test_diff_range_without_deltas_compares_snapshots(history):
+    for delta_file in ConfigAudit.DELTAS_DIR.iterdir():
+        delta_file.unlink()
+
+    changes = diff_range(date(2026, 3, 1), date(2026, 3, 5))
+
+    assert _summary(changes) == ('2026-03-01', '2026-03-05', ['100'], ['101'])
+
+
+def test_diff_range_before_first_snapshot(history):
+    assert diff_range(date(2026, 2, 1), date(2026, 3, 5)) is None
@@ -0,0 +1,79 @@
+"""Pruebas de la detección de renombrados (rename_detector)"""
+
+from diff_engine import empty_changes, finalize_changes
+from rename_detector import RenameDetector, entity_tokens
+
+ANA = {'extension': '100', 'nombre': 'Ana Pérez', 'grupo': 'Soporte',
+       'agente_asignado': 'aperez', 'numero_saliente': '910000001'}
+LUIS = {'extension': '101', 'nombre': 'Luis Gómez', 'grupo': 'Ventas',
+        'agente_asignado': 'lgomez', 'numero_saliente': '910000002'}
+
+
+def _changes(**lists):
+    changes = empty_changes()
+    changes.update(lists)
+    return finalize_changes(changes)
+
+
+def test_entity_tokens_skip_placeholders():
+    tokens = entity_tokens('extensiones', {**ANA, 'grupo': 'N/D', 'numero_saliente': '-'})
+
+    assert tokens == {'nombre~ana', 'nombre~pérez', 'agente_asignado=aperez'}
+
+
+def test_extension_moved_to_new_code():
+    moved = {**ANA, 'extension': '200'}
+    changes = RenameDetector(min_confidence=0.6).detect(
+        _changes(extensions_removed=[ANA, LUIS], extensions_added=[moved]))
+
+    [entry] = changes['extensions_renamed']
+    assert (entry['clave_anterior'], entry['clave_actual']) == ('100', '200')
+    assert entry['confianza'] == 1.0
+    assert entry['campos'] == []
+    assert changes['extensions_removed'] == [LUIS]
+    assert changes['extensions_added'] == []
+    assert changes['totales']['extensions'] == 2
+
+
+def test_entity_tokens_split_underscored_names():
+    tokens = entity_tokens('colas', {'nombre': 'pre_VENTAS_NORTE', 'id_interno': '7'})
+
+    assert tokens == {'nombre~pre', 'nombre~ventas', 'nombre~norte', 'id_interno=7'}
+
+
+def test_renamed_queue_keeps_members():
+    previous = {'nombre': 'pre_VENTAS_NORTE', 'id_interno': '7',
+                'miembros': [{'extension': '100', 'estado': 'activo'}, {'extension': '101', 'estado': 'activo'}]}
+    current = {**previous, 'nombre': 'pre_VENTAS_SUR'}
+    changes = RenameDetector().detect(_changes(colas_removed=[previous], colas_added=[current]))
+
+    [entry] = changes['colas_renamed']
+    assert (entry['clave_anterior'], entry['clave_actual']) == ('pre_VENTAS_NORTE', 'pre_VENTAS_SUR')
+    assert entry['confianza'] == 0.71
+    assert changes['colas_removed'] == changes['colas_added'] == []
+
+
+def test_unrelated_entities_are_not_paired():
+    other = {'extension': '300', 'nombre': 'Marta Ruiz', 'grupo': 'Calidad', 'agente_asignado': 'mruiz'}
+    changes = RenameDetector(min_confidence=0.6).detect(
+        _changes(extensions_removed=[ANA], extensions_added=[other]))
+
+    assert changes['extensions_renamed'] == []
+    assert changes['extensions_removed'] == [ANA]
+    assert changes['extensions_added'] == [other]
+
+
+def test_pairs_are_one_to_one_by_confidence():
+    partial = {**ANA, 'extension': '201', 'agente_asignado': 'otro', 'numero_saliente': '910000009'}
+    exact = {**ANA, 'extension': '200'}
+    pairs = RenameDetector(min_confidence=0.3).match('extensiones', [ANA], [partial, exact])
+
+    assert pairs == [(0, 1, 1.0)]
+
+
+def test_common_tokens_do_not_count():
+    shared = {'numero_saliente': '910000000', 'grupo': 'Soporte'}
+    removed = [{'extension': str(100 + i), 'nombre': f'Agente {i}', **shared} for i in range(3)]
+    added = [{'extension': '200', 'nombre': 'Nuevo', **shared}]
+
+    assert RenameDetector(min_confidence=0.5, max_posting=2).match('extensiones', removed, added) == []
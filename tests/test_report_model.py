@@ -0,0 +1,145 @@
+"""Pruebas del modelo del reporte y sus formatos (report_model)"""
+
+import json
+from datetime import date, datetime
+
+import pytest
+
+from diff_engine import empty_changes, finalize_changes
+from report_model import build_report, render_json, render_markdown, render_text
+
+
+@pytest.fixture
+def report():
+    """Modelo fijo: una extensión añadida, un DID modificado y una cola con miembros cambiados"""
+    changes = empty_changes()
+    changes['extensions_added'] = [{'extension': '102', 'nombre': 'Eva <Ventas>', 'grupo': 'Ventas',
+                                    'agente_asignado': 'eva', 'estado_colas': 'todas_activas'}]
+    changes['dids_modified'] = [{
+        'numero': '910000001',
+        'anterior': {'numero': '910000001', 'locucion': 'Bienvenida'},
+        'actual': {'numero': '910000001', 'locucion': 'Fuera de horario'},
+        'campos': [{'campo': 'locucion', 'etiqueta': 'Locución',
+                    'anterior': 'Bienvenida', 'actual': 'Fuera de horario'}],
+        'colecciones': {}
+    }]
+    changes['colas_modified'] = [{
+        'nombre': 'Ventas',
+        'anterior': {'nombre': 'Ventas'},
+        'actual': {'nombre': 'Ventas'},
+        'campos': [],
+        'colecciones': {'miembros': {
+            'added': [{'extension': '102', 'estado': 'activo'}],
+            'removed': [],
+            'modified': [{'clave': '100', 'anterior': {'extension': '100', 'estado': 'activo'},
+                          'actual': {'extension': '100', 'estado': 'pausado'}, 'campos': []}]
+        }}
+    }]
+    changes['arrastrados'] = 3
+    return build_report(finalize_changes(changes), date(2026, 3, 5), generated=datetime(2026, 3, 5, 7, 30))
+
+
+def test_build_report(report):
+    assert report['fecha'] == '2026-03-05'
+    assert report['generado'] == '2026-03-05T07:30:00'
+    assert report['totales'] == {'dids': 1, 'extensions': 1, 'colas': 1, 'total': 3}
+    assert report['arrastrados'] == 3
+    assert [section['nombre'] for section in report['secciones']] == ['extensiones', 'dids', 'colas']
+    assert [section['total'] for section in report['secciones']] == [1, 1, 1]
+
+    [group] = report['secciones'][2]['grupos']
+    [entry] = group['entradas']
+    assert entry['miembros'] == {'añadidos': ['102'], 'eliminados': [],
+                                 'estados': [{'etiqueta': '100', 'anterior': 'Activo', 'actual': 'Pausado'}]}
+
+
+def test_renamed_queue_lists_member_changes():
+    changes = empty_changes()
+    changes['colas_renamed'] = [{
+        'clave_anterior': 'pre_VENTAS_NORTE', 'clave_actual': 'pre_VENTAS_SUR', 'confianza': 0.71,
+        'campos': [],
+        'colecciones': {'miembros': {'added': [], 'removed': [{'extension': '101', 'estado': 'activo'}],
+                                     'modified': []}}
+    }]
+    report = build_report(finalize_changes(changes), date(2026, 3, 5))
+
+    [group] = report['secciones'][2]['grupos']
+    [entry] = group['entradas']
+    assert group['tipo'] == 'renamed'
+    assert entry['resumen'] == 'Confianza: 71%'
+    assert entry['miembros'] == {'añadidos': [], 'eliminados': ['101'], 'estados': []}
+
+
+def test_build_report_without_changes():
+    report = build_report(finalize_changes(empty_changes()), date(2026, 3, 5))
+
+    assert report['totales']['total'] == 0
+    assert all(section['total'] == 0 and section['grupos'] == [] for section in report['secciones'])
+
+
+def test_render_text(report):
+    assert render_text(report) == "\n".join([
+        "REPORTE DE CAMBIOS - NEOTEL",
+        "Fecha: 05/03/2026",
+        "Total de cambios: 3",
+        "=" * 60,
+        "",
+        "📞 CAMBIOS EN EXTENSIONES:",
+        "  + Añadidas: 1",
+        "",
+        "📱 CAMBIOS EN DIDS:",
+        "  ≠ Modificados: 1",
+        "",
+        "📋 CAMBIOS EN COLAS:",
+        "  ≠ Modificadas: 1",
+        "",
+        "Para ver el detalle completo, consulte el reporte HTML adjunto."
+    ])
+
+
+def test_render_markdown(report):
+    assert render_markdown(report) == "\n".join([
+        "# Reporte de cambios Neotel - 05/03/2026",
+        "",
+        "**Total de cambios:** 3",
+        "",
+        "⏭️ 3 entidades sin visitar (copiadas del snapshot anterior)",
+        "",
+        "| Sección | Cambios |",
+        "| --- | ---: |",
+        "| 📞 Extensiones | 1 |",
+        "| 📱 DIDs | 1 |",
+        "| 📋 Colas | 1 |",
+        "",
+        "## 📞 Extensiones",
+        "",
+        "### ✅ AÑADIDAS (1)",
+        "",
+        "- **📞 102 - Eva &lt;Ventas&gt;** — Grupo: Ventas | Agente: eva | Estado: Todas Activas",
+        "",
+        "## 📱 DIDs",
+        "",
+        "### 🔄 MODIFICADOS (1)",
+        "",
+        "- **📱 910000001**",
+        "  - Locución: `Bienvenida` → `Fuera de horario`",
+        "",
+        "## 📋 Colas",
+        "",
+        "### 🔄 MODIFICADAS (1)",
+        "",
+        "- **📋 Ventas**",
+        "  - Miembros añadidos: `102`",
+        "  - `100`: Activo → Pausado",
+        ""
+    ])
+
+
+def test_render_markdown_section_without_changes():
+    report = build_report(finalize_changes(empty_changes()), date(2026, 3, 5))
+
+    assert "No hay cambios en DIDs." in render_markdown(report).splitlines()
+
+
+def test_render_json_round_trip(report):
+    assert json.loads(render_json(report)) == report
@@ -0,0 +1,95 @@
+"""Pruebas de la retención escalonada de snapshots (snapshot_retention)"""
+
+from datetime import date
+
+import pytest
+
+import json_backend
+from config_audit import ConfigAudit
+from conftest import make_config
+from snapshot_format import write_snapshot
+from snapshot_retention import SnapshotCompactor
+
+TODAY = date(2026, 10, 19)
+
+
+def _compactor():
+    return SnapshotCompactor(daily_days=14, weekly_months=6, today=TODAY)
+
+
+@pytest.mark.parametrize('snapshot_date, bucket', [
+    (date(2026, 10, 19), ('diario', '2026-10-19')),
+    (date(2026, 10, 6), ('diario', '2026-10-06')),
+    (date(2026, 10, 5), ('semanal', '2026-W41')),
+    (date(2026, 5, 1), ('semanal', '2026-W18')),
+    (date(2026, 4, 30), ('mensual', '2026-04')),
+    (date(2025, 12, 31), ('mensual', '2025-12'))
+])
+def test_bucket_for_tiers(snapshot_date, bucket):
+    assert _compactor().bucket_for(snapshot_date) == bucket
+
+
+def test_plan_keeps_last_snapshot_of_each_period():
+    dates = [date(2026, 3, 2), date(2026, 3, 20), date(2026, 9, 7), date(2026, 9, 9), date(2026, 9, 14),
+             date(2026, 10, 10), date(2026, 10, 11)]
+
+    to_compact = _compactor().plan([(snapshot_date, None) for snapshot_date in dates])
+
+    assert to_compact == [date(2026, 3, 2), date(2026, 9, 7)]
+
+
+def test_plan_with_nothing_to_compact():
+    assert _compactor().plan([(date(2026, 10, 10), None), (date(2026, 10, 11), None)]) == []
+
+
+@pytest.fixture
+def snapshots(audit_dirs):
+    """Cuatro snapshots semanales de septiembre (uno sin cambios)"""
+    ana = {'extension': '100', 'nombre': 'Ana', 'grupo': 'Soporte'}
+    configs = {
+        date(2026, 9, 7): make_config([ana]),
+        date(2026, 9, 8): make_config([ana]),
+        date(2026, 9, 9): make_config([{**ana, 'grupo': 'Ventas'}]),
+        date(2026, 9, 10): make_config([{**ana, 'grupo': 'Calidad'}])
+    }
+    for snapshot_date, config in configs.items():
+        write_snapshot(ConfigAudit.get_snapshot_container_filename(snapshot_date), config,
+                       f"{snapshot_date.isoformat()}T06:00:00", snapshot_date.isoformat())
+    return configs
+
+
+def _steps():
+    log_file = ConfigAudit.get_compacted_log_filename(date(2026, 9, 1))
+    with open(log_file, 'rb') as f:
+        return [json_backend.loads(line) for line in f if line.strip()]
+
+
+def test_run_records_steps_and_deletes_snapshots(snapshots):
+    assert _compactor().run() == 3
+
+    assert [snapshot_date for snapshot_date, _ in ConfigAudit.list_snapshot_files()] == [date(2026, 9, 10)]
+    steps = _steps()
+    # El paso del 7 al 8 no tiene cambios y no se registra
+    assert [(step['desde'], step['hasta']) for step in steps] == [('2026-09-08', '2026-09-09'),
+                                                                  ('2026-09-09', '2026-09-10')]
+    assert {(step['nivel'], step['periodo']) for step in steps} == {('semanal', '2026-W37')}
+    [entry] = steps[0]['cambios']['extensions_modified']
+    assert (entry['anterior']['grupo'], entry['actual']['grupo']) == ('Soporte', 'Ventas')
+
+
+def test_step_is_not_recorded_twice(snapshots, monkeypatch):
+    delete_snapshot = SnapshotCompactor._delete_snapshot
+
+    def locked(compactor, snapshot_date):
+        if snapshot_date == date(2026, 9, 8):
+            raise OSError("archivo bloqueado")
+        delete_snapshot(compactor, snapshot_date)
+
+    # El paso 8 -> 9 se registra pero el snapshot del 8 no se puede borrar
+    monkeypatch.setattr(SnapshotCompactor, '_delete_snapshot', locked)
+    assert _compactor().run() == 1
+    monkeypatch.setattr(SnapshotCompactor, '_delete_snapshot', delete_snapshot)
+
+    assert _compactor().run() == 2
+    assert [(step['desde'], step['hasta']) for step in _steps()] == [('2026-09-08', '2026-09-09'),
+                                                                     ('2026-09-09', '2026-09-10')]